@@ -0,0 +1,127 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import os
+import pathlib
+import struct
+import typing
+
+import k5test
+import pytest
+
+import krb5
+
+
+# The same realm fixture as the tests, the benchmarks are run on their own so
+# it can't be imported from tests/conftest.py.
+@pytest.fixture(scope="session")
+def realm() -> typing.Iterator[k5test.K5Realm]:
+    test_realm = k5test.K5Realm()
+
+    try:
+        original_env: typing.Dict[str, typing.Optional[str]] = {}
+        for k in test_realm.env.keys():
+            original_env[k] = os.environ.pop(k, None)
+
+        try:
+            os.environ.update(test_realm.env)
+
+            yield test_realm
+
+        finally:
+            for k, v in original_env.items():
+                if v:
+                    os.environ[k] = v
+                else:
+                    del os.environ[k]
+
+    finally:
+        test_realm.stop()
+        del test_realm
+
+
+@pytest.fixture(scope="session")
+def user_creds(realm: k5test.K5Realm) -> typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds]:
+    """A context with the user TGT and a service ticket for the host principal."""
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    password = realm.password("user").encode()
+
+    tgt = krb5.get_init_creds_password(ctx, princ, opt, password)
+    service = krb5.get_init_creds_password(ctx, princ, opt, password, in_tkt_service=realm.host_princ.encode())
+
+    return ctx, tgt, service
+
+
+@pytest.fixture(params=[10, 1000, 10000], ids=lambda c: f"{c}-entries")
+def entry_count(request: typing.Any) -> int:
+    return request.param
+
+
+@pytest.fixture(params=[100, 50, 0], ids=lambda p: f"{p}%-hits")
+def hit_ratio(request: typing.Any) -> int:
+    """The percentage of lookups in a lookup benchmark that find a match."""
+    return request.param
+
+
+@pytest.fixture(params=["FILE", "MEMORY"])
+def filled_ccache(
+    request: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+    entry_count: int,
+    tmp_path: pathlib.Path,
+) -> krb5.CCache:
+    """A ccache with entry_count - 1 service tickets followed by the TGT.
+
+    The TGT is stored last so a retrieval of it has to scan every entry.
+    """
+    ctx, tgt, service = user_creds
+    if request.param == "FILE":
+        cache = krb5.cc_resolve(ctx, f"FILE:{tmp_path / 'ccache'}".encode())
+    else:
+        cache = krb5.cc_new_unique(ctx, b"MEMORY")
+
+    krb5.cc_initialize(ctx, cache, tgt.client)
+    for _ in range(entry_count - 1):
+        krb5.cc_store_cred(ctx, cache, service)
+    krb5.cc_store_cred(ctx, cache, tgt)
+
+    return cache
+
+
+def _counted(data: bytes) -> bytes:
+    return struct.pack("!H", len(data)) + data
+
+
+@pytest.fixture
+def filled_keytab(
+    entry_count: int,
+    tmp_path: pathlib.Path,
+) -> typing.Tuple[krb5.Context, krb5.KeyTab, typing.List[bytes]]:
+    """A FILE keytab with entry_count entries for distinct principals.
+
+    Calling kt_add_entry for each entry is quadratic for FILE keytabs so the
+    keytab is written directly in the v2 (0x0502) format. The principal names
+    are returned in the order they were written.
+    """
+    realm = "EXAMPLE.COM"
+    path = tmp_path / "keytab"
+    names = []
+    with open(path, mode="wb") as fd:
+        fd.write(b"\x05\x02")
+
+        for idx in range(entry_count):
+            components = [b"svc%d" % idx, b"host.example.com"]
+            names.append(b"/".join(components) + b"@" + realm.encode())
+
+            entry = struct.pack("!H", len(components)) + _counted(realm.encode())
+            entry += b"".join(_counted(c) for c in components)
+            entry += struct.pack("!IIBH", krb5.NameType.srv_hst, 0, 1, 17)
+            entry += _counted(b"\x00" * 16)
+            entry += struct.pack("!I", 1)
+
+            fd.write(struct.pack("!i", len(entry)) + entry)
+
+    ctx = krb5.init_context()
+    return ctx, krb5.kt_resolve(ctx, f"FILE:{path}".encode()), names
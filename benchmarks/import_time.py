@@ -0,0 +1,70 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""Measure how long it takes to import krb5.
+
+Runs ``python -X importtime`` in a new interpreter for every run and sums the
+cumulative import time of the top level ``krb5`` imports. Two scenarios are
+measured:
+
+- ``import krb5``: What a process that only imports the package pays.
+- ``all names``: Imports krb5 and accesses every name in ``krb5.__all__``
+  which loads every extension module, this is what every ``import krb5``
+  cost before the extension modules were loaded lazily.
+
+Example:
+    python benchmarks/import_time.py --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import typing
+
+SCENARIOS = {
+    "import krb5": "import krb5",
+    "all names": "import krb5; [getattr(krb5, n) for n in krb5.__all__]",
+}
+
+
+def measure(code: str) -> int:
+    """Run the code in a new interpreter and return the krb5 import time in us."""
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    total = 0
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|", 2)
+        # Nested imports are indented, only count the top level ones so each
+        # import is only counted once.
+        if name.startswith(" krb5") and not cumulative.strip().startswith("cumulative"):
+            total += int(cumulative)
+
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Number of interpreters to start per scenario.")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<12} {'median ms':>10} {'min ms':>10}")
+    for name, code in SCENARIOS.items():
+        times: typing.List[int] = [measure(code) for _ in range(args.runs)]
+        print(f"{name:<12} {statistics.median(times) / 1000:>10.2f} {min(times) / 1000:>10.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""Thread scaling benchmark and stress harness.
+
+Runs get_init_creds_keytab, ccache iteration and keytab lookups from 1 up to
+``--max-threads`` threads against a local k5test realm and reports the
+throughput and the scaling relative to a single thread. It is mostly useful on
+a free-threaded (``python3.14t``) interpreter where the extension is built
+without the GIL, on a GIL build the throughput is not expected to scale.
+
+By default every thread uses its own Context and handles. With ``--shared``
+the ccache and keytab workloads use a single CCache/KeyTab (and its Context)
+across all the threads to detect data races in the shared objects. Every
+operation validates its result and any exception or mismatch is counted and
+reported, the script exits with 1 if any were found.
+
+Example:
+    python benchmarks/scaling.py --max-threads 8 --duration 2
+    python benchmarks/scaling.py --max-threads 8 --shared
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import os
+import sys
+import threading
+import time
+import typing
+
+import k5test
+
+import krb5
+
+CCACHE_ENTRIES = 100
+KEYTAB_ENTRIES = 100
+
+
+class Result(typing.NamedTuple):
+    threads: int
+    operations: int
+    errors: int
+    duration: float
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.duration
+
+
+class Workload(abc.ABC):
+    """Base workload, a new instance is set up for every thread."""
+
+    name = ""
+
+    def __init__(
+        self,
+        realm: k5test.K5Realm,
+        shared: typing.Optional[Workload] = None,
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def run(self) -> bool:
+        """Run a single operation and return whether the result was valid."""
+
+
+class InitCredsKeytab(Workload):
+    name = "get_init_creds_keytab"
+
+    def __init__(
+        self,
+        realm: k5test.K5Realm,
+        shared: typing.Optional[Workload] = None,
+    ) -> None:
+        # A context is never shared for this workload, the KDC exchange is
+        # expected to be done with a per-thread context.
+        self.ctx = krb5.init_context()
+        self.princ = krb5.parse_name_flags(self.ctx, realm.host_princ.encode())
+        self.opt = krb5.get_init_creds_opt_alloc(self.ctx)
+        self.kt = krb5.kt_resolve(self.ctx, realm.keytab.encode())
+        self.expected = realm.host_princ.encode()
+
+    def run(self) -> bool:
+        creds = krb5.get_init_creds_keytab(self.ctx, self.princ, self.opt, self.kt)
+        return creds.client.name == self.expected
+
+
+class CCacheIter(Workload):
+    name = "ccache_iter"
+    ctx: krb5.Context
+    cc: krb5.CCache
+
+    def __init__(
+        self,
+        realm: k5test.K5Realm,
+        shared: typing.Optional[Workload] = None,
+    ) -> None:
+        if isinstance(shared, CCacheIter):
+            self.ctx = shared.ctx
+            self.cc = shared.cc
+            return
+
+        self.ctx = krb5.init_context()
+        princ = krb5.parse_name_flags(self.ctx, realm.user_princ.encode())
+        opt = krb5.get_init_creds_opt_alloc(self.ctx)
+        creds = krb5.get_init_creds_password(self.ctx, princ, opt, realm.password("user").encode())
+
+        self.cc = krb5.cc_new_unique(self.ctx, b"MEMORY")
+        krb5.cc_initialize(self.ctx, self.cc, princ)
+        for _ in range(CCACHE_ENTRIES):
+            krb5.cc_store_cred(self.ctx, self.cc, creds)
+
+    def run(self) -> bool:
+        return sum(1 for _ in self.cc) == CCACHE_ENTRIES
+
+
+class KeyTabLookup(Workload):
+    name = "kt_get_entry"
+    ctx: krb5.Context
+    kt: krb5.KeyTab
+    princ: krb5.Principal
+
+    def __init__(
+        self,
+        realm: k5test.K5Realm,
+        shared: typing.Optional[Workload] = None,
+    ) -> None:
+        if isinstance(shared, KeyTabLookup):
+            self.ctx = shared.ctx
+            self.kt = shared.kt
+            self.princ = shared.princ
+            return
+
+        self.ctx = krb5.init_context()
+        self.kt = krb5.kt_resolve(self.ctx, b"MEMORY:scaling-%d" % id(self))
+        key = krb5.init_keyblock(self.ctx, 17, b"\x00" * 16)
+        for idx in range(KEYTAB_ENTRIES):
+            princ = krb5.parse_name_flags(self.ctx, b"svc%d/host.example.com@EXAMPLE.COM" % idx)
+            krb5.kt_add_entry(self.ctx, self.kt, princ, 1, 0, key)
+        self.princ = princ
+
+    def run(self) -> bool:
+        entry = krb5.kt_get_entry(self.ctx, self.kt, self.princ)
+        return entry.kvno == 1
+
+
+WORKLOADS: typing.List[typing.Type[Workload]] = [InitCredsKeytab, CCacheIter, KeyTabLookup]
+
+
+def run_workload(
+    realm: k5test.K5Realm,
+    workload: typing.Type[Workload],
+    threads: int,
+    duration: float,
+    shared: bool,
+) -> Result:
+    shared_instance = workload(realm) if shared else None
+    instances = [workload(realm, shared=shared_instance) for _ in range(threads)]
+    counts = [0] * threads
+    errors = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def worker(idx: int) -> None:
+        instance = instances[idx]
+        barrier.wait()
+        while not stop.is_set():
+            try:
+                if not instance.run():
+                    errors[idx] += 1
+            except Exception:
+                errors[idx] += 1
+            counts[idx] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return Result(threads, sum(counts), sum(errors), elapsed)
+
+
+def thread_counts(max_threads: int) -> typing.List[int]:
+    counts = []
+    count = 1
+    while count < max_threads:
+        counts.append(count)
+        count *= 2
+    counts.append(max_threads)
+
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1, help="Maximum number of threads.")
+    parser.add_argument("--duration", type=float, default=1.0, help="Seconds to run each measurement for.")
+    parser.add_argument(
+        "--shared",
+        action="store_true",
+        help="Share a single CCache/KeyTab and Context between the threads to detect data races.",
+    )
+    parser.add_argument(
+        "--workload",
+        action="append",
+        choices=[w.name for w in WORKLOADS],
+        help="Only run the specified workload, can be set multiple times.",
+    )
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]} - GIL {'enabled' if gil_enabled else 'disabled'}")
+
+    workloads = [w for w in WORKLOADS if not args.workload or w.name in args.workload]
+    if args.shared:
+        # The KDC exchange is never done with a shared context.
+        workloads = [w for w in workloads if w is not InitCredsKeytab]
+
+    failed = False
+    realm = k5test.K5Realm()
+    try:
+        os.environ.update(realm.env)
+
+        for workload in workloads:
+            print(f"\n{workload.name}{' (shared)' if args.shared else ''}")
+            print(f"{'threads':>8} {'ops/s':>12} {'speedup':>8} {'efficiency':>10} {'errors':>8}")
+
+            baseline = None
+            for threads in thread_counts(args.max_threads):
+                res = run_workload(realm, workload, threads, args.duration, args.shared)
+                if baseline is None:
+                    baseline = res.throughput
+
+                speedup = res.throughput / baseline if baseline else 0.0
+                print(
+                    f"{threads:>8} {res.throughput:>12.1f} {speedup:>8.2f} "
+                    f"{speedup / threads:>10.0%} {res.errors:>8}"
+                )
+                failed = failed or res.errors > 0
+
+    finally:
+        realm.stop()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
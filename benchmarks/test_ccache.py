@@ -0,0 +1,156 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import tracemalloc
+import typing
+
+import k5test
+import pytest
+
+import krb5
+
+
+def test_ccache_iter(
+    benchmark: typing.Any,
+    filled_ccache: krb5.CCache,
+    entry_count: int,
+) -> None:
+    actual = benchmark(lambda: sum(1 for _ in filled_ccache))
+    assert actual == entry_count
+
+
+def test_ccache_iter_memory(
+    benchmark: typing.Any,
+    filled_ccache: krb5.CCache,
+    entry_count: int,
+) -> None:
+    """Iterating while keeping every entry alive, records the peak memory."""
+    tracemalloc.start()
+    try:
+        actual = len(list(filled_ccache))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_bytes"] = peak
+    benchmark.extra_info["peak_bytes_per_entry"] = peak // entry_count
+
+    assert actual == entry_count
+    assert benchmark(lambda: len(list(filled_ccache))) == entry_count
+
+
+def test_ccache_expiring_python(
+    benchmark: typing.Any,
+    filled_ccache: krb5.CCache,
+) -> None:
+    """The Python equivalent of cc_find_expiring for comparison."""
+    actual = benchmark(lambda: [c for c in filled_ccache if c.times.endtime <= 0])
+    assert len(actual) == 0
+
+
+def test_cc_find_expiring(
+    benchmark: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+    filled_ccache: krb5.CCache,
+) -> None:
+    ctx = user_creds[0]
+
+    # Nothing matches so only the scan is measured.
+    actual = benchmark(krb5.cc_find_expiring, ctx, filled_ccache, 0, now=0)
+    assert len(actual) == 0
+
+
+def test_cc_retrieve_cred(
+    benchmark: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+    filled_ccache: krb5.CCache,
+) -> None:
+    ctx, tgt, _ = user_creds
+
+    actual = benchmark(krb5.cc_retrieve_cred, ctx, filled_ccache, krb5.CredentialsRetrieveFlags.none, tgt)
+    assert actual.server.name == tgt.server.name
+
+
+@pytest.fixture(scope="session")
+def other_tgt(
+    realm: k5test.K5Realm,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+) -> krb5.Creds:
+    """A TGT for the host principal, it is never stored in filled_ccache."""
+    ctx = user_creds[0]
+    princ = krb5.parse_name_flags(ctx, realm.host_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    kt = krb5.kt_resolve(ctx, realm.keytab.encode())
+
+    return krb5.get_init_creds_keytab(ctx, princ, opt, kt)
+
+
+@pytest.fixture
+def cred_lookups(
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+    other_tgt: krb5.Creds,
+    hit_ratio: int,
+) -> typing.List[krb5.Creds]:
+    hits = hit_ratio // 10
+    return [user_creds[1]] * hits + [other_tgt] * (10 - hits)
+
+
+def test_cc_retrieve_cred_hit_miss(
+    benchmark: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+    filled_ccache: krb5.CCache,
+    cred_lookups: typing.List[krb5.Creds],
+    hit_ratio: int,
+) -> None:
+    ctx = user_creds[0]
+
+    def run() -> int:
+        found = 0
+        for mcreds in cred_lookups:
+            try:
+                krb5.cc_retrieve_cred(ctx, filled_ccache, krb5.CredentialsRetrieveFlags.none, mcreds)
+            except krb5.Krb5Error:
+                continue
+            found += 1
+
+        return found
+
+    assert benchmark(run) == hit_ratio // 10
+
+
+def test_cc_try_retrieve_cred_hit_miss(
+    benchmark: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+    filled_ccache: krb5.CCache,
+    cred_lookups: typing.List[krb5.Creds],
+    hit_ratio: int,
+) -> None:
+    ctx = user_creds[0]
+    flags = krb5.CredentialsRetrieveFlags.none
+
+    def run() -> int:
+        return sum(1 for m in cred_lookups if krb5.cc_try_retrieve_cred(ctx, filled_ccache, flags, m) is not None)
+
+    assert benchmark(run) == hit_ratio // 10
+
+
+@pytest.mark.requires_api("marshal_credentials")
+def test_marshal_credentials(
+    benchmark: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+) -> None:
+    ctx, tgt, _ = user_creds
+
+    data = benchmark(krb5.marshal_credentials, ctx, tgt)
+    assert len(data) > 0
+
+
+@pytest.mark.requires_api("unmarshal_credentials")
+def test_unmarshal_credentials(
+    benchmark: typing.Any,
+    user_creds: typing.Tuple[krb5.Context, krb5.Creds, krb5.Creds],
+) -> None:
+    ctx, tgt, _ = user_creds
+    data = krb5.marshal_credentials(ctx, tgt)
+
+    creds = benchmark(krb5.unmarshal_credentials, ctx, data)
+    assert creds.ticket == tgt.ticket
@@ -0,0 +1,18 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import typing
+
+import k5test
+
+import krb5
+
+
+def test_get_init_creds_keytab(benchmark: typing.Any, realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.host_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    kt = krb5.kt_resolve(ctx, realm.keytab.encode())
+
+    creds = benchmark(krb5.get_init_creds_keytab, ctx, princ, opt, kt)
+    assert creds.client.name == realm.host_princ.encode()
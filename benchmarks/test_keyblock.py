@@ -0,0 +1,38 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import typing
+
+import pytest
+
+import krb5
+
+DERIVATIONS = 1000
+
+# Each AES derivation runs 4096 PBKDF2 iterations, a few rounds are enough.
+ROUNDS = 3
+
+
+def _requests() -> typing.List[typing.Tuple[int, bytes, bytes, typing.Optional[bytes]]]:
+    return [(18, b"Password %d" % idx, b"EXAMPLE.COMuser%d" % idx, None) for idx in range(DERIVATIONS)]
+
+
+@pytest.mark.requires_api("c_string_to_key")
+def test_c_string_to_key_loop(benchmark: typing.Any) -> None:
+    ctx = krb5.init_context()
+    requests = _requests()
+
+    def derive() -> typing.List[krb5.KeyBlock]:
+        return [krb5.c_string_to_key(ctx, *r) for r in requests]
+
+    actual = benchmark.pedantic(derive, rounds=ROUNDS)
+    assert len(actual) == DERIVATIONS
+
+
+@pytest.mark.requires_api("c_string_to_keys")
+def test_c_string_to_keys(benchmark: typing.Any) -> None:
+    ctx = krb5.init_context()
+    requests = _requests()
+
+    actual = benchmark.pedantic(krb5.c_string_to_keys, args=(ctx, requests), rounds=ROUNDS)
+    assert len(actual) == DERIVATIONS
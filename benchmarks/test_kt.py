@@ -0,0 +1,91 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import tracemalloc
+import typing
+
+import krb5
+
+
+def test_keytab_iter(
+    benchmark: typing.Any,
+    filled_keytab: typing.Tuple[krb5.Context, krb5.KeyTab, typing.List[bytes]],
+    entry_count: int,
+) -> None:
+    _, kt, _ = filled_keytab
+
+    actual = benchmark(lambda: sum(1 for _ in kt))
+    assert actual == entry_count
+
+
+def test_keytab_iter_memory(
+    benchmark: typing.Any,
+    filled_keytab: typing.Tuple[krb5.Context, krb5.KeyTab, typing.List[bytes]],
+    entry_count: int,
+) -> None:
+    """Iterating while keeping every entry alive, records the peak memory."""
+    _, kt, _ = filled_keytab
+
+    tracemalloc.start()
+    try:
+        actual = len(list(kt))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_bytes"] = peak
+    benchmark.extra_info["peak_bytes_per_entry"] = peak // entry_count
+
+    assert actual == entry_count
+    assert benchmark(lambda: len(list(kt))) == entry_count
+
+
+def test_kt_get_entry(
+    benchmark: typing.Any,
+    filled_keytab: typing.Tuple[krb5.Context, krb5.KeyTab, typing.List[bytes]],
+) -> None:
+    ctx, kt, names = filled_keytab
+    # The last entry is the worst case for a FILE keytab scan.
+    princ = krb5.parse_name_flags(ctx, names[-1])
+
+    entry = benchmark(krb5.kt_get_entry, ctx, kt, princ)
+    assert entry.kvno == 1
+
+
+def test_kt_get_entry_hit_miss(
+    benchmark: typing.Any,
+    filled_keytab: typing.Tuple[krb5.Context, krb5.KeyTab, typing.List[bytes]],
+    hit_ratio: int,
+) -> None:
+    ctx, kt, names = filled_keytab
+    hits = hit_ratio // 10
+    lookups = [krb5.parse_name_flags(ctx, names[-1])] * hits
+    lookups += [krb5.parse_name_flags(ctx, b"missing/host.example.com@EXAMPLE.COM")] * (10 - hits)
+
+    def run() -> int:
+        found = 0
+        for princ in lookups:
+            try:
+                krb5.kt_get_entry(ctx, kt, princ)
+            except krb5.Krb5Error:
+                continue
+            found += 1
+
+        return found
+
+    assert benchmark(run) == hits
+
+
+def test_kt_try_get_entry_hit_miss(
+    benchmark: typing.Any,
+    filled_keytab: typing.Tuple[krb5.Context, krb5.KeyTab, typing.List[bytes]],
+    hit_ratio: int,
+) -> None:
+    ctx, kt, names = filled_keytab
+    hits = hit_ratio // 10
+    lookups = [krb5.parse_name_flags(ctx, names[-1])] * hits
+    lookups += [krb5.parse_name_flags(ctx, b"missing/host.example.com@EXAMPLE.COM")] * (10 - hits)
+
+    def run() -> int:
+        return sum(1 for princ in lookups if krb5.kt_try_get_entry(ctx, kt, princ) is not None)
+
+    assert benchmark(run) == hits
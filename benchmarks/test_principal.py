@@ -0,0 +1,21 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import typing
+
+import krb5
+
+
+def test_parse_name_flags(benchmark: typing.Any) -> None:
+    ctx = krb5.init_context()
+
+    princ = benchmark(krb5.parse_name_flags, ctx, b"HTTP/host.example.com@EXAMPLE.COM")
+    assert princ.name == b"HTTP/host.example.com@EXAMPLE.COM"
+
+
+def test_unparse_name_flags(benchmark: typing.Any) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"HTTP/host.example.com@EXAMPLE.COM")
+
+    name = benchmark(krb5.unparse_name_flags, ctx, princ)
+    assert name == b"HTTP/host.example.com@EXAMPLE.COM"
@@ -240,11 +240,13 @@ if not SKIP_EXTENSIONS:
         "creds",
         ("creds_marshal_mit", "krb5_marshal_credentials"),
         ("creds_mit", "krb5_get_etype_info"),
+        ("creds_step_mit", "krb5_tkt_creds_step"),
         "creds_opt",
         ("creds_opt_heimdal", "krb5_get_init_creds_opt_set_default_flags"),
         ("creds_opt_mit", "krb5_get_init_creds_opt_set_out_ccache"),
         ("creds_opt_set_in_ccache", "krb5_get_init_creds_opt_set_in_ccache"),
         ("creds_opt_set_pac_request", "krb5_get_init_creds_opt_set_pac_request"),
+        "debug",
         "exceptions",
         "keyblock",
         ("keyblock_mit", "krb5_c_string_to_key_with_params"),
@@ -1,303 +1,419 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
-from krb5._adpi import ADPolicyInfo, ADPolicyInfoProp
-from krb5._ccache import (
-    CCache,
-    CredentialsRetrieveFlags,
-    cc_default,
-    cc_default_name,
-    cc_destroy,
-    cc_get_config,
-    cc_get_name,
-    cc_get_principal,
-    cc_get_type,
-    cc_initialize,
-    cc_new_unique,
-    cc_remove_cred,
-    cc_resolve,
-    cc_retrieve_cred,
-    cc_set_config,
-    cc_set_default_name,
-    cc_store_cred,
-    cc_switch,
-)
-from krb5._cccol import cccol_iter
-from krb5._context import (
-    Context,
-    get_default_realm,
-    init_context,
-    set_default_realm,
-    set_real_time,
-    timeofday,
-    us_timeofday,
-)
-from krb5._creds import (
-    Creds,
-    InitCredsContext,
-    Krb5Prompt,
-    TicketFlags,
-    TicketTimes,
-    get_init_creds_keytab,
-    get_init_creds_password,
-    get_renewed_creds,
-    init_creds_get,
-    init_creds_get_creds,
-    init_creds_init,
-    init_creds_set_keytab,
-    init_creds_set_password,
-)
-from krb5._creds_opt import (
-    GetInitCredsOpt,
-    get_init_creds_opt_alloc,
-    get_init_creds_opt_set_anonymous,
-    get_init_creds_opt_set_canonicalize,
-    get_init_creds_opt_set_etype_list,
-    get_init_creds_opt_set_forwardable,
-    get_init_creds_opt_set_proxiable,
-    get_init_creds_opt_set_renew_life,
-    get_init_creds_opt_set_salt,
-    get_init_creds_opt_set_tkt_life,
-)
-from krb5._exceptions import Krb5Error
-from krb5._keyblock import KeyBlock, copy_keyblock, init_keyblock
-from krb5._kt import (
-    KeyTab,
-    KeyTabEntry,
-    kt_add_entry,
-    kt_default,
-    kt_default_name,
-    kt_get_entry,
-    kt_get_name,
-    kt_get_type,
-    kt_read_service_key,
-    kt_remove_entry,
-    kt_resolve,
-)
-from krb5._principal import (
-    NameType,
-    Principal,
-    PrincipalParseFlags,
-    PrincipalUnparseFlags,
-    build_principal,
-    copy_principal,
-    parse_name_flags,
-    unparse_name_flags,
-)
-from krb5._set_password import (
-    SetPasswordResult,
-    SetPasswordResultCode,
-    set_password,
-    set_password_using_ccache,
-)
-from krb5._string import enctype_to_string, string_to_enctype
-
-__all__ = [
-    "ADPolicyInfo",
-    "ADPolicyInfoProp",
-    "CCache",
-    "Context",
-    "CredentialsRetrieveFlags",
-    "Creds",
-    "GetInitCredsOpt",
-    "InitCredsContext",
-    "KeyBlock",
-    "KeyTab",
-    "KeyTabEntry",
-    "Krb5Error",
-    "Krb5Prompt",
-    "NameType",
-    "Principal",
-    "PrincipalParseFlags",
-    "PrincipalUnparseFlags",
-    "SetPasswordResult",
-    "SetPasswordResultCode",
-    "TicketFlags",
-    "TicketTimes",
-    "build_principal",
-    "cc_default",
-    "cc_default_name",
-    "cc_destroy",
-    "cc_get_config",
-    "cc_get_name",
-    "cc_get_principal",
-    "cc_get_type",
-    "cc_initialize",
-    "cc_new_unique",
-    "cc_remove_cred",
-    "cc_resolve",
-    "cc_retrieve_cred",
-    "cc_set_config",
-    "cc_set_default_name",
-    "cc_store_cred",
-    "cc_switch",
-    "cccol_iter",
-    "copy_keyblock",
-    "copy_principal",
-    "enctype_to_string",
-    "get_default_realm",
-    "get_init_creds_keytab",
-    "get_init_creds_opt_alloc",
-    "get_init_creds_opt_set_anonymous",
-    "get_init_creds_opt_set_canonicalize",
-    "get_init_creds_opt_set_etype_list",
-    "get_init_creds_opt_set_forwardable",
-    "get_init_creds_opt_set_proxiable",
-    "get_init_creds_opt_set_renew_life",
-    "get_init_creds_opt_set_salt",
-    "get_init_creds_opt_set_tkt_life",
-    "get_init_creds_password",
-    "get_renewed_creds",
-    "init_context",
-    "init_creds_get",
-    "init_creds_get_creds",
-    "init_creds_init",
-    "init_creds_set_keytab",
-    "init_creds_set_password",
-    "init_keyblock",
-    "kt_add_entry",
-    "kt_default",
-    "kt_default_name",
-    "kt_get_entry",
-    "kt_get_name",
-    "kt_get_type",
-    "kt_read_service_key",
-    "kt_remove_entry",
-    "kt_resolve",
-    "parse_name_flags",
-    "set_default_realm",
-    "set_password",
-    "set_password_using_ccache",
-    "set_real_time",
-    "string_to_enctype",
-    "timeofday",
-    "unparse_name_flags",
-    "us_timeofday",
-]
-
-# Provider or version specific APIs
-try:
-    from krb5._ccache_mit import cc_dup
-except ImportError:
-    pass
-else:
-    __all__.append("cc_dup")
-
-
-try:
-    from krb5._creds_mit import get_etype_info, get_validated_creds
-except ImportError:
-    pass
-else:
-    __all__.append("get_etype_info")
-    __all__.append("get_validated_creds")
-
-try:
-    from krb5._creds_marshal_mit import marshal_credentials, unmarshal_credentials
-except ImportError:
-    pass
-else:
-    __all__.append("marshal_credentials")
-    __all__.append("unmarshal_credentials")
-
-try:
-    from krb5._chpw_message_mit import chpw_message
-except ImportError:
-    pass
-else:
-    __all__.append("chpw_message")
-
-
-try:
-    from krb5._ccache_match import cc_cache_match
-except ImportError:
-    pass
-else:
-    __all__.append("cc_cache_match")
-
-try:
-    from krb5._ccache_support_switch import cc_support_switch
-except ImportError:
-    pass
-else:
-    __all__.append("cc_support_switch")
-
-try:
-    from krb5._context_mit import init_secure_context
-except ImportError:
-    pass
-else:
-    __all__.append("init_secure_context")
-
-try:
-    from krb5._context_mit import get_time_offsets
-except ImportError:
-    pass
-else:
-    __all__.append("get_time_offsets")
-
-
-try:
-    from krb5._creds_opt_heimdal import get_init_creds_opt_set_default_flags
-except ImportError:
-    pass
-else:
-    __all__.append("get_init_creds_opt_set_default_flags")
-
-
-try:
+# The extension modules are only imported when one of their names is first
+# accessed through the krb5 namespace so importing krb5 stays cheap for
+# processes that only use a few of the APIs.
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import typing
+
+if typing.TYPE_CHECKING:
+    from krb5._adpi import ADPolicyInfo as ADPolicyInfo
+    from krb5._adpi import ADPolicyInfoProp as ADPolicyInfoProp
+    from krb5._aio import cc_aiter as cc_aiter
+    from krb5._aio import cccol_aiter as cccol_aiter
+    from krb5._aio import kt_aiter as kt_aiter
+    from krb5._ccache import CCache as CCache
+    from krb5._ccache import CCacheCompactResult as CCacheCompactResult
+    from krb5._ccache import CredentialsRetrieveFlags as CredentialsRetrieveFlags
+    from krb5._ccache import cc_compact as cc_compact
+    from krb5._ccache import cc_copy_creds as cc_copy_creds
+    from krb5._ccache import cc_copy_creds_matching as cc_copy_creds_matching
+    from krb5._ccache import cc_default as cc_default
+    from krb5._ccache import cc_default_name as cc_default_name
+    from krb5._ccache import cc_destroy as cc_destroy
+    from krb5._ccache import cc_find_expiring as cc_find_expiring
+    from krb5._ccache import cc_get_config as cc_get_config
+    from krb5._ccache import cc_get_name as cc_get_name
+    from krb5._ccache import cc_get_principal as cc_get_principal
+    from krb5._ccache import cc_get_type as cc_get_type
+    from krb5._ccache import cc_initialize as cc_initialize
+    from krb5._ccache import cc_move as cc_move
+    from krb5._ccache import cc_new_unique as cc_new_unique
+    from krb5._ccache import cc_next_expiry as cc_next_expiry
+    from krb5._ccache import cc_remove_cred as cc_remove_cred
+    from krb5._ccache import cc_resolve as cc_resolve
+    from krb5._ccache import cc_retrieve_cred as cc_retrieve_cred
+    from krb5._ccache import cc_set_config as cc_set_config
+    from krb5._ccache import cc_set_default_name as cc_set_default_name
+    from krb5._ccache import cc_store_cred as cc_store_cred
+    from krb5._ccache import cc_switch as cc_switch
+    from krb5._ccache import cc_try_get_config as cc_try_get_config
+    from krb5._ccache import cc_try_retrieve_cred as cc_try_retrieve_cred
+    from krb5._ccache_match import cc_cache_match as cc_cache_match
+    from krb5._ccache_mit import cc_dup as cc_dup
+    from krb5._ccache_support_switch import cc_support_switch as cc_support_switch
+    from krb5._cccol import cccol_iter as cccol_iter
+    from krb5._cccol_sweep import CCacheSweepResult as CCacheSweepResult
+    from krb5._cccol_sweep import cccol_sweep as cccol_sweep
+    from krb5._chpw_message_mit import chpw_message as chpw_message
+    from krb5._context import Context as Context
+    from krb5._context import get_default_realm as get_default_realm
+    from krb5._context import init_context as init_context
+    from krb5._context import set_default_realm as set_default_realm
+    from krb5._context import set_real_time as set_real_time
+    from krb5._context import timeofday as timeofday
+    from krb5._context import us_timeofday as us_timeofday
+    from krb5._context_mit import get_time_offsets as get_time_offsets
+    from krb5._context_mit import init_secure_context as init_secure_context
+    from krb5._creds import Creds as Creds
+    from krb5._creds import InitCredsContext as InitCredsContext
+    from krb5._creds import Krb5Prompt as Krb5Prompt
+    from krb5._creds import TicketFlags as TicketFlags
+    from krb5._creds import TicketTimes as TicketTimes
+    from krb5._creds import get_init_creds_keytab as get_init_creds_keytab
+    from krb5._creds import get_init_creds_password as get_init_creds_password
+    from krb5._creds import get_renewed_creds as get_renewed_creds
+    from krb5._creds import init_creds_get as init_creds_get
+    from krb5._creds import init_creds_get_creds as init_creds_get_creds
+    from krb5._creds import init_creds_init as init_creds_init
+    from krb5._creds import init_creds_set_keytab as init_creds_set_keytab
+    from krb5._creds import init_creds_set_password as init_creds_set_password
+    from krb5._creds import verify_init_creds as verify_init_creds
+    from krb5._creds_marshal_mit import marshal_credentials as marshal_credentials
+    from krb5._creds_marshal_mit import unmarshal_credentials as unmarshal_credentials
+    from krb5._creds_mit import get_etype_info as get_etype_info
+    from krb5._creds_mit import get_validated_creds as get_validated_creds
+    from krb5._creds_opt import GetInitCredsOpt as GetInitCredsOpt
+    from krb5._creds_opt import get_init_creds_opt_alloc as get_init_creds_opt_alloc
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_anonymous as get_init_creds_opt_set_anonymous,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_canonicalize as get_init_creds_opt_set_canonicalize,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_etype_list as get_init_creds_opt_set_etype_list,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_forwardable as get_init_creds_opt_set_forwardable,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_proxiable as get_init_creds_opt_set_proxiable,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_renew_life as get_init_creds_opt_set_renew_life,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_salt as get_init_creds_opt_set_salt,
+    )
+    from krb5._creds_opt import (
+        get_init_creds_opt_set_tkt_life as get_init_creds_opt_set_tkt_life,
+    )
+    from krb5._creds_opt_heimdal import (
+        get_init_creds_opt_set_default_flags as get_init_creds_opt_set_default_flags,
+    )
+    from krb5._creds_opt_mit import FastFlags as FastFlags
     from krb5._creds_opt_mit import (
-        FastFlags,
-        get_init_creds_opt_set_fast_ccache,
-        get_init_creds_opt_set_fast_ccache_name,
-        get_init_creds_opt_set_fast_flags,
-        get_init_creds_opt_set_out_ccache,
-        get_init_creds_opt_set_pa,
+        get_init_creds_opt_set_fast_ccache as get_init_creds_opt_set_fast_ccache,
     )
-except ImportError:
-    pass
-else:
-    __all__.extend(
-        [
-            "FastFlags",
-            "get_init_creds_opt_set_fast_ccache",
-            "get_init_creds_opt_set_fast_ccache_name",
-            "get_init_creds_opt_set_fast_flags",
-            "get_init_creds_opt_set_out_ccache",
-            "get_init_creds_opt_set_pa",
-        ]
+    from krb5._creds_opt_mit import (
+        get_init_creds_opt_set_fast_ccache_name as get_init_creds_opt_set_fast_ccache_name,
     )
-
-
-try:
-    from krb5._creds_opt_set_in_ccache import get_init_creds_opt_set_in_ccache
-except ImportError:
-    pass
-else:
-    __all__.append("get_init_creds_opt_set_in_ccache")
-
-
-try:
-    from krb5._creds_opt_set_pac_request import get_init_creds_opt_set_pac_request
-except ImportError:
-    pass
-else:
-    __all__.append("get_init_creds_opt_set_pac_request")
-
-
-try:
-    from krb5._keyblock_mit import c_string_to_key
-except ImportError:
-    pass
-else:
-    __all__.append("c_string_to_key")
-
-
-try:
-    from krb5._kt_mit import kt_client_default, kt_dup
-except ImportError:
-    pass
-else:
+    from krb5._creds_opt_mit import (
+        get_init_creds_opt_set_fast_flags as get_init_creds_opt_set_fast_flags,
+    )
+    from krb5._creds_opt_mit import (
+        get_init_creds_opt_set_out_ccache as get_init_creds_opt_set_out_ccache,
+    )
+    from krb5._creds_opt_mit import (
+        get_init_creds_opt_set_pa as get_init_creds_opt_set_pa,
+    )
+    from krb5._creds_opt_set_in_ccache import (
+        get_init_creds_opt_set_in_ccache as get_init_creds_opt_set_in_ccache,
+    )
+    from krb5._creds_opt_set_pac_request import (
+        get_init_creds_opt_set_pac_request as get_init_creds_opt_set_pac_request,
+    )
+    from krb5._creds_opt_template import (
+        GetInitCredsOptTemplate as GetInitCredsOptTemplate,
+    )
+    from krb5._creds_step_mit import CredsStepResult as CredsStepResult
+    from krb5._creds_step_mit import TktCredsContext as TktCredsContext
+    from krb5._creds_step_mit import init_creds_step as init_creds_step
+    from krb5._creds_step_mit import tkt_creds_get as tkt_creds_get
+    from krb5._creds_step_mit import tkt_creds_get_creds as tkt_creds_get_creds
+    from krb5._creds_step_mit import tkt_creds_init as tkt_creds_init
+    from krb5._creds_step_mit import tkt_creds_step as tkt_creds_step
+    from krb5._exceptions import CCacheNotFoundError as CCacheNotFoundError
+    from krb5._exceptions import CredentialsNotFoundError as CredentialsNotFoundError
+    from krb5._exceptions import KeyTabEntryNotFoundError as KeyTabEntryNotFoundError
+    from krb5._exceptions import Krb5Error as Krb5Error
+    from krb5._exceptions import Krb5NotFoundError as Krb5NotFoundError
+    from krb5._exceptions import PreauthFailedError as PreauthFailedError
+    from krb5._exceptions import PrincipalUnknownError as PrincipalUnknownError
+    from krb5._keyblock import KeyBlock as KeyBlock
+    from krb5._keyblock import copy_keyblock as copy_keyblock
+    from krb5._keyblock import init_keyblock as init_keyblock
+    from krb5._keyblock_mit import c_string_to_key as c_string_to_key
+    from krb5._keyblock_mit import c_string_to_keys as c_string_to_keys
+    from krb5._kt import KeyTab as KeyTab
+    from krb5._kt import KeyTabEntry as KeyTabEntry
+    from krb5._kt import kt_add_entry as kt_add_entry
+    from krb5._kt import kt_default as kt_default
+    from krb5._kt import kt_default_name as kt_default_name
+    from krb5._kt import kt_get_entry as kt_get_entry
+    from krb5._kt import kt_get_name as kt_get_name
+    from krb5._kt import kt_get_type as kt_get_type
+    from krb5._kt import kt_read_service_key as kt_read_service_key
+    from krb5._kt import kt_remove_entry as kt_remove_entry
+    from krb5._kt import kt_resolve as kt_resolve
+    from krb5._kt import kt_try_get_entry as kt_try_get_entry
+    from krb5._kt_have_content import kt_have_content as kt_have_content
+    from krb5._kt_heimdal import kt_get_full_name as kt_get_full_name
+    from krb5._kt_mit import kt_client_default as kt_client_default
+    from krb5._kt_mit import kt_dup as kt_dup
+    from krb5._kt_password import kt_add_password_entries as kt_add_password_entries
+    from krb5._principal import NameType as NameType
+    from krb5._principal import Principal as Principal
+    from krb5._principal import PrincipalParseFlags as PrincipalParseFlags
+    from krb5._principal import PrincipalUnparseFlags as PrincipalUnparseFlags
+    from krb5._principal import build_principal as build_principal
+    from krb5._principal import copy_principal as copy_principal
+    from krb5._principal import parse_name_flags as parse_name_flags
+    from krb5._principal import unparse_name_flags as unparse_name_flags
+    from krb5._principal_heimdal import principal_get_realm as principal_get_realm
+    from krb5._set_password import SetPasswordResult as SetPasswordResult
+    from krb5._set_password import SetPasswordResultCode as SetPasswordResultCode
+    from krb5._set_password import set_password as set_password
+    from krb5._set_password import (
+        set_password_using_ccache as set_password_using_ccache,
+    )
+    from krb5._string import enctype_to_string as enctype_to_string
+    from krb5._string import string_to_enctype as string_to_enctype
+    from krb5._string_mit import enctype_to_name as enctype_to_name
+
+_MODULES: typing.Dict[str, typing.List[str]] = {
+    "_adpi": [
+        "ADPolicyInfo",
+        "ADPolicyInfoProp",
+    ],
+    "_aio": [
+        "cc_aiter",
+        "cccol_aiter",
+        "kt_aiter",
+    ],
+    "_ccache": [
+        "CCache",
+        "CCacheCompactResult",
+        "CredentialsRetrieveFlags",
+        "cc_compact",
+        "cc_copy_creds",
+        "cc_copy_creds_matching",
+        "cc_default",
+        "cc_default_name",
+        "cc_destroy",
+        "cc_find_expiring",
+        "cc_get_config",
+        "cc_get_name",
+        "cc_get_principal",
+        "cc_get_type",
+        "cc_initialize",
+        "cc_move",
+        "cc_new_unique",
+        "cc_next_expiry",
+        "cc_remove_cred",
+        "cc_resolve",
+        "cc_retrieve_cred",
+        "cc_set_config",
+        "cc_set_default_name",
+        "cc_store_cred",
+        "cc_switch",
+        "cc_try_get_config",
+        "cc_try_retrieve_cred",
+    ],
+    "_cccol": [
+        "cccol_iter",
+    ],
+    "_cccol_sweep": [
+        "CCacheSweepResult",
+        "cccol_sweep",
+    ],
+    "_context": [
+        "Context",
+        "get_default_realm",
+        "init_context",
+        "set_default_realm",
+        "set_real_time",
+        "timeofday",
+        "us_timeofday",
+    ],
+    "_creds": [
+        "Creds",
+        "InitCredsContext",
+        "Krb5Prompt",
+        "TicketFlags",
+        "TicketTimes",
+        "get_init_creds_keytab",
+        "get_init_creds_password",
+        "get_renewed_creds",
+        "init_creds_get",
+        "init_creds_get_creds",
+        "init_creds_init",
+        "init_creds_set_keytab",
+        "init_creds_set_password",
+        "verify_init_creds",
+    ],
+    "_creds_opt": [
+        "GetInitCredsOpt",
+        "get_init_creds_opt_alloc",
+        "get_init_creds_opt_set_anonymous",
+        "get_init_creds_opt_set_canonicalize",
+        "get_init_creds_opt_set_etype_list",
+        "get_init_creds_opt_set_forwardable",
+        "get_init_creds_opt_set_proxiable",
+        "get_init_creds_opt_set_renew_life",
+        "get_init_creds_opt_set_salt",
+        "get_init_creds_opt_set_tkt_life",
+    ],
+    "_creds_opt_template": [
+        "GetInitCredsOptTemplate",
+    ],
+    "_exceptions": [
+        "CCacheNotFoundError",
+        "CredentialsNotFoundError",
+        "KeyTabEntryNotFoundError",
+        "Krb5Error",
+        "Krb5NotFoundError",
+        "PreauthFailedError",
+        "PrincipalUnknownError",
+    ],
+    "_keyblock": [
+        "KeyBlock",
+        "copy_keyblock",
+        "init_keyblock",
+    ],
+    "_kt": [
+        "KeyTab",
+        "KeyTabEntry",
+        "kt_add_entry",
+        "kt_default",
+        "kt_default_name",
+        "kt_get_entry",
+        "kt_get_name",
+        "kt_get_type",
+        "kt_read_service_key",
+        "kt_remove_entry",
+        "kt_resolve",
+        "kt_try_get_entry",
+    ],
+    "_principal": [
+        "NameType",
+        "Principal",
+        "PrincipalParseFlags",
+        "PrincipalUnparseFlags",
+        "build_principal",
+        "copy_principal",
+        "parse_name_flags",
+        "unparse_name_flags",
+    ],
+    "_set_password": [
+        "SetPasswordResult",
+        "SetPasswordResultCode",
+        "set_password",
+        "set_password_using_ccache",
+    ],
+    "_string": [
+        "enctype_to_string",
+        "string_to_enctype",
+    ],
+}
+
+# Provider or version specific APIs, these modules are only built when the
+# Kerberos library supports them.
+_OPTIONAL_MODULES: typing.Dict[str, typing.List[str]] = {
+    "_ccache_match": [
+        "cc_cache_match",
+    ],
+    "_ccache_mit": [
+        "cc_dup",
+    ],
+    "_ccache_support_switch": [
+        "cc_support_switch",
+    ],
+    "_chpw_message_mit": [
+        "chpw_message",
+    ],
+    "_context_mit": [
+        "init_secure_context",
+        "get_time_offsets",
+    ],
+    "_creds_marshal_mit": [
+        "marshal_credentials",
+        "unmarshal_credentials",
+    ],
+    "_creds_mit": [
+        "get_etype_info",
+        "get_validated_creds",
+    ],
+    "_creds_opt_heimdal": [
+        "get_init_creds_opt_set_default_flags",
+    ],
+    "_creds_opt_mit": [
+        "FastFlags",
+        "get_init_creds_opt_set_fast_ccache",
+        "get_init_creds_opt_set_fast_ccache_name",
+        "get_init_creds_opt_set_fast_flags",
+        "get_init_creds_opt_set_out_ccache",
+        "get_init_creds_opt_set_pa",
+    ],
+    "_creds_opt_set_in_ccache": [
+        "get_init_creds_opt_set_in_ccache",
+    ],
+    "_creds_opt_set_pac_request": [
+        "get_init_creds_opt_set_pac_request",
+    ],
+    "_creds_step_mit": [
+        "CredsStepResult",
+        "TktCredsContext",
+        "init_creds_step",
+        "tkt_creds_get",
+        "tkt_creds_get_creds",
+        "tkt_creds_init",
+        "tkt_creds_step",
+    ],
+    "_keyblock_mit": [
+        "c_string_to_key",
+        "c_string_to_keys",
+    ],
+    "_kt_have_content": [
+        "kt_have_content",
+    ],
+    "_kt_heimdal": [
+        "kt_get_full_name",
+    ],
+    "_kt_mit": [
+        "kt_client_default",
+        "kt_dup",
+    ],
+    "_principal_heimdal": [
+        "principal_get_realm",
+    ],
+    "_string_mit": [
+        "enctype_to_name",
+    ],
+}
+
+_ATTRIBUTES: typing.Dict[str, str] = {}
+for _module, _names in _MODULES.items():
+    _ATTRIBUTES.update((n, _module) for n in _names)
+
+for _module, _names in _OPTIONAL_MODULES.items():
+    if importlib.util.find_spec(f"{__name__}.{_module}") is not None:
+        _ATTRIBUTES.update((n, _module) for n in _names)
+
+# Python helpers built on the optional APIs are only available when the APIs
+# they use are.
+if "get_etype_info" in _ATTRIBUTES and "c_string_to_keys" in _ATTRIBUTES:
+    _ATTRIBUTES["kt_add_password_entries"] = "_kt_password"
+
+__all__ = list(_ATTRIBUTES)
+
+if "kt_dup" in _ATTRIBUTES and "kt_get_full_name" not in _ATTRIBUTES:
 
     def kt_get_full_name(
         context: Context,
@@ -306,36 +422,27 @@ else:
         # This isn't implemented in MIT so mock the same behaviour
         return (keytab.kt_type or b"") + b":" + (keytab.name or b"")
 
-    __all__.extend(["kt_client_default", "kt_dup", "kt_get_full_name", "kt_get_type"])
-
+    __all__.append("kt_get_full_name")
 
-try:
-    from krb5._kt_heimdal import kt_get_full_name
-except ImportError:
-    pass
-else:
-    __all__.extend(["kt_get_full_name", "kt_get_type"])
 
+def __getattr__(name: str) -> typing.Any:
+    module_name = _ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    from krb5._kt_have_content import kt_have_content
-except ImportError:
-    pass
-else:
-    __all__.append("kt_have_content")
+    try:
+        module = importlib.import_module(f"{__name__}.{module_name}")
+    except ImportError as e:
+        if module_name not in _OPTIONAL_MODULES:
+            raise
 
+        # Keeps hasattr(krb5, name) working for an optional API that fails to load.
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
 
-try:
-    from krb5._principal_heimdal import principal_get_realm
-except ImportError:
-    pass
-else:
-    __all__.extend(["principal_get_realm"])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
 
-try:
-    from krb5._string_mit import enctype_to_name
-except ImportError:
-    pass
-else:
-    __all__.append("enctype_to_name")
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(__all__))
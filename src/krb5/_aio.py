@@ -0,0 +1,179 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import itertools
+import typing
+
+import krb5
+
+T = typing.TypeVar("T")
+
+
+def _next_chunk(
+    iterator: typing.Iterator[T],
+    size: int,
+) -> typing.List[T]:
+    return list(itertools.islice(iterator, size))
+
+
+def _close(
+    iterator: typing.Iterator[T],
+    handle: typing.Optional[typing.Union[krb5.CCache, krb5.KeyTab]],
+) -> None:
+    # Closing the generator ends the native sequence before the handle it
+    # uses is closed. The context is left to be freed with the last object
+    # that was returned with it.
+    getattr(iterator, "close", lambda: None)()
+    if handle is not None:
+        handle.close()
+
+
+def _aiter_chunks(
+    open_iter: typing.Callable[[], typing.Tuple[typing.Any, typing.Iterator[T]]],
+    chunk_size: int,
+    executor: typing.Optional[concurrent.futures.Executor],
+) -> typing.AsyncGenerator[T, None]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than 0")
+
+    return _read_chunks(open_iter, chunk_size, executor)
+
+
+async def _read_chunks(
+    open_iter: typing.Callable[[], typing.Tuple[typing.Any, typing.Iterator[T]]],
+    chunk_size: int,
+    executor: typing.Optional[concurrent.futures.Executor],
+) -> typing.AsyncGenerator[T, None]:
+    loop = asyncio.get_running_loop()
+    handle: typing.Any = None
+    iterator: typing.Optional[typing.Iterator[T]] = None
+    pending: typing.Optional[asyncio.Future[typing.Any]] = None
+    try:
+        # The steps are shielded so cancelling the task does not leave them
+        # running on the executor while the iterator is closed.
+        pending = loop.run_in_executor(executor, open_iter)
+        handle, iterator = await asyncio.shield(pending)
+        while True:
+            pending = loop.run_in_executor(executor, _next_chunk, iterator, chunk_size)
+            chunk = await asyncio.shield(pending)
+            for value in chunk:
+                yield value
+
+            if len(chunk) < chunk_size:
+                break
+
+    finally:
+        if pending is not None:
+            if not pending.done():
+                await asyncio.wait([pending])
+
+            # The task was cancelled after the iterator was opened.
+            if iterator is None and not pending.cancelled() and pending.exception() is None:
+                handle, iterator = pending.result()
+
+        if iterator is not None:
+            await loop.run_in_executor(executor, _close, iterator, handle)
+
+
+def cc_aiter(
+    context: krb5.Context,
+    cache: krb5.CCache,
+    chunk_size: int = 100,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+) -> typing.AsyncGenerator[krb5.Creds, None]:
+    """Asynchronously iterate through the credentials in a credential cache.
+
+    The cache is opened again with a new context and the credentials are read
+    in chunks of ``chunk_size`` entries on the executor so the event loop is
+    not blocked while the cache is read. The new context is only used on the
+    executor and is freed with the last of the returned credentials. Call
+    ``aclose()`` on the generator when stopping before the end so the cache is
+    closed straight away rather than when the generator is garbage collected.
+
+    Args:
+        context: Krb5 context.
+        cache: The credential cache to iterate.
+        chunk_size: The number of entries to read on the executor at a time.
+        executor: The executor to read the entries on, defaults to the
+            default executor of the event loop.
+
+    Returns:
+        AsyncGenerator[Creds]: The credentials in the cache.
+    """
+    name = krb5.cc_get_type(context, cache) + b":" + krb5.cc_get_name(context, cache)
+
+    def open_iter() -> typing.Tuple[krb5.CCache, typing.Iterator[krb5.Creds]]:
+        handle = krb5.cc_resolve(krb5.init_context(), name)
+        return handle, iter(handle)
+
+    return _aiter_chunks(open_iter, chunk_size, executor)
+
+
+def kt_aiter(
+    context: krb5.Context,
+    keytab: krb5.KeyTab,
+    chunk_size: int = 100,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+) -> typing.AsyncGenerator[krb5.KeyTabEntry, None]:
+    """Asynchronously iterate through the entries in a keytab.
+
+    The keytab is opened again with a new context and the entries are read
+    in chunks of ``chunk_size`` entries on the executor so the event loop is
+    not blocked while the keytab is read. The new context is only used on
+    the executor and is freed with the last of the returned entries. Like
+    :meth:`cc_aiter`, call ``aclose()`` when stopping before the end.
+
+    Args:
+        context: Krb5 context.
+        keytab: The keytab to iterate.
+        chunk_size: The number of entries to read on the executor at a time.
+        executor: The executor to read the entries on, defaults to the
+            default executor of the event loop.
+
+    Returns:
+        AsyncGenerator[KeyTabEntry]: The entries in the keytab.
+    """
+    name = (keytab.kt_type or b"") + b":" + (keytab.name or b"")
+
+    def open_iter() -> typing.Tuple[krb5.KeyTab, typing.Iterator[krb5.KeyTabEntry]]:
+        handle = krb5.kt_resolve(krb5.init_context(), name)
+        return handle, iter(handle)
+
+    return _aiter_chunks(open_iter, chunk_size, executor)
+
+
+def cccol_aiter(
+    context: krb5.Context,
+    chunk_size: int = 100,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+) -> typing.AsyncGenerator[krb5.CCache, None]:
+    """Asynchronously iterate over the credential caches in the collection.
+
+    The caches are found with a new context, that uses the same default
+    credential cache name as ``context``, in chunks of ``chunk_size`` caches
+    on the executor so the event loop is not blocked. The returned caches are
+    bound to the new context, it should not be used by multiple threads at
+    the same time. Like :meth:`cc_aiter`, call ``aclose()`` when stopping
+    before the end.
+
+    Args:
+        context: Krb5 context.
+        chunk_size: The number of caches to read on the executor at a time.
+        executor: The executor to read the caches on, defaults to the
+            default executor of the event loop.
+
+    Returns:
+        AsyncGenerator[CCache]: The credential caches.
+    """
+    default_name = krb5.cc_default_name(context)
+
+    def open_iter() -> typing.Tuple[None, typing.Iterator[krb5.CCache]]:
+        ctx = krb5.init_context()
+        krb5.cc_set_default_name(ctx, default_name)
+        return None, krb5.cccol_iter(ctx)
+
+    return _aiter_chunks(open_iter, chunk_size, executor)
@@ -1,6 +1,8 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+cimport cython
+
 from krb5._context cimport Context
 from krb5._krb5_types cimport *
 
@@ -8,3 +10,19 @@ from krb5._krb5_types cimport *
 cdef class CCache:
     cdef Context ctx
     cdef krb5_ccache raw
+    # Serializes the native calls made with raw so the same object can be
+    # shared between threads. ensure_open is checked again once the lock is
+    # held as another thread may have closed the handle in the meantime.
+    cdef cython.pymutex lock
+    # The cursors of the iterations in progress, they are ended before raw is
+    # freed so closing the cache during an iteration does not leak them.
+    cdef set cursors
+    cdef object __weakref__
+
+    cdef int ensure_open(CCache self) except -1
+    cdef int end_cursors(CCache self) except -1
+
+
+# Locks up to two caches, either can be None, and checks they are still open.
+cdef int lock_caches(CCache first, CCache second) except -1
+cdef void unlock_caches(CCache first, CCache second) noexcept
@@ -23,6 +23,13 @@ class CredentialsRetrieveFlags(enum.IntEnum):
     match_keytype = ...  #: The encryption key type must match
     supported_ktypes = ...  #: The supported key types must match
 
+class CCacheCompactResult(typing.NamedTuple):
+    """The result of :meth:`cc_compact`."""
+
+    entries_kept: int
+    entries_removed: int
+    bytes_reclaimed: int
+
 class CCache:
     """Kerberos CCache
 
@@ -32,8 +39,23 @@ class CCache:
         context: Krb5 context.
     """
 
+    def __enter__(self) -> CCache: ...
+    def __exit__(self, *args: typing.Any) -> None: ...
     def __iter__(self) -> typing.Iterator[Creds]:
-        """Iterate credentials in a ccache."""
+        """Iterate credentials in a ccache.
+
+        A closed cache yields nothing. Closing, destroying or moving the cache
+        during the iteration ends it.
+        """
+
+    def close(self) -> None:
+        """Close the credential cache handle.
+
+        Closes the handle, and any file descriptor it has open, without
+        waiting for the object to be garbage collected. The cache itself is
+        not destroyed. Passing a closed cache to any function raises a
+        ``ValueError``. Calling ``close()`` more than once does nothing.
+        """
 
     @property
     def addr(self) -> typing.Optional[int]:
@@ -236,6 +258,28 @@ def cc_retrieve_cred(
         Creds: The matching credentials.
     """
 
+def cc_try_retrieve_cred(
+    context: Context,
+    cache: CCache,
+    flags: typing.Union[int, CredentialsRetrieveFlags],
+    mcreds: Creds,
+) -> typing.Optional[Creds]:
+    """Retrieve matching credentials from a credential cache if present.
+
+    Like :meth:`cc_retrieve_cred` but returns None instead of raising an
+    exception when no matching credential is found. Other failures are still
+    raised as a :class:`Krb5Error`.
+
+    Args:
+        context: Krb5 context.
+        cache: The credential cache to retrieve the creds from.
+        flags: The flags describing how to perform the matching.
+        mcreds: The credentials to match against.
+
+    Returns:
+        Optional[Creds]: The matching credentials or None if not found.
+    """
+
 def cc_set_default_name(
     context: Context,
     name: typing.Optional[bytes],
@@ -297,6 +341,28 @@ def cc_get_config(
         key: Name of the variable.
     """
 
+def cc_try_get_config(
+    context: Context,
+    cache: CCache,
+    principal: typing.Optional[Principal],
+    key: bytes,
+) -> typing.Optional[bytes]:
+    """Get a configuration value from a credential cache if present.
+
+    Like :meth:`cc_get_config` but returns None instead of raising an
+    exception when the value is not set. Other failures are still raised as a
+    :class:`Krb5Error`.
+
+    Args:
+        context: Krb5 context.
+        cache: The credential cache to get the data from.
+        principal: The principal to get the configuration for or None for global values.
+        key: Name of the variable.
+
+    Returns:
+        Optional[bytes]: The configuration value or None if not set.
+    """
+
 def cc_set_config(
     context: Context,
     cache: CCache,
@@ -313,3 +379,143 @@ def cc_set_config(
         key: Name of the variable.
         data: Data to store or None to remove.
     """
+
+def cc_find_expiring(
+    context: Context,
+    cache: CCache,
+    within_seconds: int,
+    now: typing.Optional[int] = None,
+) -> typing.List[Creds]:
+    """Find the credentials that expire within the time specified.
+
+    Scans the credential cache in a single native pass, without holding the
+    GIL, and returns only the credentials whose end time is at or before
+    ``now + within_seconds``. This includes credentials that have already
+    expired. Configuration entries stored with :meth:`cc_set_config` are
+    skipped.
+
+    Args:
+        context: Krb5 context.
+        cache: The credential cache to scan.
+        within_seconds: The number of seconds from now to match.
+        now: The current time as seconds since the epoch, defaults to the
+            time of day according to the context.
+
+    Returns:
+        List[Creds]: The expiring credentials in the order they are stored.
+    """
+
+def cc_next_expiry(
+    context: Context,
+    cache: CCache,
+) -> typing.Optional[int]:
+    """Get the earliest end time in a credential cache.
+
+    Scans the credential cache in a single native pass, without holding the
+    GIL, and returns the earliest end time of the credentials in the cache.
+    Configuration entries stored with :meth:`cc_set_config` are skipped.
+
+    Args:
+        context: Krb5 context.
+        cache: The credential cache to scan.
+
+    Returns:
+        Optional[int]: The earliest end time as seconds since the epoch or
+        None if the cache contains no credentials.
+    """
+
+def cc_compact(
+    context: Context,
+    cache: CCache,
+    drop_expired: bool = True,
+) -> CCacheCompactResult:
+    """Rewrite a FILE credential cache with only the live entries.
+
+    Writes the principal and the live entries of the cache to a temporary
+    file in the same directory and atomically renames it over the existing
+    cache. Entries removed with :meth:`cc_remove_cred` are not copied and,
+    when drop_expired is set, neither are credentials that have expired.
+    Configuration entries are always kept.
+
+    The cache is not locked while it is compacted as the libraries only lock
+    it for each operation. It must not be used by another thread or process
+    while it is being compacted. If the file changed while the entries were
+    copied the compaction is abandoned, with the file left as it is, and a
+    ``RuntimeError`` is raised rather than losing the new entries. A change
+    made between that check and the rename is still lost.
+
+    Args:
+        context: Krb5 context.
+        cache: The FILE credential cache to compact.
+        drop_expired: Remove the expired credentials.
+
+    Returns:
+        CCacheCompactResult: The number of entries kept and removed and the
+        number of bytes reclaimed.
+
+    Raises:
+        ValueError: The cache is not a FILE credential cache.
+        RuntimeError: The cache was modified while it was compacted.
+    """
+
+def cc_copy_creds(
+    context: Context,
+    src: CCache,
+    dst: CCache,
+) -> None:
+    """Copy the credentials from one credential cache to another.
+
+    Copies every entry, including the configuration entries, of the source
+    cache into the destination cache without holding the GIL. The
+    destination cache must already be initialized with :meth:`cc_initialize`.
+
+    Args:
+        context: Krb5 context.
+        src: The credential cache to copy from.
+        dst: The credential cache to copy to.
+    """
+
+def cc_copy_creds_matching(
+    context: Context,
+    src: CCache,
+    dst: CCache,
+    server: typing.Optional[Principal] = None,
+    realm: typing.Optional[bytes] = None,
+) -> int:
+    """Copy the matching credentials from one credential cache to another.
+
+    Like :meth:`cc_copy_creds` but only the credentials for the server
+    principal and/or the server realm specified are copied. The matching is
+    done natively while iterating the source cache. Configuration entries
+    are not copied.
+
+    Args:
+        context: Krb5 context.
+        src: The credential cache to copy from.
+        dst: The credential cache to copy to.
+        server: Only copy the credentials for this server principal.
+        realm: Only copy the credentials for a server principal in this
+            realm.
+
+    Returns:
+        int: The number of credentials copied.
+    """
+
+def cc_move(
+    context: Context,
+    src: CCache,
+    dst: CCache,
+) -> None:
+    """Move a credential cache.
+
+    Reinitializes the destination cache with the default principal and
+    credentials of the source cache without holding the GIL. The source
+    cache is then destroyed and the src object can no longer be used, like
+    with :meth:`cc_destroy`. The src object is also closed if destroying the
+    source fails after the credentials were copied.
+
+    Args:
+        context: Krb5 context.
+        src: The credential cache to move.
+        dst: The credential cache to move to.
+    """
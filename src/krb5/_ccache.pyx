@@ -1,26 +1,315 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import collections
 import enum
+import os
+import tempfile
 import typing
 
 from libc.stdint cimport uintptr_t
+from libc.stdlib cimport free
+from libc.string cimport memcpy
 
 from krb5._exceptions import Krb5Error
 from krb5._principal import PrincipalParseFlags
 
 from krb5._context cimport Context
 from krb5._creds cimport Creds
+from krb5._debug cimport track
 from krb5._krb5_types cimport *
 from krb5._principal cimport Principal
 
 
 cdef extern from "python_krb5.h":
+    """
+    /*
+     * Iterates the cache in a single pass and returns the earliest endtime
+     * of the non config entries in next_expiry. If matches is not NULL the
+     * entries with an endtime at or before the before timestamp are
+     * returned in a malloc'd array that the caller must free, along with
+     * the contents of each entry.
+     */
+    krb5_error_code pykrb5_cc_find_expiring(
+        krb5_context context,
+        krb5_ccache cache,
+        krb5_timestamp before,
+        krb5_creds **matches,
+        size_t *count,
+        krb5_timestamp *next_expiry,
+        int *has_expiry
+    )
+    {
+        krb5_error_code err = 0;
+        krb5_error_code end_err = 0;
+        krb5_cc_cursor cursor;
+        krb5_creds creds;
+        krb5_creds *new_matches = NULL;
+        size_t capacity = 0;
+        size_t i = 0;
+
+        if (matches != NULL) *matches = NULL;
+        *count = 0;
+        *next_expiry = 0;
+        *has_expiry = 0;
+
+        err = krb5_cc_start_seq_get(context, cache, &cursor);
+        if (err)
+            return err;
+
+        while ((err = krb5_cc_next_cred(context, cache, &cursor, &creds)) == 0) {
+            if (krb5_is_config_principal(context, creds.server)) {
+                krb5_free_cred_contents(context, &creds);
+                continue;
+            }
+
+            if (!*has_expiry || creds.times.endtime < *next_expiry) {
+                *next_expiry = creds.times.endtime;
+                *has_expiry = 1;
+            }
+
+            if (matches == NULL || creds.times.endtime > before) {
+                krb5_free_cred_contents(context, &creds);
+                continue;
+            }
+
+            if (*count == capacity) {
+                capacity = capacity ? capacity * 2 : 8;
+                new_matches = realloc(*matches, capacity * sizeof(krb5_creds));
+                if (new_matches == NULL) {
+                    krb5_free_cred_contents(context, &creds);
+                    err = ENOMEM;
+                    break;
+                }
+                *matches = new_matches;
+            }
+            (*matches)[(*count)++] = creds;
+        }
+
+        if (err == KRB5_CC_END)
+            err = 0;
+
+        end_err = krb5_cc_end_seq_get(context, cache, &cursor);
+        if (!err)
+            err = end_err;
+
+        if (err && matches != NULL) {
+            for (i = 0; i < *count; i++)
+                krb5_free_cred_contents(context, &(*matches)[i]);
+            free(*matches);
+            *matches = NULL;
+            *count = 0;
+        }
+
+        return err;
+    }
+
+    /*
+     * Initializes dst with the principal of src and copies the entries of
+     * src into it. The config entries are always copied, other entries
+     * with an endtime at or before expired_before are skipped if
+     * drop_expired is set.
+     */
+    krb5_error_code pykrb5_cc_compact(
+        krb5_context context,
+        krb5_ccache src,
+        krb5_ccache dst,
+        int drop_expired,
+        krb5_timestamp expired_before,
+        size_t *kept,
+        size_t *dropped
+    )
+    {
+        krb5_error_code err = 0;
+        krb5_error_code end_err = 0;
+        krb5_principal principal = NULL;
+        krb5_cc_cursor cursor;
+        krb5_creds creds;
+
+        *kept = 0;
+        *dropped = 0;
+
+        err = krb5_cc_get_principal(context, src, &principal);
+        if (err)
+            return err;
+
+        err = krb5_cc_initialize(context, dst, principal);
+        krb5_free_principal(context, principal);
+        if (err)
+            return err;
+
+        err = krb5_cc_start_seq_get(context, src, &cursor);
+        if (err)
+            return err;
+
+        while ((err = krb5_cc_next_cred(context, src, &cursor, &creds)) == 0) {
+            if (drop_expired && creds.times.endtime <= expired_before &&
+                !krb5_is_config_principal(context, creds.server)) {
+                (*dropped)++;
+            }
+            else {
+                err = krb5_cc_store_cred(context, dst, &creds);
+                (*kept)++;
+            }
+            krb5_free_cred_contents(context, &creds);
+            if (err)
+                break;
+        }
+
+        if (err == KRB5_CC_END)
+            err = 0;
+
+        end_err = krb5_cc_end_seq_get(context, src, &cursor);
+        if (!err)
+            err = end_err;
+
+        return err;
+    }
+
+    /*
+     * Stores the credentials in src that match the server principal and
+     * realm into dst. Either filter can be NULL to match any value, config
+     * entries are never copied.
+     */
+    krb5_error_code pykrb5_cc_copy_matching(
+        krb5_context context,
+        krb5_ccache src,
+        krb5_ccache dst,
+        krb5_const_principal server,
+        const char *realm,
+        size_t realm_length,
+        size_t *copied
+    )
+    {
+        krb5_error_code err = 0;
+        krb5_error_code end_err = 0;
+        krb5_cc_cursor cursor;
+        krb5_creds creds;
+        const char *server_realm;
+        size_t server_realm_length;
+
+        *copied = 0;
+
+        err = krb5_cc_start_seq_get(context, src, &cursor);
+        if (err)
+            return err;
+
+        while ((err = krb5_cc_next_cred(context, src, &cursor, &creds)) == 0) {
+    #if defined(HEIMDAL_XFREE)
+            server_realm = creds.server->realm;
+            server_realm_length = strlen(server_realm);
+    #else
+            server_realm = creds.server->realm.data;
+            server_realm_length = creds.server->realm.length;
+    #endif
+
+            if (!krb5_is_config_principal(context, creds.server) &&
+                (server == NULL || krb5_principal_compare(context, server, creds.server)) &&
+                (realm == NULL || (realm_length == server_realm_length &&
+                                   memcmp(realm, server_realm, realm_length) == 0))) {
+                err = krb5_cc_store_cred(context, dst, &creds);
+                if (!err)
+                    (*copied)++;
+            }
+            krb5_free_cred_contents(context, &creds);
+            if (err)
+                break;
+        }
+
+        if (err == KRB5_CC_END)
+            err = 0;
+
+        end_err = krb5_cc_end_seq_get(context, src, &cursor);
+        if (!err)
+            err = end_err;
+
+        return err;
+    }
+
+    /*
+     * Initializes dst with the principal of src, copies the entries of src
+     * into it and destroys src like krb5_cc_move. krb5_cc_destroy frees the
+     * src handle even when it fails so src_freed is set once it is called,
+     * krb5_cc_move does not report whether it got that far.
+     */
+    krb5_error_code pykrb5_cc_move(
+        krb5_context context,
+        krb5_ccache src,
+        krb5_ccache dst,
+        int *src_freed
+    )
+    {
+        krb5_error_code err = 0;
+        krb5_principal principal = NULL;
+
+        *src_freed = 0;
+
+        err = krb5_cc_get_principal(context, src, &principal);
+        if (err)
+            return err;
+
+        err = krb5_cc_initialize(context, dst, principal);
+        krb5_free_principal(context, principal);
+        if (err)
+            return err;
+
+        err = krb5_cc_copy_creds(context, src, dst);
+        if (err)
+            return err;
+
+        *src_freed = 1;
+        return krb5_cc_destroy(context, src);
+    }
+    """
+
+    krb5_error_code pykrb5_cc_move(
+        krb5_context context,
+        krb5_ccache src,
+        krb5_ccache dst,
+        int *src_freed,
+    ) nogil
+
+    krb5_error_code pykrb5_cc_copy_matching(
+        krb5_context context,
+        krb5_ccache src,
+        krb5_ccache dst,
+        krb5_const_principal server,
+        const char *realm,
+        size_t realm_length,
+        size_t *copied,
+    ) nogil
+
+    krb5_error_code pykrb5_cc_compact(
+        krb5_context context,
+        krb5_ccache src,
+        krb5_ccache dst,
+        int drop_expired,
+        krb5_timestamp expired_before,
+        size_t *kept,
+        size_t *dropped,
+    ) nogil
+
+    krb5_error_code pykrb5_cc_find_expiring(
+        krb5_context context,
+        krb5_ccache cache,
+        krb5_timestamp before,
+        krb5_creds **matches,
+        size_t *count,
+        krb5_timestamp *next_expiry,
+        int *has_expiry,
+    ) nogil
+
     krb5_error_code krb5_cc_close(
         krb5_context context,
         krb5_ccache cache,
     ) nogil
 
+    krb5_error_code krb5_cc_copy_creds(
+        krb5_context context,
+        krb5_ccache incc,
+        krb5_ccache outcc,
+    ) nogil
+
     krb5_error_code krb5_cc_default(
         krb5_context context,
         krb5_ccache *cache,
@@ -115,6 +404,16 @@ cdef extern from "python_krb5.h":
         krb5_cc_cursor *cursor,
     ) nogil
 
+    void krb5_free_cred_contents(
+        krb5_context context,
+        krb5_creds *creds,
+    ) nogil
+
+    krb5_error_code krb5_timeofday(
+        krb5_context context,
+        krb5_timestamp *seconds,
+    ) nogil
+
     krb5_error_code krb5_cc_switch(
         krb5_context context,
         krb5_ccache cache,
@@ -147,6 +446,9 @@ cdef extern from "python_krb5.h":
     int32_t KRB5_TC_MATCH_KTYPE
     int32_t KRB5_TC_SUPPORTED_KTYPES
 
+    krb5_error_code KRB5_CC_END
+    krb5_error_code KRB5_CC_NOTFOUND
+
 
 _CredentialsRetrieveFlags_members = [
     ('none', 0),
@@ -169,50 +471,117 @@ if KRB5_TC_SUPPORTED_KTYPES != 0:
 CredentialsRetrieveFlags = enum.IntEnum('CredentialsRetrieveFlags', _CredentialsRetrieveFlags_members)
 
 
+CCacheCompactResult = collections.namedtuple('CCacheCompactResult', [
+    'entries_kept',
+    'entries_removed',
+    'bytes_reclaimed',
+])
+
+
+cdef class _CCacheCursor:
+    # The position of an iteration over a CCache, raw is only valid while
+    # active is set.
+    cdef krb5_cc_cursor raw
+    cdef int active
+
+
 cdef class CCache:
     # cdef Context ctx
     # cdef krb5_ccache raw
+    # cdef cython.pymutex lock
+    # cdef set cursors
 
     def __cinit__(CCache self, Context context):
         self.ctx = context
         self.raw = NULL
+        self.cursors = None
+        context.add_dependent(self)
+        track(self)
 
     def __dealloc__(CCache self):
-        if self.raw:
+        # Closing the context closes the handle first, raw is only still set
+        # while the context is open.
+        if self.raw and self.ctx.raw:
             krb5_cc_close(self.ctx.raw, self.raw)
             self.raw = NULL
 
-    def __iter__(CCache self) -> typing.Iterator[Creds]:
-        cdef krb5_error_code err = 0
-        cdef krb5_cc_cursor cursor
+    def __enter__(CCache self) -> CCache:
+        return self
 
-        if self.raw == NULL:
-            return
+    def __exit__(CCache self, *args: typing.Any) -> None:
+        self.close()
 
-        err = krb5_cc_start_seq_get(self.ctx.raw, self.raw, &cursor)
+    def __iter__(CCache self) -> typing.Iterator[Creds]:
+        cdef krb5_error_code err = 0
+        cdef _CCacheCursor cursor = _CCacheCursor()
+
+        # The lock is only held for each native call and never across a
+        # yield so other threads can use the cache between entries. Closing
+        # the cache ends the cursor, which stops the iteration.
+        with self.lock:
+            if self.raw != NULL:
+                err = krb5_cc_start_seq_get(self.ctx.raw, self.raw, &cursor.raw)
+                if not err:
+                    cursor.active = 1
+                    if self.cursors is None:
+                        self.cursors = set()
+                    self.cursors.add(cursor)
         if err:
             raise Krb5Error(self.ctx, err)
 
         try:
             while True:
                 creds = Creds(self.ctx)
-                err = krb5_cc_next_cred(
-                    self.ctx.raw,
-                    self.raw,
-                    &cursor,
-                    creds.get_pointer(),
-                )
-                if err:
+                with self.lock:
+                    if cursor.active:
+                        err = krb5_cc_next_cred(
+                            self.ctx.raw,
+                            self.raw,
+                            &cursor.raw,
+                            creds.get_pointer(),
+                        )
+                if err or not cursor.active:
                     break
 
                 creds.free_contents = 1
                 yield creds
 
         finally:
-            err = krb5_cc_end_seq_get(self.ctx.raw, self.raw, &cursor)
+            err = 0
+            with self.lock:
+                if cursor.active:
+                    err = krb5_cc_end_seq_get(self.ctx.raw, self.raw, &cursor.raw)
+                    cursor.active = 0
+                    self.cursors.discard(cursor)
             if err:
                 raise Krb5Error(self.ctx, err)
 
+    def close(CCache self) -> None:
+        with self.lock:
+            if self.raw:
+                self.ctx.ensure_open()
+                self.end_cursors()
+                krb5_cc_close(self.ctx.raw, self.raw)
+                self.raw = NULL
+
+    cdef int ensure_open(CCache self) except -1:
+        if self.raw == NULL:
+            raise ValueError("CCache is closed")
+
+        return 0
+
+    cdef int end_cursors(CCache self) except -1:
+        # Called with the lock held before raw is freed.
+        cdef _CCacheCursor cursor
+
+        if self.cursors:
+            for cursor in self.cursors:
+                krb5_cc_end_seq_get(self.ctx.raw, self.raw, &cursor.raw)
+                cursor.active = 0
+            self.cursors.clear()
+
+        return 0
+
     @property
     def addr(self) -> typing.Optional[int]:
         if self.raw:
@@ -253,9 +622,46 @@ cdef class CCache:
             return "NULL"
 
 
+cdef int lock_caches(CCache first, CCache second) except -1:
+    if first is None or first is second:
+        first, second = second, None
+    # The locks are always acquired in the same order so two threads locking
+    # the same caches can't deadlock.
+    if second is not None and <uintptr_t><void *>first > <uintptr_t><void *>second:
+        first, second = second, first
+
+    if first is not None:
+        first.lock.acquire()
+    if second is not None:
+        second.lock.acquire()
+
+    try:
+        if first is not None:
+            first.ensure_open()
+        if second is not None:
+            second.ensure_open()
+    except:
+        unlock_caches(first, second)
+        raise
+
+    return 0
+
+
+cdef void unlock_caches(CCache first, CCache second) noexcept:
+    if first is None or first is second:
+        first, second = second, None
+
+    if second is not None:
+        second.lock.release()
+    if first is not None:
+        first.lock.release()
+
+
 def cc_default(
     Context context not None,
 ) -> CCache:
+    context.ensure_open()
+
     ccache = CCache(context)
     cdef krb5_error_code err = 0
 
@@ -269,6 +675,8 @@ def cc_default(
 def cc_default_name(
     Context context not None,
 ) -> bytes:
+    context.ensure_open()
+
     return <bytes>krb5_cc_default_name(context.raw)
 
 
@@ -276,29 +684,46 @@ def cc_destroy(
     Context context not None,
     CCache cache not None,
 ) -> None:
+    context.ensure_open()
+    cache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_destroy(context.raw, cache.raw)
+    with cache.lock:
+        cache.ensure_open()
+        cache.end_cursors()
+        err = krb5_cc_destroy(context.raw, cache.raw)
+        if not err:
+            cache.raw = NULL  # Stops dealloc from calling close
     if err:
         raise Krb5Error(context, err)
-    cache.raw = NULL  # Stops dealloc from calling close
 
 
 def cc_get_name(
     Context context not None,
     CCache cache not None,
 ) -> bytes:
-    return krb5_cc_get_name(context.raw, cache.raw)
+    context.ensure_open()
+    cache.ensure_open()
+
+    with cache.lock:
+        cache.ensure_open()
+        return krb5_cc_get_name(context.raw, cache.raw)
 
 
 def cc_get_principal(
     Context context not None,
     CCache cache not None,
 ) -> Principal:
+    context.ensure_open()
+    cache.ensure_open()
+
     princ = Principal(context, PrincipalParseFlags.none)
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_get_principal(context.raw, cache.raw, &princ.raw)
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_get_principal(context.raw, cache.raw, &princ.raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -309,7 +734,12 @@ def cc_get_type(
     Context context not None,
     CCache cache not None,
 ) -> bytes:
-    return krb5_cc_get_type(context.raw, cache.raw)
+    context.ensure_open()
+    cache.ensure_open()
+
+    with cache.lock:
+        cache.ensure_open()
+        return krb5_cc_get_type(context.raw, cache.raw)
 
 
 def cc_initialize(
@@ -317,9 +747,14 @@ def cc_initialize(
     CCache cache not None,
     Principal principal not None,
 ) -> None:
+    context.ensure_open()
+    cache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_initialize(context.raw, cache.raw, principal.raw)
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_initialize(context.raw, cache.raw, principal.raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -329,6 +764,8 @@ def cc_new_unique(
     const unsigned char[:] cred_type not None,
     const unsigned char[:] hint = None,
 ) -> CCache:
+    context.ensure_open()
+
     ccache = CCache(context)
     cdef krb5_error_code err = 0
 
@@ -353,14 +790,21 @@ def cc_remove_cred(
     int flags,
     Creds creds not None,
 ) -> None:
+    context.ensure_open()
+    cache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_remove_cred(
-        context.raw,
-        cache.raw,
-        flags,
-        creds.get_pointer(),
-    )
+    cdef krb5_creds *creds_raw = creds.get_pointer()
+
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_remove_cred(
+            context.raw,
+            cache.raw,
+            flags,
+            creds_raw,
+        )
     if err:
         raise Krb5Error(context, err)
 
@@ -369,6 +813,8 @@ def cc_resolve(
     Context context not None,
     const unsigned char[:] name not None,
 ) -> CCache:
+    context.ensure_open()
+
     ccache = CCache(context)
     cdef krb5_error_code err = 0
 
@@ -391,16 +837,48 @@ def cc_retrieve_cred(
     int flags,
     Creds mcreds not None,
 ) -> Creds:
+    context.ensure_open()
+    cache.ensure_open()
+
+    return _retrieve_cred(context, cache, flags, mcreds, 0)
+
+
+def cc_try_retrieve_cred(
+    Context context not None,
+    CCache cache not None,
+    int flags,
+    Creds mcreds not None,
+) -> typing.Optional[Creds]:
+    context.ensure_open()
+    cache.ensure_open()
+
+    return _retrieve_cred(context, cache, flags, mcreds, 1)
+
+
+cdef object _retrieve_cred(
+    Context context,
+    CCache cache,
+    int flags,
+    Creds mcreds,
+    int missing_ok,
+):
     creds = Creds(context)
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_retrieve_cred(
-        context.raw,
-        cache.raw,
-        flags,
-        mcreds.get_pointer(),
-        creds.get_pointer())
+    cdef krb5_creds *mcreds_raw = mcreds.get_pointer()
+    cdef krb5_creds *creds_raw = creds.get_pointer()
+
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_retrieve_cred(
+            context.raw,
+            cache.raw,
+            flags,
+            mcreds_raw,
+            creds_raw)
     if err:
+        if missing_ok and (err == KRB5_CC_NOTFOUND or err == KRB5_CC_END):
+            return None
         raise Krb5Error(context, err)
 
     creds.free_contents = 1
@@ -412,6 +890,8 @@ def cc_set_default_name(
     Context context not None,
     const unsigned char[:] name,
 ) -> None:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
 
     cdef const char *name_ptr = NULL
@@ -428,9 +908,16 @@ def cc_store_cred(
     CCache cache not None,
     Creds creds not None,
 ) -> None:
+    context.ensure_open()
+    cache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_store_cred(context.raw, cache.raw, creds.get_pointer())
+    cdef krb5_creds *creds_raw = creds.get_pointer()
+
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_store_cred(context.raw, cache.raw, creds_raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -439,9 +926,14 @@ def cc_switch(
     Context context not None,
     CCache cache not None,
 ) -> None:
+    context.ensure_open()
+    cache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_switch(context.raw, cache.raw)
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_switch(context.raw, cache.raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -452,6 +944,31 @@ def cc_get_config(
     Principal principal,
     const unsigned char[:] key not None,
 ) -> bytes:
+    context.ensure_open()
+    cache.ensure_open()
+
+    return _get_config(context, cache, principal, key, 0)
+
+
+def cc_try_get_config(
+    Context context not None,
+    CCache cache not None,
+    Principal principal,
+    const unsigned char[:] key not None,
+) -> typing.Optional[bytes]:
+    context.ensure_open()
+    cache.ensure_open()
+
+    return _get_config(context, cache, principal, key, 1)
+
+
+cdef object _get_config(
+    Context context,
+    CCache cache,
+    Principal principal,
+    const unsigned char[:] key,
+    int missing_ok,
+):
     cdef krb5_error_code err = 0
 
     cdef krb5_principal principal_raw = NULL
@@ -465,8 +982,12 @@ def cc_get_config(
         key_ptr = ""
 
     cdef krb5_data data
-    err = krb5_cc_get_config(context.raw, cache.raw, principal_raw, key_ptr, &data)
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_get_config(context.raw, cache.raw, principal_raw, key_ptr, &data)
     if err:
+        if missing_ok and (err == KRB5_CC_NOTFOUND or err == KRB5_CC_END):
+            return None
         raise Krb5Error(context, err)
 
     cdef size_t length
@@ -490,6 +1011,9 @@ def cc_set_config(
     const unsigned char[:] key not None,
     const unsigned char[:] data,
 ) -> None:
+    context.ensure_open()
+    cache.ensure_open()
+
     cdef krb5_error_code err = 0
 
     cdef krb5_principal principal_raw = NULL
@@ -513,6 +1037,316 @@ def cc_set_config(
             pykrb5_set_krb5_data(&data_raw, len(data), <char *>&data[0])
         data_ptr = &data_raw
 
-    err = krb5_cc_set_config(context.raw, cache.raw, principal_raw, key_ptr, data_ptr)
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_set_config(context.raw, cache.raw, principal_raw, key_ptr, data_ptr)
+    if err:
+        raise Krb5Error(context, err)
+
+
+def cc_find_expiring(
+    Context context not None,
+    CCache cache not None,
+    int within_seconds,
+    now: typing.Optional[int] = None,
+) -> typing.List[Creds]:
+    context.ensure_open()
+    cache.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef krb5_timestamp now_raw
+    cdef krb5_timestamp before
+    cdef krb5_creds *matches = NULL
+    cdef size_t count = 0
+    cdef size_t idx = 0
+    cdef krb5_timestamp next_expiry
+    cdef int has_expiry
+
+    if now is None:
+        err = krb5_timeofday(context.raw, &now_raw)
+        if err:
+            raise Krb5Error(context, err)
+    else:
+        now_raw = now
+    before = now_raw + within_seconds
+
+    with cache.lock:
+        cache.ensure_open()
+        context.borrow()
+        with nogil:
+            err = pykrb5_cc_find_expiring(
+                context.raw,
+                cache.raw,
+                before,
+                &matches,
+                &count,
+                &next_expiry,
+                &has_expiry,
+            )
+        context.release()
+    if err:
+        raise Krb5Error(context, err)
+
+    result = []
+    try:
+        while idx < count:
+            creds = Creds(context)
+            memcpy(creds.get_pointer(), &matches[idx], sizeof(krb5_creds))
+            creds.free_contents = 1
+            idx += 1
+            result.append(creds)
+
+    finally:
+        # Only reached with entries left if a Creds object failed to be
+        # created.
+        while idx < count:
+            krb5_free_cred_contents(context.raw, &matches[idx])
+            idx += 1
+        free(matches)
+
+    return result
+
+
+def cc_next_expiry(
+    Context context not None,
+    CCache cache not None,
+) -> typing.Optional[int]:
+    context.ensure_open()
+    cache.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef size_t count = 0
+    cdef krb5_timestamp next_expiry
+    cdef int has_expiry
+
+    with cache.lock:
+        cache.ensure_open()
+        context.borrow()
+        with nogil:
+            err = pykrb5_cc_find_expiring(
+                context.raw,
+                cache.raw,
+                0,
+                NULL,
+                &count,
+                &next_expiry,
+                &has_expiry,
+            )
+        context.release()
+    if err:
+        raise Krb5Error(context, err)
+
+    if has_expiry:
+        return next_expiry
+    else:
+        return None
+
+
+def cc_compact(
+    Context context not None,
+    CCache cache not None,
+    drop_expired: bool = True,
+) -> CCacheCompactResult:
+    context.ensure_open()
+    cache.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef krb5_timestamp now = 0
+    cdef int drop_expired_raw = 1 if drop_expired else 0
+    cdef size_t kept = 0
+    cdef size_t dropped = 0
+    cdef CCache temp_cache
+
+    cache_type = cc_get_type(context, cache)
+    if cache_type != b"FILE":
+        raise ValueError(f"Cannot compact {cache_type.decode('utf-8')} credential cache, only FILE is supported")
+    path = cc_get_name(context, cache)
+
+    err = krb5_timeofday(context.raw, &now)
+    if err:
+        raise Krb5Error(context, err)
+
+    stat_before = os.stat(path)
+    bytes_before = stat_before.st_size
+
+    # The new cache is written to a file in the same directory so it can
+    # atomically replace the existing cache.
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or b".",
+        prefix=os.path.basename(path) + b".",
+    )
+    os.close(fd)
+    temp_cache = None
+    try:
+        temp_cache = cc_resolve(context, b"FILE:" + temp_path)
+        with cache.lock:
+            cache.ensure_open()
+            context.borrow()
+            with nogil:
+                err = pykrb5_cc_compact(
+                    context.raw,
+                    cache.raw,
+                    temp_cache.raw,
+                    drop_expired_raw,
+                    now,
+                    &kept,
+                    &dropped,
+                )
+            context.release()
+        if err:
+            raise Krb5Error(context, err)
+
+        temp_cache.close()
+
+        # The libraries only lock the file for each operation so a change
+        # made by another process while the entries were copied would be
+        # lost by the rename.
+        stat_after = os.stat(path)
+        if (stat_after.st_ino, stat_after.st_size, stat_after.st_mtime_ns) != (
+            stat_before.st_ino,
+            stat_before.st_size,
+            stat_before.st_mtime_ns,
+        ):
+            raise RuntimeError("The credential cache was modified while it was being compacted")
+
+        os.replace(temp_path, path)
+
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    finally:
+        if temp_cache is not None:
+            temp_cache.close()
+
+    bytes_after = os.stat(path).st_size
+
+    return CCacheCompactResult(kept, dropped, bytes_before - bytes_after)
+
+
+cdef enum _CopyOperation:
+    _COPY_ALL
+    _COPY_MATCHING
+    _MOVE
+
+
+cdef krb5_error_code _copy_creds(
+    Context context,
+    CCache src,
+    CCache dst,
+    _CopyOperation operation,
+    krb5_principal server,
+    const char *realm,
+    size_t realm_length,
+    size_t *copied,
+):
+    cdef krb5_error_code err = 0
+    cdef int src_freed = 0
+
+    lock_caches(src, dst)
+    try:
+        if operation == _MOVE:
+            # The move may free the src handle so any iteration over it is
+            # stopped first.
+            src.end_cursors()
+
+        context.borrow()
+        with nogil:
+            err = _run_copy(context.raw, src.raw, dst.raw, operation, server, realm, realm_length, copied, &src_freed)
+        context.release()
+
+        if src_freed:
+            src.raw = NULL  # The move destroyed and freed the src handle
+
+    finally:
+        unlock_caches(src, dst)
+
+    return err
+
+
+cdef krb5_error_code _run_copy(
+    krb5_context context,
+    krb5_ccache src,
+    krb5_ccache dst,
+    _CopyOperation operation,
+    krb5_principal server,
+    const char *realm,
+    size_t realm_length,
+    size_t *copied,
+    int *src_freed,
+) noexcept nogil:
+    if operation == _COPY_ALL:
+        return krb5_cc_copy_creds(context, src, dst)
+    elif operation == _MOVE:
+        return pykrb5_cc_move(context, src, dst, src_freed)
+    else:
+        return pykrb5_cc_copy_matching(context, src, dst, server, realm, realm_length, copied)
+
+
+def cc_copy_creds(
+    Context context not None,
+    CCache src not None,
+    CCache dst not None,
+) -> None:
+    context.ensure_open()
+    src.ensure_open()
+    dst.ensure_open()
+
+    cdef krb5_error_code err = 0
+
+    err = _copy_creds(context, src, dst, _COPY_ALL, NULL, NULL, 0, NULL)
+    if err:
+        raise Krb5Error(context, err)
+
+
+def cc_copy_creds_matching(
+    Context context not None,
+    CCache src not None,
+    CCache dst not None,
+    Principal server = None,
+    const unsigned char[:] realm = None,
+) -> int:
+    context.ensure_open()
+    src.ensure_open()
+    dst.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef size_t copied = 0
+
+    cdef krb5_principal server_raw = NULL
+    if server is not None:
+        server_raw = server.raw
+
+    cdef const char *realm_ptr = NULL
+    cdef size_t realm_length = 0
+    if realm is not None:
+        realm_length = len(realm)
+        if realm_length:
+            realm_ptr = <const char *>&realm[0]
+        else:
+            realm_ptr = ""
+
+    err = _copy_creds(context, src, dst, _COPY_MATCHING, server_raw, realm_ptr, realm_length, &copied)
+    if err:
+        raise Krb5Error(context, err)
+
+    return copied
+
+
+def cc_move(
+    Context context not None,
+    CCache src not None,
+    CCache dst not None,
+) -> None:
+    context.ensure_open()
+    src.ensure_open()
+    dst.ensure_open()
+
+    cdef krb5_error_code err = 0
+
+    err = _copy_creds(context, src, dst, _MOVE, NULL, NULL, 0, NULL)
     if err:
         raise Krb5Error(context, err)
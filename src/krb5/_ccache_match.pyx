@@ -23,6 +23,8 @@ def cc_cache_match(
     Context context not None,
     Principal principal not None,
 ) -> CCache:
+    context.ensure_open()
+
     ccache = CCache(context)
     cdef krb5_error_code err = 0
 
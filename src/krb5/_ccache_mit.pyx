@@ -20,10 +20,15 @@ def cc_dup(
     Context context not None,
     CCache cache not None,
 ) -> CCache:
+    context.ensure_open()
+    cache.ensure_open()
+
     dup = CCache(context)
     cdef krb5_error_code err = 0
 
-    err = krb5_cc_dup(context.raw, cache.raw, &dup.raw)
+    with cache.lock:
+        cache.ensure_open()
+        err = krb5_cc_dup(context.raw, cache.raw, &dup.raw)
     if err:
         raise Krb5Error(context, err)
 
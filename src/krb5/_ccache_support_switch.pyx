@@ -19,6 +19,8 @@ def cc_support_switch(
     Context context not None,
     const unsigned char[:] cache_type not None,
 ) -> bool:
+    context.ensure_open()
+
     cdef const char *type_ptr = NULL
     if len(cache_type):
         type_ptr = <const char*>&cache_type[0]
@@ -33,6 +33,8 @@ cdef extern from "python_krb5.h":
 def cccol_iter(
     Context context not None,
 ) -> typing.Iterator[CCache]:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef krb5_context ctx = context.raw
     cdef krb5_cccol_cursor cursor
@@ -0,0 +1,150 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+import typing
+
+import krb5
+
+
+class CCacheSweepResult(typing.NamedTuple):
+    """The result of :meth:`cccol_sweep`."""
+
+    scanned: int
+    """The number of caches in the collection."""
+
+    expired: typing.List[bytes]
+    """The names of the caches that matched, including those that were not
+    destroyed because of ``dry_run``."""
+
+    destroyed: typing.List[bytes]
+    """The names of the caches that were destroyed."""
+
+    errors: typing.List[typing.Tuple[bytes, Exception]]
+    """The name of the caches that could not be checked or destroyed and the
+    error that was raised."""
+
+
+def _cache_expired(
+    cache: krb5.CCache,
+    before: int,
+) -> bool:
+    latest: typing.Optional[int] = None
+    for creds in cache:
+        # Configuration entries have no meaningful end time.
+        if creds.server.realm == b"X-CACHECONF:":
+            continue
+
+        endtime = creds.times.endtime
+        if latest is None or endtime > latest:
+            latest = endtime
+
+    # A cache without any credentials, only config entries or nothing at all,
+    # is never expired.
+    return latest is not None and latest < before
+
+
+def cccol_sweep(
+    context_factory: typing.Callable[[], krb5.Context],
+    predicate: typing.Optional[typing.Callable[[krb5.Context, krb5.CCache], bool]] = None,
+    max_age: int = 0,
+    workers: int = 4,
+    dry_run: bool = False,
+    now: typing.Optional[int] = None,
+) -> CCacheSweepResult:
+    """Destroy the expired credential caches in a collection.
+
+    Lists the caches with :meth:`cccol_iter` and then checks and destroys
+    them in parallel on ``workers`` threads, which also limits how many caches
+    are read at the same time. Each thread uses its own context created by
+    ``context_factory``, the factory must return a new context every time it
+    is called as the contexts are closed once the sweep is done. The context
+    used to list the caches should resolve the same default credential cache
+    collection.
+
+    By default a cache is expired when every credential in it ended more
+    than ``max_age`` seconds before ``now``. Configuration entries are
+    ignored so a cache that only contains configuration entries, or no
+    entries at all, is never expired. Set ``predicate`` to decide which
+    caches are expired instead, it is called from the worker threads with the
+    context of the thread and the cache. An error reading or destroying one
+    cache is recorded in the result and does not stop the sweep.
+
+    Args:
+        context_factory: Creates a new Krb5 context.
+        predicate: Returns whether the cache should be destroyed.
+        max_age: The seconds since the credentials ended before a cache is
+            expired, not used with ``predicate``.
+        workers: The number of threads used to check the caches.
+        dry_run: Only report the expired caches without destroying them.
+        now: The current time as seconds since the epoch, defaults to the
+            current time.
+
+    Returns:
+        CCacheSweepResult: The caches that were expired and destroyed.
+    """
+    lock = threading.Lock()
+    contexts: typing.List[krb5.Context] = []
+    local = threading.local()
+
+    def get_context() -> krb5.Context:
+        context = getattr(local, "context", None)
+        if context is None:
+            context = local.context = context_factory()
+            with lock:
+                contexts.append(context)
+
+        return context
+
+    if now is None:
+        now = int(time.time())
+    before = now - max_age
+
+    def sweep(name: bytes) -> typing.Tuple[bytes, bool, bool, typing.Optional[Exception]]:
+        context = get_context()
+        try:
+            cache = krb5.cc_resolve(context, name)
+            if predicate is None:
+                expired = _cache_expired(cache, before)
+            else:
+                expired = predicate(context, cache)
+
+            if expired and not dry_run:
+                krb5.cc_destroy(context, cache)
+                return name, True, True, None
+
+            cache.close()
+            return name, expired, False, None
+
+        except (krb5.Krb5Error, OSError) as e:
+            return name, False, False, e
+
+    context = context_factory()
+    contexts.append(context)
+    try:
+        names = []
+        for cache in krb5.cccol_iter(context):
+            with cache:
+                names.append(krb5.cc_get_type(context, cache) + b":" + krb5.cc_get_name(context, cache))
+
+        expired_names = []
+        destroyed = []
+        errors = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for name, expired, was_destroyed, err in executor.map(sweep, names):
+                if expired:
+                    expired_names.append(name)
+                if was_destroyed:
+                    destroyed.append(name)
+                if err is not None:
+                    errors.append((name, err))
+
+    finally:
+        for context in contexts:
+            context.close()
+
+    return CCacheSweepResult(len(names), expired_names, destroyed, errors)
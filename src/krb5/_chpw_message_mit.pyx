@@ -24,6 +24,8 @@ def chpw_message(
     Context context not None,
     const unsigned char[:] server_string not None,
 ) -> bytes:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef krb5_data server_string_raw
     cdef char *message_out = NULL
@@ -1,8 +1,23 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+cimport cython
+
 from krb5._krb5_types cimport *
 
 
 cdef class Context:
     cdef krb5_context raw
+    # The handles created with the context that are closed before it.
+    cdef object dependents
+    # The number of native calls using raw without the GIL, close() waits for
+    # them to finish before freeing the context.
+    cdef Py_ssize_t borrows
+    cdef bint closing
+    cdef cython.pymutex lock
+    cdef object __weakref__
+
+    cdef int ensure_open(Context self) except -1
+    cdef int add_dependent(Context self, object handle) except -1
+    cdef int borrow(Context self) except -1
+    cdef void release(Context self) noexcept
@@ -9,6 +9,22 @@ class Context:
     This class represents a library context object.
     """
 
+    def __enter__(self) -> Context: ...
+    def __exit__(self, *args: typing.Any) -> None: ...
+    def close(self) -> None:
+        """Free the library context.
+
+        Frees the context immediately rather than when it is garbage
+        collected. The :class:`CCache`, :class:`KeyTab`,
+        :class:`GetInitCredsOpt`, :class:`InitCredsContext` and
+        :class:`TktCredsContext` objects created with this context that are
+        still open are closed first. Passing a
+        closed context, or one of those objects, to any function raises a
+        ``ValueError``. A call that is running with this context on another
+        thread is finished before the context is freed. Calling ``close()``
+        more than once does nothing.
+        """
+
 def init_context() -> Context:
     """Create a krb5 library context.
 
@@ -1,10 +1,13 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import time
 import typing
+import weakref
 
 from krb5._exceptions import Krb5Error
 
+from krb5._debug cimport track
 from krb5._krb5_types cimport *
 
 
@@ -68,15 +71,78 @@ cdef class Context:
 
     def __cinit__(Context self):
         self.raw = NULL
+        self.dependents = None
+        self.borrows = 0
+        self.closing = 0
+        track(self)
 
     def __dealloc__(Context self):
         if self.raw:
             krb5_free_context(self.raw)
             self.raw = NULL
 
+    def __enter__(Context self) -> Context:
+        return self
+
+    def __exit__(Context self, *args: typing.Any) -> None:
+        self.close()
+
     def __str__(Context self):
         return "Krb5Context"
 
+    def close(Context self) -> None:
+        cdef krb5_context raw = NULL
+
+        with self.lock:
+            if not self.raw or self.closing:
+                return
+            self.closing = 1
+            dependents = list(self.dependents) if self.dependents else []
+            self.dependents = None
+
+        # The handles need the context to release their native resources so
+        # they are closed first.
+        for handle in dependents:
+            handle.close()
+
+        # Calls on other threads that borrowed the context without the GIL
+        # are still using it.
+        while True:
+            with self.lock:
+                if self.borrows == 0:
+                    raw = self.raw
+                    self.raw = NULL
+                    break
+            time.sleep(0.001)
+
+        krb5_free_context(raw)
+
+    cdef int ensure_open(Context self) except -1:
+        if self.raw == NULL:
+            raise ValueError("Context is closed")
+
+        return 0
+
+    cdef int borrow(Context self) except -1:
+        with self.lock:
+            if self.raw == NULL or self.closing:
+                raise ValueError("Context is closed")
+            self.borrows += 1
+
+        return 0
+
+    cdef void release(Context self) noexcept:
+        with self.lock:
+            self.borrows -= 1
+
+    cdef int add_dependent(Context self, object handle) except -1:
+        with self.lock:
+            if self.dependents is None:
+                self.dependents = weakref.WeakSet()
+            self.dependents.add(handle)
+
+        return 0
+
 
 def init_context() -> Context:
     cdef krb5_error_code = 0
@@ -92,6 +158,8 @@ def init_context() -> Context:
 def get_default_realm(
     Context context not None,
 ) -> bytes:
+    context.ensure_open()
+
     cdef krb5_error_code = 0
     cdef char *realm = NULL
 
@@ -109,6 +177,8 @@ def set_default_realm(
     Context context not None,
     const unsigned char[:] realm,
 ) -> None:
+    context.ensure_open()
+
     cdef krb5_error_code = 0
     cdef const char *realm_ptr = NULL
     if realm is not None and len(realm):
@@ -122,6 +192,8 @@ def set_default_realm(
 def timeofday(
     Context context not None,
 ) -> int:
+    context.ensure_open()
+
     cdef krb5_error_code = 0
 
     cdef krb5_timestamp seconds
@@ -135,6 +207,8 @@ def timeofday(
 def us_timeofday(
     Context context not None,
 ) -> typing.Tuple[int, int]:
+    context.ensure_open()
+
     cdef krb5_error_code = 0
 
     cdef krb5_timestamp seconds
@@ -151,6 +225,8 @@ def set_real_time(
     int seconds,
     int microseconds,
 ) -> None:
+    context.ensure_open()
+
     cdef krb5_error_code = 0
 
     err = krb5_set_real_time(context.raw, seconds, microseconds)
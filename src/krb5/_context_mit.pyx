@@ -30,6 +30,8 @@ def init_secure_context() -> Context:
 def get_time_offsets(
     Context context not None,
 ) -> typing.Tuple[int, int]:
+    context.ensure_open()
+
     cdef krb5_error_code = 0
 
     cdef krb5_timestamp seconds
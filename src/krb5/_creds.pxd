@@ -1,6 +1,7 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+from krb5._ccache cimport CCache
 from krb5._context cimport Context
 from krb5._krb5_types cimport *
 
@@ -10,6 +11,10 @@ cdef class Creds:
     cdef int free_contents
     cdef krb5_creds* _raw
     cdef int _free_raw
+    # Storage used by _raw when the creds are not allocated by the krb5 lib,
+    # avoids a separate allocation for every Creds object.
+    cdef krb5_creds _inline_raw
+    cdef object __weakref__
 
     cdef void* set_raw_from_lib(Creds self, krb5_creds* raw)
     cdef krb5_creds *get_pointer(Creds self)
@@ -18,6 +23,12 @@ cdef class Creds:
 cdef class InitCredsContext:
     cdef Context ctx
     cdef krb5_init_creds_context raw
+    # The caches of the options the context was created with.
+    cdef CCache in_ccache
+    cdef CCache out_ccache
+    cdef object __weakref__
+
+    cdef int ensure_open(InitCredsContext self) except -1
 
 
 cdef class Krb5Prompt:
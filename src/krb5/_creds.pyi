@@ -102,6 +102,15 @@ class InitCredsContext:
         context: Krb5 context.
     """
 
+    def __enter__(self) -> InitCredsContext: ...
+    def __exit__(self, *args: typing.Any) -> None: ...
+    def close(self) -> None:
+        """Free the initial credentials context.
+
+        Passing the freed context to any function raises a ``ValueError``.
+        Calling ``close()`` more than once does nothing.
+        """
+
 class Krb5Prompt:
     """Base class used to prompt the user for input.
 
@@ -304,3 +313,33 @@ def get_renewed_creds(
         ccache: The cache to get the existing credentials from.
         in_tkt_service: Server principal string or None.
     """
+
+def verify_init_creds(
+    context: Context,
+    creds: Creds,
+    server: typing.Optional[Principal] = None,
+    keytab: typing.Optional[KeyTab] = None,
+    ap_req_nofail: typing.Optional[bool] = None,
+) -> None:
+    """Verify initial credentials with a keytab.
+
+    Verifies the credentials returned by :meth:`get_init_creds_password` were
+    issued by the real KDC. A service ticket for ``server`` is requested with
+    the credentials and decrypted with the key from the keytab, a KDC that is
+    being spoofed cannot issue a ticket encrypted with that key.
+
+    If ``ap_req_nofail`` is not set the library configuration
+    ``verify_ap_req_nofail`` decides whether the verification fails when the
+    keytab has no key for the server. Set it to ``True`` when the result is
+    used to authenticate the user.
+
+    Args:
+        context: Krb5 context.
+        creds: The initial credentials to verify.
+        server: The service principal to verify with, defaults to the host
+            principal of the local host.
+        keytab: The keytab with the key of server, defaults to the default
+            keytab.
+        ap_req_nofail: Whether to fail if there is no key for server in the
+            keytab.
+    """
@@ -9,15 +9,16 @@ from krb5._exceptions import Krb5Error
 from krb5._keyblock import copy_keyblock
 from krb5._principal import copy_principal
 
-from libc.stdlib cimport calloc, free
+from libc.string cimport memset
 
-from krb5._ccache cimport CCache
+from krb5._ccache cimport CCache, lock_caches, unlock_caches
 from krb5._context cimport Context
 from krb5._creds_opt cimport GetInitCredsOpt
-from krb5._keyblock cimport KeyBlock
+from krb5._debug cimport track
+from krb5._keyblock cimport KeyBlock, keyblock_contents_size
 from krb5._krb5_types cimport *
 from krb5._kt cimport KeyTab
-from krb5._principal cimport Principal
+from krb5._principal cimport Principal, principal_native_size
 
 
 cdef extern from "python_krb5.h":
@@ -157,6 +158,28 @@ cdef extern from "python_krb5.h":
         const char *in_tkt_service,
     ) nogil
 
+    cdef struct _krb5_verify_init_creds_opt:
+        pass
+    ctypedef _krb5_verify_init_creds_opt krb5_verify_init_creds_opt
+
+    void krb5_verify_init_creds_opt_init(
+        krb5_verify_init_creds_opt *options,
+    ) nogil
+
+    void krb5_verify_init_creds_opt_set_ap_req_nofail(
+        krb5_verify_init_creds_opt *options,
+        int ap_req_nofail,
+    ) nogil
+
+    krb5_error_code krb5_verify_init_creds(
+        krb5_context context,
+        krb5_creds *creds,
+        krb5_principal server,
+        krb5_keytab keytab,
+        krb5_ccache *ccache,
+        krb5_verify_init_creds_opt *options,
+    ) nogil
+
 
 class TicketFlags(enum.IntFlag):
     # https://github.com/krb5/krb5-assignments/blob/master/ticket-flags
@@ -188,12 +211,15 @@ cdef class Creds:
     # cdef int free_contents
     # cdef krb5_creds* _raw
     # cdef int _free_raw
+    # cdef krb5_creds _inline_raw
 
     def __cinit__(Creds self, Context context):
         self.ctx = context
         self.free_contents = 0
         self._raw = NULL
         self._free_raw = 0
+        memset(&self._inline_raw, 0, sizeof(krb5_creds))
+        track(self)
 
     def __dealloc__(Creds self):
         if not self._raw:
@@ -203,7 +229,6 @@ cdef class Creds:
             if self.free_contents:
                 krb5_free_cred_contents(self.ctx.raw, self._raw)
                 self.free_contents = 0
-            free(self._raw)
 
         else:
             krb5_free_creds(self.ctx.raw, self._raw)
@@ -211,6 +236,32 @@ cdef class Creds:
         self._raw = NULL
         self._free_raw = 0
 
+    def __sizeof__(Creds self) -> int:
+        cdef size_t size = 0
+        cdef krb5_principal client = NULL
+        cdef krb5_principal server = NULL
+        cdef krb5_keyblock *keyblock = NULL
+        cdef krb5_data ticket
+        cdef krb5_data second_ticket
+        cdef size_t length
+
+        # The inline krb5_creds is part of the object size, only the contents
+        # and a krb5_creds allocated by the krb5 lib are added.
+        if self._raw != NULL and (self.free_contents or not self._free_raw):
+            if not self._free_raw:
+                size += sizeof(krb5_creds)
+
+            pykrb5_creds_get(self._raw, &client, &server, &keyblock, NULL, NULL, NULL, &ticket, &second_ticket)
+            size += principal_native_size(client) + principal_native_size(server)
+            size += keyblock_contents_size(keyblock)
+
+            pykrb5_get_krb5_data(&ticket, &length, NULL)
+            size += length
+            pykrb5_get_krb5_data(&second_ticket, &length, NULL)
+            size += length
+
+        return object.__sizeof__(self) + size
+
     def __str__(Creds self) -> str:
         return "Creds"
 
@@ -229,9 +280,7 @@ cdef class Creds:
         # If this is being called without _raw being set we want to manage
         # the krb5_creds object in this class.
         if not self._raw:
-            self._raw = <krb5_creds*>calloc(sizeof(krb5_creds), 1)
-            if not self._raw:
-                raise MemoryError("Cannot calloc krb5_creds")
+            self._raw = &self._inline_raw
             self._free_raw = 1
 
         return self._raw
@@ -321,19 +370,44 @@ cdef class Creds:
 cdef class InitCredsContext:
     # cdef Context ctx
     # cdef krb5_init_creds_context raw
+    # cdef CCache in_ccache
+    # cdef CCache out_ccache
 
     def __cinit__(InitCredsContext self, Context context):
         self.ctx = context
         self.raw = NULL
+        self.in_ccache = None
+        self.out_ccache = None
+        context.add_dependent(self)
 
     def __dealloc__(InitCredsContext self):
-        if self.raw:
+        # Closing the krb5 context frees this context first, raw is only
+        # still set while the krb5 context is open.
+        if self.raw and self.ctx.raw:
             krb5_init_creds_free(self.ctx.raw, self.raw)
             self.raw = NULL
 
+    def __enter__(InitCredsContext self) -> InitCredsContext:
+        return self
+
+    def __exit__(InitCredsContext self, *args: typing.Any) -> None:
+        self.close()
+
     def __str__(InitCredsContext self) -> str:
         return "InitCredsContext"
 
+    def close(InitCredsContext self) -> None:
+        if self.raw:
+            self.ctx.ensure_open()
+            krb5_init_creds_free(self.ctx.raw, self.raw)
+            self.raw = NULL
+
+    cdef int ensure_open(InitCredsContext self) except -1:
+        if self.raw == NULL:
+            raise ValueError("InitCredsContext is closed")
+
+        return 0
+
 
 cdef class Krb5Prompt:
     def init(
@@ -395,6 +469,10 @@ def get_init_creds_keytab(
     int start_time = 0,
     const unsigned char[:] in_tkt_service = None,
 ) -> Creds:
+    context.ensure_open()
+    k5_gic_options.ensure_open()
+    keytab.ensure_open()
+
     creds = Creds(context)
     cdef krb5_error_code err = 0
     cdef krb5_creds* raw_creds = creds.get_pointer()
@@ -403,16 +481,24 @@ def get_init_creds_keytab(
     if in_tkt_service is not None and len(in_tkt_service):
         in_tkt_service_ptr = <const char*>&in_tkt_service[0]
 
-    with nogil:
-        err = krb5_get_init_creds_keytab(
-            context.raw,
-            raw_creds,
-            client.raw,
-            keytab.raw,
-            start_time,
-            in_tkt_service_ptr,
-            k5_gic_options.raw,
-        )
+    lock_caches(k5_gic_options.in_ccache, k5_gic_options.out_ccache)
+    try:
+        with keytab.lock:
+            keytab.ensure_open()
+            context.borrow()
+            with nogil:
+                err = krb5_get_init_creds_keytab(
+                    context.raw,
+                    raw_creds,
+                    client.raw,
+                    keytab.raw,
+                    start_time,
+                    in_tkt_service_ptr,
+                    k5_gic_options.raw,
+                )
+            context.release()
+    finally:
+        unlock_caches(k5_gic_options.in_ccache, k5_gic_options.out_ccache)
 
     if err:
         raise Krb5Error(context, err)
@@ -431,6 +517,9 @@ def get_init_creds_password(
     const unsigned char[:] in_tkt_service = None,
     prompter: typing.Optional[Krb5Prompt] = None,
 ) -> Creds:
+    context.ensure_open()
+    k5_gic_options.ensure_open()
+
     creds = Creds(context)
     cdef krb5_error_code err = 0
     cdef krb5_creds* raw_creds = creds.get_pointer()
@@ -449,18 +538,24 @@ def get_init_creds_password(
     if in_tkt_service is not None and len(in_tkt_service):
         in_tkt_service_ptr = <const char*>&in_tkt_service[0]
 
-    with nogil:
-        err = krb5_get_init_creds_password(
-            context.raw,
-            raw_creds,
-            client.raw,
-            password_ptr,
-            callback,
-            prompt_data,
-            start_time,
-            in_tkt_service_ptr,
-            k5_gic_options.raw,
-        )
+    lock_caches(k5_gic_options.in_ccache, k5_gic_options.out_ccache)
+    try:
+        context.borrow()
+        with nogil:
+            err = krb5_get_init_creds_password(
+                context.raw,
+                raw_creds,
+                client.raw,
+                password_ptr,
+                callback,
+                prompt_data,
+                start_time,
+                in_tkt_service_ptr,
+                k5_gic_options.raw,
+            )
+        context.release()
+    finally:
+        unlock_caches(k5_gic_options.in_ccache, k5_gic_options.out_ccache)
 
     if err:
         raise Krb5Error(context, err)
@@ -474,10 +569,19 @@ def init_creds_get(
     Context context not None,
     InitCredsContext ctx not None,
 ) -> None:
+    context.ensure_open()
+    ctx.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    with nogil:
-        err = krb5_init_creds_get(context.raw, ctx.raw)
+    lock_caches(ctx.in_ccache, ctx.out_ccache)
+    try:
+        context.borrow()
+        with nogil:
+            err = krb5_init_creds_get(context.raw, ctx.raw)
+        context.release()
+    finally:
+        unlock_caches(ctx.in_ccache, ctx.out_ccache)
 
     if err:
         raise Krb5Error(context, err)
@@ -487,6 +591,9 @@ def init_creds_get_creds(
     Context context not None,
     InitCredsContext ctx not None,
 ) -> Creds:
+    context.ensure_open()
+    ctx.ensure_open()
+
     creds = Creds(context)
     cdef krb5_error_code err = 0
 
@@ -505,6 +612,10 @@ def init_creds_init(
     int start_time = 0,
     prompter: typing.Optional[Krb5Prompt] = None,
 ) -> InitCredsContext:
+    context.ensure_open()
+    if k5_gic_options is not None:
+        k5_gic_options.ensure_open()
+
     creds_ctx = InitCredsContext(context)
     cdef krb5_error_code err = 0
 
@@ -518,16 +629,26 @@ def init_creds_init(
         callback = prompt_callback
         prompt_data = <void*>prompter
 
-    with nogil:
-        err = krb5_init_creds_init(
-            context.raw,
-            client.raw,
-            callback,
-            prompt_data,
-            start_time,
-            options,
-            &creds_ctx.raw
-        )
+    if k5_gic_options is not None:
+        creds_ctx.in_ccache = k5_gic_options.in_ccache
+        creds_ctx.out_ccache = k5_gic_options.out_ccache
+
+    lock_caches(creds_ctx.in_ccache, creds_ctx.out_ccache)
+    try:
+        context.borrow()
+        with nogil:
+            err = krb5_init_creds_init(
+                context.raw,
+                client.raw,
+                callback,
+                prompt_data,
+                start_time,
+                options,
+                &creds_ctx.raw
+            )
+        context.release()
+    finally:
+        unlock_caches(creds_ctx.in_ccache, creds_ctx.out_ccache)
 
     if err:
         raise Krb5Error(context, err)
@@ -540,6 +661,10 @@ def init_creds_set_keytab(
     InitCredsContext ctx not None,
     KeyTab keytab not None,
 ) -> None:
+    context.ensure_open()
+    ctx.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = 0
 
     err = krb5_init_creds_set_keytab(context.raw, ctx.raw, keytab.raw)
@@ -552,6 +677,9 @@ def init_creds_set_password(
     InitCredsContext ctx not None,
     const unsigned char[:] password,
 ) -> None:
+    context.ensure_open()
+    ctx.ensure_open()
+
     cdef krb5_error_code err = 0
 
     cdef const char *password_ptr = NULL
@@ -570,6 +698,9 @@ def get_renewed_creds(
     CCache ccache not None,
     const unsigned char[:] in_tkt_service = None,
 ) -> Creds:
+    context.ensure_open()
+    ccache.ensure_open()
+
     creds = Creds(context)
     cdef krb5_error_code err = 0
 
@@ -591,6 +722,49 @@ def get_renewed_creds(
 
     return creds
 
+
+def verify_init_creds(
+    Context context not None,
+    Creds creds not None,
+    Principal server = None,
+    KeyTab keytab = None,
+    ap_req_nofail: typing.Optional[bool] = None,
+) -> None:
+    context.ensure_open()
+    if keytab is not None:
+        keytab.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef krb5_creds *creds_raw = creds.get_pointer()
+    cdef krb5_principal server_raw = NULL
+    cdef krb5_keytab keytab_raw = NULL
+    cdef krb5_verify_init_creds_opt options
+
+    if server is not None:
+        server_raw = server.raw
+
+    krb5_verify_init_creds_opt_init(&options)
+    if ap_req_nofail is not None:
+        krb5_verify_init_creds_opt_set_ap_req_nofail(&options, 1 if ap_req_nofail else 0)
+
+    if keytab is None:
+        context.borrow()
+        with nogil:
+            err = krb5_verify_init_creds(context.raw, creds_raw, server_raw, NULL, NULL, &options)
+        context.release()
+
+    else:
+        with keytab.lock:
+            keytab.ensure_open()
+            keytab_raw = keytab.raw
+            context.borrow()
+            with nogil:
+                err = krb5_verify_init_creds(context.raw, creds_raw, server_raw, keytab_raw, NULL, &options)
+            context.release()
+
+    if err:
+        raise Krb5Error(context, err)
+
 TicketTimes = collections.namedtuple('TicketTimes', [
     'authtime',
     'starttime',
@@ -39,6 +39,8 @@ def marshal_credentials(
     Context context not None,
     Creds creds not None,
 ) -> bytes:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef krb5_data *data = NULL
     cdef size_t length
@@ -67,6 +69,8 @@ def unmarshal_credentials(
     Context context not None,
     const unsigned char[:] data not None,
 ) -> Creds:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef krb5_creds* raw_creds = NULL
     cdef krb5_data data_raw
@@ -44,6 +44,9 @@ def get_validated_creds(
     CCache ccache not None,
     const unsigned char[:] in_tkt_service = None,
 ) -> Creds:
+    context.ensure_open()
+    ccache.ensure_open()
+
     creds = Creds(context)
     cdef krb5_error_code err = 0
 
@@ -69,6 +72,10 @@ def get_etype_info(
     Principal principal not None,
     GetInitCredsOpt opt = None,
 ) -> EtypeInfo:
+    context.ensure_open()
+    if opt is not None:
+        opt.ensure_open()
+
     cdef krb5_error_code err = 0
 
     cdef krb5_get_init_creds_opt *options = NULL
@@ -79,6 +86,7 @@ def get_etype_info(
     cdef krb5_data salt
     cdef krb5_data s2kparams
 
+    context.borrow()
     with nogil:
         err = krb5_get_etype_info(
             context.raw,
@@ -88,6 +96,7 @@ def get_etype_info(
             &salt,
             &s2kparams,
         )
+    context.release()
     if err:
         raise Krb5Error(context, err)
 
@@ -1,6 +1,7 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+from krb5._ccache cimport CCache
 from krb5._context cimport Context
 from krb5._krb5_types cimport *
 
@@ -8,3 +9,13 @@ from krb5._krb5_types cimport *
 cdef class GetInitCredsOpt:
     cdef Context ctx
     cdef krb5_get_init_creds_opt *raw
+    cdef krb5_enctype *etypes
+    cdef krb5_data *salt
+    cdef object salt_bytes
+    # The libraries store the cache handles rather than a copy so the caches
+    # are kept and locked while the options are used.
+    cdef CCache in_ccache
+    cdef CCache out_ccache
+    cdef object __weakref__
+
+    cdef int ensure_open(GetInitCredsOpt self) except -1
@@ -14,6 +14,15 @@ class GetInitCredsOpt:
         context: Krb5 context.
     """
 
+    def __enter__(self) -> GetInitCredsOpt: ...
+    def __exit__(self, *args: typing.Any) -> None: ...
+    def close(self) -> None:
+        """Free the options.
+
+        Passing the freed options to any function raises a ``ValueError``.
+        Calling ``close()`` more than once does nothing.
+        """
+
 def get_init_creds_opt_alloc(
     context: Context,
 ) -> GetInitCredsOpt:
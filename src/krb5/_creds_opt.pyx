@@ -82,23 +82,72 @@ cdef extern from "python_krb5.h":
 cdef class GetInitCredsOpt:
     # cdef Context ctx
     # cdef krb5_get_init_creds_opt *raw
+    # cdef krb5_enctype *etypes
+    # cdef krb5_data *salt
+    # cdef object salt_bytes
+    # cdef CCache in_ccache
+    # cdef CCache out_ccache
 
     def __cinit__(GetInitCredsOpt self, Context context):
         self.ctx = context
         self.raw = NULL
+        self.etypes = NULL
+        self.salt = NULL
+        self.salt_bytes = None
+        self.in_ccache = None
+        self.out_ccache = None
+        context.add_dependent(self)
 
     def __dealloc__(GetInitCredsOpt self):
-        if self.raw:
+        # Closing the context frees the options first, raw is only still set
+        # while the context is open.
+        if self.raw and self.ctx.raw:
             krb5_get_init_creds_opt_free(self.ctx.raw, self.raw)
             self.raw = NULL
 
+        # The libraries reference the etype list and salt set on the options
+        # rather than copying them so they are kept until the options are
+        # freed.
+        free(self.etypes)
+        self.etypes = NULL
+        free(self.salt)
+        self.salt = NULL
+
+    def __enter__(GetInitCredsOpt self) -> GetInitCredsOpt:
+        return self
+
+    def __exit__(GetInitCredsOpt self, *args: typing.Any) -> None:
+        self.close()
+
     def __str__(GetInitCredsOpt self):
         return "GetInitCredsOpt"
 
+    def close(GetInitCredsOpt self) -> None:
+        if self.raw:
+            self.ctx.ensure_open()
+            krb5_get_init_creds_opt_free(self.ctx.raw, self.raw)
+            self.raw = NULL
+
+        free(self.etypes)
+        self.etypes = NULL
+        free(self.salt)
+        self.salt = NULL
+        self.salt_bytes = None
+        self.in_ccache = None
+        self.out_ccache = None
+
+    cdef int ensure_open(GetInitCredsOpt self) except -1:
+        if self.raw == NULL:
+            raise ValueError("GetInitCredsOpt is closed")
+
+        return 0
+
 
 def get_init_creds_opt_alloc(
     Context context not None,
 ) -> GetInitCredsOpt:
+    context.ensure_open()
+
     opt = GetInitCredsOpt(context)
     cdef krb5_error_code err = 0
 
@@ -113,6 +162,8 @@ def get_init_creds_opt_set_anonymous(
     GetInitCredsOpt opt not None,
     anonymous: bool,
 ) -> None:
+    opt.ensure_open()
+
     cdef int value = 1 if anonymous else 0
 
     krb5_get_init_creds_opt_set_anonymous(opt.raw, value)
@@ -122,6 +173,8 @@ def get_init_creds_opt_set_canonicalize(
     GetInitCredsOpt opt not None,
     canonicalize: bool,
 ) -> None:
+    opt.ensure_open()
+
     cdef int value = 1 if canonicalize else 0
 
     krb5_get_init_creds_opt_set_canonicalize_generic(opt.ctx.raw, opt.raw, value)
@@ -131,21 +184,27 @@ def get_init_creds_opt_set_etype_list(
     GetInitCredsOpt opt not None,
     etypes: typing.Iterable[int],
 ) -> None:
+    opt.ensure_open()
+
     tmp = list(etypes)
-    cdef krb5_enctype *buffer = <krb5_enctype *>malloc(len(etypes) * sizeof(krb5_enctype))
+    cdef krb5_enctype *buffer = <krb5_enctype *>malloc(max(len(tmp), 1) * sizeof(krb5_enctype))
     if not buffer:
         raise MemoryError()
 
     for idx, e in enumerate(tmp):
         buffer[idx] = tmp[idx]
 
-    krb5_get_init_creds_opt_set_etype_list(opt.raw, buffer, len(etypes))
+    krb5_get_init_creds_opt_set_etype_list(opt.raw, buffer, len(tmp))
+    free(opt.etypes)
+    opt.etypes = buffer
 
 
 def get_init_creds_opt_set_forwardable(
     GetInitCredsOpt opt not None,
     forwardable: bool,
 ) -> None:
+    opt.ensure_open()
+
     cdef int value = 1 if forwardable else 0
 
     krb5_get_init_creds_opt_set_forwardable(opt.raw, value)
@@ -155,6 +214,8 @@ def get_init_creds_opt_set_proxiable(
     GetInitCredsOpt opt not None,
     proxiable: bool,
 ) -> None:
+    opt.ensure_open()
+
     cdef int value = 1 if proxiable else 0
 
     krb5_get_init_creds_opt_set_proxiable(opt.raw, value)
@@ -164,6 +225,8 @@ def get_init_creds_opt_set_renew_life(
     GetInitCredsOpt opt not None,
     krb5_deltat renew_life,
 ) -> None:
+    opt.ensure_open()
+
     krb5_get_init_creds_opt_set_renew_life(opt.raw, renew_life)
 
 
@@ -171,16 +234,28 @@ def get_init_creds_opt_set_salt(
     GetInitCredsOpt opt not None,
     const unsigned char[:] salt not None,
 ) -> None:
+    opt.ensure_open()
+
     if not len(salt):
         raise ValueError("salt cannot be an empty byte string")
 
-    cdef krb5_data buffer
-    pykrb5_set_krb5_data(&buffer, len(salt), <char *>&salt[0])
-    krb5_get_init_creds_opt_set_salt(opt.raw, &buffer)
+    # The krb5_data and the bytes it points to are kept with the options.
+    salt_bytes = bytes(salt)
+    cdef krb5_data *buffer = <krb5_data *>malloc(sizeof(krb5_data))
+    if not buffer:
+        raise MemoryError()
+
+    pykrb5_set_krb5_data(buffer, len(salt_bytes), <char *>salt_bytes)
+    krb5_get_init_creds_opt_set_salt(opt.raw, buffer)
+    free(opt.salt)
+    opt.salt = buffer
+    opt.salt_bytes = salt_bytes
 
 
 def get_init_creds_opt_set_tkt_life(
     GetInitCredsOpt opt not None,
     krb5_deltat tkt_life,
 ) -> None:
+    opt.ensure_open()
+
     krb5_get_init_creds_opt_set_tkt_life(opt.raw, tkt_life)
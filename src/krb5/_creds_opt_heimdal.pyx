@@ -23,6 +23,9 @@ def get_init_creds_opt_set_default_flags(
     const unsigned char[:] appname = None,
     const unsigned char[:] realm = None,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+
     cdef const char *appname_ptr = NULL
     if appname is not None and len(appname):
         appname_ptr = <const char*>&appname[0]
@@ -74,6 +74,8 @@ def get_init_creds_opt_set_out_ccache(
     """Set output credential cache in options.
 
     Sets the output credential cache in the credential option structure.
+    The options keep a reference to the cache and hold its lock while they
+    are used to get credentials.
 
     Args:
         context: Krb5 context.
@@ -56,9 +56,17 @@ def get_init_creds_opt_set_fast_ccache(
     GetInitCredsOpt opt not None,
     CCache ccache not None,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+    ccache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_get_init_creds_opt_set_fast_ccache(context.raw, opt.raw, ccache.raw)
+    # Only the name of the cache is stored on the options, the FAST armor
+    # cache is resolved again from the name when the options are used.
+    with ccache.lock:
+        ccache.ensure_open()
+        err = krb5_get_init_creds_opt_set_fast_ccache(context.raw, opt.raw, ccache.raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -68,6 +76,9 @@ def get_init_creds_opt_set_fast_flags(
     GetInitCredsOpt opt not None,
     krb5_int32 flags,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+
     cdef krb5_error_code err = 0
 
     err = krb5_get_init_creds_opt_set_fast_flags(context.raw, opt.raw, flags)
@@ -80,6 +91,9 @@ def get_init_creds_opt_set_fast_ccache_name(
     GetInitCredsOpt opt not None,
     const unsigned char[:] name not None,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+
     cdef krb5_error_code err = 0
 
     cdef const char *name_ptr = NULL
@@ -98,12 +112,20 @@ def get_init_creds_opt_set_out_ccache(
     GetInitCredsOpt opt not None,
     CCache ccache not None,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+    ccache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_get_init_creds_opt_set_out_ccache(context.raw, opt.raw, ccache.raw)
+    with ccache.lock:
+        ccache.ensure_open()
+        err = krb5_get_init_creds_opt_set_out_ccache(context.raw, opt.raw, ccache.raw)
     if err:
         raise Krb5Error(context, err)
 
+    opt.out_ccache = ccache
+
 
 def get_init_creds_opt_set_pa(
     Context context not None,
@@ -111,6 +133,9 @@ def get_init_creds_opt_set_pa(
     const unsigned char[:] attr not None,
     const unsigned char[:] value not None,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+
     cdef krb5_error_code err = 0
 
     cdef char *attr_ptr
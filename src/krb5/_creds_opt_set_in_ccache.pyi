@@ -19,6 +19,9 @@ def get_init_creds_opt_set_in_ccache(
     sensitive choices) as the previous authentication attempt, which stored
     information in the passed-in cache.
 
+    The options keep a reference to the cache and hold its lock while they
+    are used to get credentials.
+
     Args:
         context: Krb5 context.
         opt: The initial credential options.
@@ -22,8 +22,16 @@ def get_init_creds_opt_set_in_ccache(
     GetInitCredsOpt opt not None,
     CCache ccache not None,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+    ccache.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_get_init_creds_opt_set_in_ccache(context.raw, opt.raw, ccache.raw)
+    with ccache.lock:
+        ccache.ensure_open()
+        err = krb5_get_init_creds_opt_set_in_ccache(context.raw, opt.raw, ccache.raw)
     if err:
         raise Krb5Error(context, err)
+
+    opt.in_ccache = ccache
@@ -23,6 +23,9 @@ def get_init_creds_opt_set_pac_request(
     GetInitCredsOpt opt not None,
     req_pac: bool,
 ) -> None:
+    context.ensure_open()
+    opt.ensure_open()
+
     cdef int value = 1 if req_pac else 0
 
     krb5_get_init_creds_opt_set_pac_request(context.raw, opt.raw, value)
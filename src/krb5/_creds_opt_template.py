@@ -0,0 +1,272 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+from __future__ import annotations
+
+import threading
+import types
+import typing
+
+import krb5
+
+_OptStep = typing.Callable[["krb5.Context", "krb5.GetInitCredsOpt"], None]
+
+_BOOL_SETTINGS = {
+    "anonymous": "get_init_creds_opt_set_anonymous",
+    "canonicalize": "get_init_creds_opt_set_canonicalize",
+    "forwardable": "get_init_creds_opt_set_forwardable",
+    "proxiable": "get_init_creds_opt_set_proxiable",
+}
+
+_LIFETIME_SETTINGS = {
+    "renew_life": "get_init_creds_opt_set_renew_life",
+    "tkt_life": "get_init_creds_opt_set_tkt_life",
+}
+
+
+def _get_setter(setting: str, name: str) -> typing.Callable[..., None]:
+    func = getattr(krb5, name, None)
+    if func is None:
+        raise NotImplementedError(f"{setting} is not supported by the Kerberos library, {name} is not available")
+
+    return func
+
+
+class GetInitCredsOptTemplate:
+    """An immutable set of initial credential options.
+
+    The settings are validated when the template is created and are applied to
+    new :class:`GetInitCredsOpt` objects with :meth:`alloc`. The template
+    itself cannot be modified, :meth:`replace` creates a new template with
+    different settings. A setting that is ``None`` is left as the library
+    default.
+
+    :attr:`opt` is a single options object built from the template that is
+    shared by every caller. It must not be modified or closed by the caller,
+    the libraries copy the options at the start of a request so it can be
+    passed to :meth:`get_init_creds_password` and
+    :meth:`get_init_creds_keytab` from multiple threads, each with their own
+    context.
+
+    Args:
+        anonymous: Request anonymous credentials.
+        canonicalize: Request the client principal to be canonicalized.
+        etype_list: The allowable encryption types.
+        forwardable: Request forwardable credentials.
+        proxiable: Request proxiable credentials.
+        renew_life: The renewable lifetime in seconds.
+        tkt_life: The ticket lifetime in seconds.
+        salt: The salt used to derive the key from the password.
+        pac_request: Whether to request a PAC from the KDC.
+        fast_ccache_name: The credential cache used to armor the requests with
+            FAST, this is only available with MIT krb5.
+        fast_flags: The :class:`FastFlags` for the requests, this is only
+            available with MIT krb5.
+    """
+
+    __slots__ = ("_settings", "_steps", "_lock", "_context", "_opt")
+
+    _settings: typing.Mapping[str, typing.Any]
+    _steps: typing.Tuple[_OptStep, ...]
+    _lock: threading.Lock
+    _context: typing.Optional[krb5.Context]
+    _opt: typing.Optional[krb5.GetInitCredsOpt]
+
+    def __init__(
+        self,
+        *,
+        anonymous: typing.Optional[bool] = None,
+        canonicalize: typing.Optional[bool] = None,
+        etype_list: typing.Optional[typing.Iterable[int]] = None,
+        forwardable: typing.Optional[bool] = None,
+        proxiable: typing.Optional[bool] = None,
+        renew_life: typing.Optional[int] = None,
+        tkt_life: typing.Optional[int] = None,
+        salt: typing.Optional[bytes] = None,
+        pac_request: typing.Optional[bool] = None,
+        fast_ccache_name: typing.Optional[bytes] = None,
+        fast_flags: typing.Optional[int] = None,
+    ) -> None:
+        settings: typing.Dict[str, typing.Any] = {}
+        steps: typing.List[_OptStep] = []
+
+        for setting, value in (
+            ("anonymous", anonymous),
+            ("canonicalize", canonicalize),
+            ("forwardable", forwardable),
+            ("proxiable", proxiable),
+        ):
+            if value is not None:
+                settings[setting] = bool(value)
+                steps.append(_opt_step(_get_setter(setting, _BOOL_SETTINGS[setting]), bool(value)))
+
+        for setting, lifetime in (("renew_life", renew_life), ("tkt_life", tkt_life)):
+            if lifetime is not None:
+                lifetime = int(lifetime)
+                if lifetime < 0:
+                    raise ValueError(f"{setting} must not be negative")
+
+                settings[setting] = lifetime
+                steps.append(_opt_step(_get_setter(setting, _LIFETIME_SETTINGS[setting]), lifetime))
+
+        if etype_list is not None:
+            etypes = tuple(int(e) for e in etype_list)
+            if not etypes:
+                raise ValueError("etype_list must contain at least one encryption type")
+
+            settings["etype_list"] = etypes
+            steps.append(_opt_step(krb5.get_init_creds_opt_set_etype_list, etypes))
+
+        if salt is not None:
+            if not salt:
+                raise ValueError("salt cannot be an empty byte string")
+
+            settings["salt"] = bytes(salt)
+            steps.append(_opt_step(krb5.get_init_creds_opt_set_salt, bytes(salt)))
+
+        if pac_request is not None:
+            settings["pac_request"] = bool(pac_request)
+            steps.append(
+                _context_step(
+                    _get_setter("pac_request", "get_init_creds_opt_set_pac_request"),
+                    bool(pac_request),
+                )
+            )
+
+        if fast_ccache_name is not None:
+            if not fast_ccache_name:
+                raise ValueError("CCache name must be set")
+
+            settings["fast_ccache_name"] = bytes(fast_ccache_name)
+            steps.append(
+                _context_step(
+                    _get_setter("fast_ccache_name", "get_init_creds_opt_set_fast_ccache_name"),
+                    bytes(fast_ccache_name),
+                )
+            )
+
+        if fast_flags is not None:
+            settings["fast_flags"] = int(fast_flags)
+            steps.append(
+                _context_step(
+                    _get_setter("fast_flags", "get_init_creds_opt_set_fast_flags"),
+                    int(fast_flags),
+                )
+            )
+
+        object.__setattr__(self, "_settings", types.MappingProxyType(settings))
+        object.__setattr__(self, "_steps", tuple(steps))
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_context", None)
+        object.__setattr__(self, "_opt", None)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GetInitCredsOptTemplate):
+            return NotImplemented
+
+        return dict(self._settings) == dict(other._settings)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._settings.items()))
+
+    def __repr__(self) -> str:
+        kwargs = ", ".join(f"{k}={v!r}" for k, v in self._settings.items())
+        return f"{type(self).__name__}({kwargs})"
+
+    @property
+    def settings(self) -> typing.Mapping[str, typing.Any]:
+        """The settings of the template that are not ``None``."""
+        return self._settings
+
+    @property
+    def opt(self) -> krb5.GetInitCredsOpt:
+        """The shared options built from the template.
+
+        The options are built with a context owned by the template the first
+        time they are accessed and are freed with :meth:`close`.
+        """
+        opt = self._opt
+        if opt is None:
+            with self._lock:
+                opt = self._opt
+                if opt is None:
+                    context = krb5.init_context()
+                    opt = self.alloc(context)
+                    object.__setattr__(self, "_context", context)
+                    object.__setattr__(self, "_opt", opt)
+
+        return opt
+
+    def alloc(
+        self,
+        context: krb5.Context,
+    ) -> krb5.GetInitCredsOpt:
+        """Allocate new options with the settings of the template.
+
+        The options belong to the caller who can modify them without
+        affecting the template.
+
+        Args:
+            context: Krb5 context.
+
+        Returns:
+            GetInitCredsOpt: The initial credential options.
+        """
+        opt = krb5.get_init_creds_opt_alloc(context)
+        for step in self._steps:
+            step(context, opt)
+
+        return opt
+
+    def replace(
+        self,
+        **settings: typing.Any,
+    ) -> GetInitCredsOptTemplate:
+        """Create a new template with some settings changed.
+
+        Args:
+            settings: The settings to change, set to ``None`` to remove a
+                setting from the new template.
+
+        Returns:
+            GetInitCredsOptTemplate: The new template.
+        """
+        new_settings = dict(self._settings)
+        new_settings.update(settings)
+        return GetInitCredsOptTemplate(**new_settings)
+
+    def close(self) -> None:
+        """Free the shared options.
+
+        The shared options must not be in use by another thread. They are
+        built again if :attr:`opt` is accessed after the template is closed.
+        """
+        with self._lock:
+            opt, context = self._opt, self._context
+            object.__setattr__(self, "_opt", None)
+            object.__setattr__(self, "_context", None)
+
+        if opt is not None:
+            opt.close()
+        if context is not None:
+            context.close()
+
+
+def _opt_step(
+    func: typing.Callable[..., None],
+    value: typing.Any,
+) -> _OptStep:
+    return lambda context, opt: func(opt, value)
+
+
+def _context_step(
+    func: typing.Callable[..., None],
+    value: typing.Any,
+) -> _OptStep:
+    return lambda context, opt: func(context, opt, value)
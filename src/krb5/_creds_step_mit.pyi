@@ -0,0 +1,130 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import typing
+
+from krb5._ccache import CCache
+from krb5._context import Context
+from krb5._creds import Creds, InitCredsContext
+from krb5._principal import Principal
+
+class CredsStepResult(typing.NamedTuple):
+    out_data: bytes
+    realm: bytes
+    continue_needed: bool
+
+class TktCredsContext:
+    """Kerberos TGS request context.
+
+    This class represents the context used for acquiring a service ticket with
+    a TGT in a credential cache.
+
+    Args:
+        context: Krb5 context.
+    """
+
+    def __enter__(self) -> TktCredsContext: ...
+    def __exit__(self, *args: typing.Any) -> None: ...
+    def close(self) -> None:
+        """Free the TGS request context.
+
+        Passing the freed context to any function raises a ``ValueError``.
+        Calling ``close()`` more than once does nothing.
+        """
+
+def init_creds_step(
+    context: Context,
+    ctx: InitCredsContext,
+    in_data: typing.Optional[bytes] = None,
+) -> CredsStepResult:
+    """Get the next KDC request for acquiring initial credentials.
+
+    Processes the KDC reply in `in_data` and returns the next request to send
+    to a KDC of the realm returned. The caller is responsible for sending the
+    request and passing the reply to the next call until `continue_needed` is
+    False. The first call should not specify any input data. The acquired
+    credentials can be retrieved with :meth:`init_creds_get_creds`.
+
+    Args:
+        context: Krb5 context.
+        ctx: Initial credentials context.
+        in_data: The reply from the KDC to the previous request.
+
+    Returns:
+        CredsStepResult: The next request, the realm of the KDC to send it to
+        and whether another exchange is needed.
+    """
+
+def tkt_creds_init(
+    context: Context,
+    ccache: CCache,
+    client: Principal,
+    server: Principal,
+    options: int = 0,
+) -> TktCredsContext:
+    """Create a context to get credentials from a KDC's Ticket Granting Service.
+
+    The TGT for the client in the credential cache is used to request a
+    service ticket for the server principal. The acquired ticket is stored in
+    the credential cache once the request has completed.
+
+    Args:
+        context: Krb5 context.
+        ccache: The credential cache with the TGT.
+        client: The client principal.
+        server: The server principal to get the ticket for.
+        options: The krb5_get_credentials option flags.
+
+    Returns:
+        TktCredsContext: The TGS request context.
+    """
+
+def tkt_creds_get(
+    context: Context,
+    ctx: TktCredsContext,
+) -> None:
+    """Synchronously obtain credentials using a TGS request context.
+
+    Uses the Kerberos library to communicate with the KDC. The credentials can
+    be retrieved with :meth:`tkt_creds_get_creds`.
+
+    Args:
+        context: Krb5 context.
+        ctx: TGS request context.
+    """
+
+def tkt_creds_get_creds(
+    context: Context,
+    ctx: TktCredsContext,
+) -> Creds:
+    """Retrieve acquired credentials from a TGS request context.
+
+    Gets the acquired creds from a completed TGS request context.
+
+    Args:
+        context: Krb5 context.
+        ctx: TGS request context.
+
+    Returns:
+        Creds: The acquired credentials.
+    """
+
+def tkt_creds_step(
+    context: Context,
+    ctx: TktCredsContext,
+    in_data: typing.Optional[bytes] = None,
+) -> CredsStepResult:
+    """Get the next KDC request for a TGS request context.
+
+    Works like :meth:`init_creds_step` for a TGS request context. The acquired
+    credentials can be retrieved with :meth:`tkt_creds_get_creds`.
+
+    Args:
+        context: Krb5 context.
+        ctx: TGS request context.
+        in_data: The reply from the KDC to the previous request.
+
+    Returns:
+        CredsStepResult: The next request, the realm of the KDC to send it to
+        and whether another exchange is needed.
+    """
@@ -0,0 +1,298 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import collections
+import typing
+
+from krb5._exceptions import Krb5Error
+
+from krb5._ccache cimport CCache, lock_caches, unlock_caches
+from krb5._context cimport Context
+from krb5._creds cimport Creds, InitCredsContext
+from krb5._krb5_types cimport *
+from krb5._principal cimport Principal
+
+
+cdef extern from "python_krb5.h":
+    """
+    void pykrb5_creds_set_principals(
+        krb5_creds *creds,
+        krb5_principal client,
+        krb5_principal server
+    )
+    {
+        memset(creds, 0, sizeof(krb5_creds));
+        creds->client = client;
+        creds->server = server;
+    }
+    """
+
+    void pykrb5_creds_set_principals(
+        krb5_creds *creds,
+        krb5_principal client,
+        krb5_principal server,
+    )
+
+    cdef struct _krb5_tkt_creds_context:
+        pass
+    ctypedef _krb5_tkt_creds_context *krb5_tkt_creds_context
+
+    ctypedef krb5_int32 krb5_flags
+
+    unsigned int KRB5_INIT_CREDS_STEP_FLAG_CONTINUE
+    unsigned int KRB5_TKT_CREDS_STEP_FLAG_CONTINUE
+
+    krb5_error_code krb5_init_creds_step(
+        krb5_context context,
+        krb5_init_creds_context ctx,
+        krb5_data *in_data,
+        krb5_data *out,
+        krb5_data *realm,
+        unsigned int *flags,
+    ) nogil
+
+    krb5_error_code krb5_tkt_creds_init(
+        krb5_context context,
+        krb5_ccache ccache,
+        krb5_creds *creds,
+        krb5_flags options,
+        krb5_tkt_creds_context *ctx,
+    ) nogil
+
+    krb5_error_code krb5_tkt_creds_get(
+        krb5_context context,
+        krb5_tkt_creds_context ctx,
+    ) nogil
+
+    krb5_error_code krb5_tkt_creds_get_creds(
+        krb5_context context,
+        krb5_tkt_creds_context ctx,
+        krb5_creds *creds,
+    ) nogil
+
+    krb5_error_code krb5_tkt_creds_step(
+        krb5_context context,
+        krb5_tkt_creds_context ctx,
+        krb5_data *in_data,
+        krb5_data *out,
+        krb5_data *realm,
+        unsigned int *flags,
+    ) nogil
+
+    void krb5_tkt_creds_free(
+        krb5_context context,
+        krb5_tkt_creds_context ctx,
+    ) nogil
+
+
+CredsStepResult = collections.namedtuple('CredsStepResult', [
+    'out_data',
+    'realm',
+    'continue_needed',
+])
+
+
+cdef class TktCredsContext:
+    cdef Context ctx
+    cdef CCache ccache
+    cdef krb5_tkt_creds_context raw
+    cdef object __weakref__
+
+    def __cinit__(TktCredsContext self, Context context):
+        self.ctx = context
+        self.ccache = None
+        self.raw = NULL
+        context.add_dependent(self)
+
+    def __dealloc__(TktCredsContext self):
+        # Closing the krb5 context frees this context first, raw is only
+        # still set while the krb5 context is open.
+        if self.raw and self.ctx.raw:
+            krb5_tkt_creds_free(self.ctx.raw, self.raw)
+            self.raw = NULL
+
+    def __enter__(TktCredsContext self) -> TktCredsContext:
+        return self
+
+    def __exit__(TktCredsContext self, *args: typing.Any) -> None:
+        self.close()
+
+    def __str__(TktCredsContext self) -> str:
+        return "TktCredsContext"
+
+    def close(TktCredsContext self) -> None:
+        if self.raw:
+            self.ctx.ensure_open()
+            krb5_tkt_creds_free(self.ctx.raw, self.raw)
+            self.raw = NULL
+
+    cdef int ensure_open(TktCredsContext self) except -1:
+        if self.raw == NULL:
+            raise ValueError("TktCredsContext is closed")
+
+        return 0
+
+
+cdef object _step_result(
+    Context context,
+    krb5_data *out,
+    krb5_data *realm,
+    unsigned int flags,
+    unsigned int continue_flag,
+):
+    cdef size_t length
+    cdef char *value
+
+    pykrb5_get_krb5_data(out, &length, &value)
+    out_bytes = value[:length] if length else b""
+
+    pykrb5_get_krb5_data(realm, &length, &value)
+    realm_bytes = value[:length] if length else b""
+
+    pykrb5_free_data_contents(context.raw, out)
+    pykrb5_free_data_contents(context.raw, realm)
+
+    return CredsStepResult(out_bytes, realm_bytes, bool(flags & continue_flag))
+
+
+def init_creds_step(
+    Context context not None,
+    InitCredsContext ctx not None,
+    const unsigned char[:] in_data = None,
+) -> CredsStepResult:
+    context.ensure_open()
+    ctx.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef krb5_data in_raw
+    cdef krb5_data out
+    cdef krb5_data realm
+    cdef unsigned int flags = 0
+
+    if in_data is None or len(in_data) == 0:
+        pykrb5_init_krb5_data(&in_raw)
+    else:
+        pykrb5_set_krb5_data(&in_raw, len(in_data), <char *>&in_data[0])
+    pykrb5_init_krb5_data(&out)
+    pykrb5_init_krb5_data(&realm)
+
+    lock_caches(ctx.in_ccache, ctx.out_ccache)
+    try:
+        context.borrow()
+        with nogil:
+            err = krb5_init_creds_step(context.raw, ctx.raw, &in_raw, &out, &realm, &flags)
+        context.release()
+    finally:
+        unlock_caches(ctx.in_ccache, ctx.out_ccache)
+
+    if err:
+        pykrb5_free_data_contents(context.raw, &out)
+        pykrb5_free_data_contents(context.raw, &realm)
+        raise Krb5Error(context, err)
+
+    return _step_result(context, &out, &realm, flags, KRB5_INIT_CREDS_STEP_FLAG_CONTINUE)
+
+
+def tkt_creds_init(
+    Context context not None,
+    CCache ccache not None,
+    Principal client not None,
+    Principal server not None,
+    int options = 0,
+) -> TktCredsContext:
+    context.ensure_open()
+    ccache.ensure_open()
+
+    tkt_ctx = TktCredsContext(context)
+    cdef krb5_error_code err = 0
+    cdef krb5_creds in_creds
+
+    # The principals are copied by krb5_tkt_creds_init so they can be borrowed
+    # from the Principal objects.
+    pykrb5_creds_set_principals(&in_creds, client.raw, server.raw)
+
+    with ccache.lock:
+        ccache.ensure_open()
+        err = krb5_tkt_creds_init(context.raw, ccache.raw, &in_creds, options, &tkt_ctx.raw)
+
+    if err:
+        raise Krb5Error(context, err)
+
+    tkt_ctx.ccache = ccache
+    return tkt_ctx
+
+
+def tkt_creds_get(
+    Context context not None,
+    TktCredsContext ctx not None,
+) -> None:
+    context.ensure_open()
+    ctx.ensure_open()
+
+    cdef krb5_error_code err = 0
+
+    # The request reads the TGT from and stores the ticket in the ccache.
+    with ctx.ccache.lock:
+        ctx.ccache.ensure_open()
+        context.borrow()
+        with nogil:
+            err = krb5_tkt_creds_get(context.raw, ctx.raw)
+        context.release()
+
+    if err:
+        raise Krb5Error(context, err)
+
+
+def tkt_creds_get_creds(
+    Context context not None,
+    TktCredsContext ctx not None,
+) -> Creds:
+    context.ensure_open()
+    ctx.ensure_open()
+
+    creds = Creds(context)
+    cdef krb5_error_code err = 0
+
+    err = krb5_tkt_creds_get_creds(context.raw, ctx.raw, creds.get_pointer())
+    if err:
+        raise Krb5Error(context, err)
+
+    creds.free_contents = 1
+    return creds
+
+
+def tkt_creds_step(
+    Context context not None,
+    TktCredsContext ctx not None,
+    const unsigned char[:] in_data = None,
+) -> CredsStepResult:
+    context.ensure_open()
+    ctx.ensure_open()
+
+    cdef krb5_error_code err = 0
+    cdef krb5_data in_raw
+    cdef krb5_data out
+    cdef krb5_data realm
+    cdef unsigned int flags = 0
+
+    if in_data is None or len(in_data) == 0:
+        pykrb5_init_krb5_data(&in_raw)
+    else:
+        pykrb5_set_krb5_data(&in_raw, len(in_data), <char *>&in_data[0])
+    pykrb5_init_krb5_data(&out)
+    pykrb5_init_krb5_data(&realm)
+
+    # The request reads the TGT from and stores the ticket in the ccache.
+    with ctx.ccache.lock:
+        ctx.ccache.ensure_open()
+        context.borrow()
+        with nogil:
+            err = krb5_tkt_creds_step(context.raw, ctx.raw, &in_raw, &out, &realm, &flags)
+        context.release()
+
+    if err:
+        pykrb5_free_data_contents(context.raw, &out)
+        pykrb5_free_data_contents(context.raw, &realm)
+        raise Krb5Error(context, err)
+
+    return _step_result(context, &out, &realm, flags, KRB5_TKT_CREDS_STEP_FLAG_CONTINUE)
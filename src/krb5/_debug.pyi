@@ -0,0 +1,20 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import typing
+
+def enable_tracking() -> None:
+    """Start tracking the wrapper objects that are created.
+
+    Only objects created after tracking is enabled are recorded. The objects
+    are referenced weakly so tracking does not keep them alive.
+    """
+
+def disable_tracking() -> None:
+    """Stop tracking the wrapper objects and forget the tracked objects."""
+
+def is_tracking() -> bool:
+    """Whether the wrapper objects are being tracked."""
+
+def tracked_objects() -> typing.Dict[type, typing.List[object]]:
+    """Get the tracked objects that are still alive by their type."""
@@ -0,0 +1,48 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import threading
+import typing
+import weakref
+
+
+# Checked on every object creation so the cost is a single flag lookup when
+# tracking is disabled.
+cdef bint _enabled = 0
+_lock = threading.Lock()
+_tracked = {}
+
+
+cdef int track(object obj) except -1:
+    if not _enabled:
+        return 0
+
+    obj_type = type(obj)
+    with _lock:
+        live = _tracked.get(obj_type)
+        if live is None:
+            live = _tracked[obj_type] = weakref.WeakSet()
+        live.add(obj)
+
+    return 0
+
+
+def enable_tracking() -> None:
+    global _enabled
+    _enabled = 1
+
+
+def disable_tracking() -> None:
+    global _enabled
+    with _lock:
+        _enabled = 0
+        _tracked.clear()
+
+
+def is_tracking() -> bool:
+    return bool(_enabled)
+
+
+def tracked_objects() -> typing.Dict[type, typing.List[object]]:
+    with _lock:
+        return {obj_type: list(live) for obj_type, live in _tracked.items()}
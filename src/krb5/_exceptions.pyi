@@ -4,7 +4,11 @@
 from krb5._context import Context
 
 class Krb5Error(Exception):
-    """Base Keberos Error class."""
+    """Base Keberos Error class.
+
+    Creating a Krb5Error returns one of the subclasses below if the error code
+    has a more specific type.
+    """
 
     def __init__(
         self,
@@ -12,3 +16,36 @@ class Krb5Error(Exception):
         err_code: int,
     ) -> None: ...
     err_code: int  #: The Kerberos error code.
+    message: str  #: The error message as formatted by the Kerberos implementation.
+
+class Krb5NotFoundError(Krb5Error):
+    """Base class for the errors where a lookup found no result."""
+
+class CCacheNotFoundError(Krb5NotFoundError):
+    """The credential cache does not exist (KRB5_FCC_NOFILE)."""
+
+class CredentialsNotFoundError(Krb5NotFoundError):
+    """No matching credential was found (KRB5_CC_NOTFOUND, KRB5_CC_END)."""
+
+class KeyTabEntryNotFoundError(Krb5NotFoundError):
+    """No matching keytab entry was found.
+
+    Raised for KRB5_KT_NOTFOUND, KRB5_KT_KVNONOTFOUND and KRB5_KT_END.
+    """
+
+class PreauthFailedError(Krb5Error):
+    """Preauthentication failed, typically an invalid password or key.
+
+    Raised for KRB5KDC_ERR_PREAUTH_FAILED. An invalid password for a principal
+    that does not require preauthentication fails to decrypt the reply
+    instead, that raises a plain :class:`Krb5Error` with
+    KRB5KRB_AP_ERR_BAD_INTEGRITY as the same code is used for AP and TGS
+    integrity failures.
+    """
+
+class PrincipalUnknownError(Krb5Error):
+    """The client or server principal is not known to the KDC.
+
+    Raised for KRB5KDC_ERR_C_PRINCIPAL_UNKNOWN and
+    KRB5KDC_ERR_S_PRINCIPAL_UNKNOWN.
+    """
@@ -21,6 +21,16 @@ cdef extern from "python_krb5.h":
     krb5_error_code KRB5_KT_NAME_TOOLONG
     # krb5_error_code KRB5_CONFIG_NOTENUFSPACE
 
+    krb5_error_code KRB5_CC_END
+    krb5_error_code KRB5_CC_NOTFOUND
+    krb5_error_code KRB5_FCC_NOFILE
+    krb5_error_code KRB5_KT_END
+    krb5_error_code KRB5_KT_KVNONOTFOUND
+    krb5_error_code KRB5_KT_NOTFOUND
+    krb5_error_code KRB5KDC_ERR_C_PRINCIPAL_UNKNOWN
+    krb5_error_code KRB5KDC_ERR_PREAUTH_FAILED
+    krb5_error_code KRB5KDC_ERR_S_PRINCIPAL_UNKNOWN
+
 
 cdef str get_error_message(
     krb5_context ctx,
@@ -36,8 +46,21 @@ cdef str get_error_message(
         krb5_free_error_message(ctx, err_msg)
 
 
+_ERROR_CLASSES = {}
+
+
 class Krb5Error(Exception):
 
+    def __new__(
+        cls,
+        context: Context,
+        err_code: int,
+    ) -> "Krb5Error":
+        if cls is Krb5Error:
+            cls = _ERROR_CLASSES.get(err_code, cls)
+
+        return super().__new__(cls, context, err_code)
+
     def __init__(
         self,
         context: Context,
@@ -45,5 +68,44 @@ class Krb5Error(Exception):
     ) -> None:
         self.err_code = err_code
 
-        msg = get_error_message(context.raw, err_code)
-        super().__init__(f"{msg} {self.err_code}")
+        # The extended message is kept in the context and replaced by the next
+        # call that fails so it is copied straight away.
+        self.message = get_error_message(context.raw, err_code)
+        super().__init__(f"{self.message} {self.err_code}")
+
+
+class Krb5NotFoundError(Krb5Error):
+    pass
+
+
+class CCacheNotFoundError(Krb5NotFoundError):
+    pass
+
+
+class CredentialsNotFoundError(Krb5NotFoundError):
+    pass
+
+
+class KeyTabEntryNotFoundError(Krb5NotFoundError):
+    pass
+
+
+class PreauthFailedError(Krb5Error):
+    pass
+
+
+class PrincipalUnknownError(Krb5Error):
+    pass
+
+
+_ERROR_CLASSES.update({
+    KRB5_CC_END: CredentialsNotFoundError,
+    KRB5_CC_NOTFOUND: CredentialsNotFoundError,
+    KRB5_FCC_NOFILE: CCacheNotFoundError,
+    KRB5_KT_END: KeyTabEntryNotFoundError,
+    KRB5_KT_KVNONOTFOUND: KeyTabEntryNotFoundError,
+    KRB5_KT_NOTFOUND: KeyTabEntryNotFoundError,
+    KRB5KDC_ERR_C_PRINCIPAL_UNKNOWN: PrincipalUnknownError,
+    KRB5KDC_ERR_PREAUTH_FAILED: PreauthFailedError,
+    KRB5KDC_ERR_S_PRINCIPAL_UNKNOWN: PrincipalUnknownError,
+})
@@ -9,3 +9,8 @@ cdef class KeyBlock:
     cdef Context ctx
     cdef krb5_keyblock *raw
     cdef int needs_free
+    cdef object __weakref__
+
+
+# The number of bytes allocated for the key contents.
+cdef size_t keyblock_contents_size(krb5_keyblock *raw)
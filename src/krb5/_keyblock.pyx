@@ -6,6 +6,7 @@ from libc.stdlib cimport free
 from krb5._exceptions import Krb5Error
 
 from krb5._context cimport Context
+from krb5._debug cimport track
 from krb5._krb5_types cimport *
 
 
@@ -90,6 +91,15 @@ cdef extern from "python_krb5.h":
     ) nogil
 
 
+cdef size_t keyblock_contents_size(krb5_keyblock *raw):
+    cdef size_t length = 0
+
+    if raw != NULL:
+        pykrb5_keyblock_get(raw, NULL, &length, NULL)
+
+    return length
+
+
 cdef class KeyBlock:
     # cdef Context ctx
     # cdef krb5_keyblock *raw
@@ -99,12 +109,21 @@ cdef class KeyBlock:
         self.ctx = context
         self.raw = NULL
         self.needs_free = needs_free
+        track(self)
 
     def __dealloc__(KeyBlock self):
         if self.raw != NULL and self.needs_free:
             krb5_free_keyblock(self.ctx.raw, self.raw)
             self.raw = NULL
 
+    def __sizeof__(KeyBlock self) -> int:
+        cdef size_t size = 0
+
+        if self.raw != NULL and self.needs_free:
+            size = sizeof(krb5_keyblock) + keyblock_contents_size(self.raw)
+
+        return object.__sizeof__(self) + size
+
     def __len__(KeyBlock self) -> int:
         cdef size_t length
         pykrb5_keyblock_get(self.raw, NULL, &length, NULL)
@@ -146,6 +165,8 @@ def init_keyblock(
     krb5_enctype enctype,
     const unsigned char[:] key,
 ) -> KeyBlock:
+    context.ensure_open()
+
     kb = KeyBlock(context)
     cdef krb5_error_code err = 0
     cdef size_t length = 0
@@ -166,6 +187,8 @@ def copy_keyblock(
     Context context not None,
     KeyBlock keyblock not None,
 ) -> KeyBlock:
+    context.ensure_open()
+
     out = KeyBlock(context)
     cdef krb5_error_code err = 0
 
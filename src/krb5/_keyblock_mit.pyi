@@ -30,3 +30,33 @@ def c_string_to_key(
     Returns:
         KeyBlock: The keyblock.
     """
+
+def c_string_to_keys(
+    context: Context,
+    requests: typing.Iterable[typing.Tuple[int, bytes, bytes, typing.Optional[bytes]]],
+    threads: typing.Optional[int] = None,
+) -> typing.List[KeyBlock]:
+    """Convert a batch of password strings to keys.
+
+    Like :meth:`c_string_to_key` but derives the keys for multiple requests
+    on native threads without holding the GIL. The string to key functions
+    for the AES encryption types run thousands of PBKDF2 iterations so a
+    batch can be spread across multiple cores.
+
+    Each request is a tuple of the encryption type, password string, salt
+    and S2K parameters, the S2K parameters can be ``None`` to use the default
+    for the encryption type.
+
+    The error of the first request that failed is raised. The threads share
+    the context so the error only has the generic message of the error code
+    and not the extended message of the failed request.
+
+    Args:
+        context: Krb5 context.
+        requests: The requests to derive the keys for.
+        threads: The number of threads to use, defaults to the number of
+            CPUs.
+
+    Returns:
+        List[KeyBlock]: The keyblocks in the same order as the requests.
+    """
@@ -1,6 +1,11 @@
 # Copyright: (c) 2022 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import os
+import typing
+
+from libc.stdlib cimport calloc, free
+
 from krb5._exceptions import Krb5Error
 from krb5._keyblock import init_keyblock
 
@@ -10,6 +15,136 @@ from krb5._krb5_types cimport *
 
 
 cdef extern from "python_krb5.h":
+    """
+    #include <pthread.h>
+
+    typedef struct {
+        krb5_enctype enctype;
+        krb5_data string;
+        krb5_data salt;
+        krb5_data params;
+        int has_params;
+        krb5_keyblock *key;
+        krb5_error_code err;
+    } pykrb5_s2k_request;
+
+    typedef struct {
+        krb5_context context;
+        pykrb5_s2k_request *requests;
+        size_t count;
+        size_t next;
+        pthread_mutex_t lock;
+    } pykrb5_s2k_batch;
+
+    static void *pykrb5_s2k_worker(
+        void *arg
+    )
+    {
+        pykrb5_s2k_batch *batch = (pykrb5_s2k_batch *)arg;
+        pykrb5_s2k_request *req;
+        size_t idx;
+
+        while (1)
+        {
+            pthread_mutex_lock(&batch->lock);
+            idx = batch->next++;
+            pthread_mutex_unlock(&batch->lock);
+
+            if (idx >= batch->count)
+            {
+                break;
+            }
+
+            // The string to key functions do not use the mutable state of
+            // the context so it can be shared by the workers.
+            req = &batch->requests[idx];
+            if (req->has_params)
+            {
+                req->err = krb5_c_string_to_key_with_params(batch->context, req->enctype,
+                    &req->string, &req->salt, &req->params, req->key);
+            }
+            else
+            {
+                req->err = krb5_c_string_to_key(batch->context, req->enctype,
+                    &req->string, &req->salt, req->key);
+            }
+        }
+
+        return NULL;
+    }
+
+    void pykrb5_c_string_to_keys(
+        krb5_context context,
+        pykrb5_s2k_request *requests,
+        size_t count,
+        size_t threads
+    )
+    {
+        pykrb5_s2k_batch batch;
+        pthread_t *workers = NULL;
+        size_t started = 0;
+        size_t i;
+
+        batch.context = context;
+        batch.requests = requests;
+        batch.count = count;
+        batch.next = 0;
+        pthread_mutex_init(&batch.lock, NULL);
+
+        if (threads > count)
+        {
+            threads = count;
+        }
+        if (threads > 1)
+        {
+            workers = calloc(threads - 1, sizeof(pthread_t));
+        }
+
+        // The calling thread is also a worker, any request left by a thread
+        // that failed to start is handled by the threads that did start.
+        if (workers != NULL)
+        {
+            for (i = 0; i < threads - 1; i++)
+            {
+                if (pthread_create(&workers[started], NULL, pykrb5_s2k_worker, &batch) == 0)
+                {
+                    started++;
+                }
+            }
+        }
+
+        pykrb5_s2k_worker(&batch);
+
+        for (i = 0; i < started; i++)
+        {
+            pthread_join(workers[i], NULL);
+        }
+
+        free(workers);
+        pthread_mutex_destroy(&batch.lock);
+    }
+    """
+
+    ctypedef struct pykrb5_s2k_request:
+        krb5_enctype enctype
+        krb5_data string
+        krb5_data salt
+        krb5_data params
+        int has_params
+        krb5_keyblock *key
+        krb5_error_code err
+
+    void pykrb5_c_string_to_keys(
+        krb5_context context,
+        pykrb5_s2k_request *requests,
+        size_t count,
+        size_t threads,
+    ) nogil
+
+    void krb5_clear_error_message(
+        krb5_context context,
+    ) nogil
+
     krb5_error_code krb5_c_string_to_key(
         krb5_context context,
         krb5_enctype enctype,
@@ -28,6 +163,16 @@ cdef extern from "python_krb5.h":
     ) nogil
 
 
+cdef void _set_data(
+    krb5_data *data,
+    const unsigned char[:] value,
+):
+    if len(value) == 0:
+        pykrb5_set_krb5_data(data, 0, "")
+    else:
+        pykrb5_set_krb5_data(data, len(value), <char *>&value[0])
+
+
 def c_string_to_key(
     Context context not None,
     krb5_enctype enctype,
@@ -35,35 +180,109 @@ def c_string_to_key(
     const unsigned char[:] salt,
     const unsigned char[:] s2kparams = None,
 ) -> KeyBlock:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
-    cdef size_t length = 0
 
     cdef KeyBlock kb = init_keyblock(context, enctype, None)
 
     cdef krb5_data string_raw
-    if len(string) == 0:
-        pykrb5_set_krb5_data(&string_raw, 0, "")
-    else:
-        pykrb5_set_krb5_data(&string_raw, len(string), <char *>&string[0])
+    _set_data(&string_raw, string)
 
     cdef krb5_data salt_raw
-    if len(salt) == 0:
-        pykrb5_set_krb5_data(&salt_raw, 0, "")
-    else:
-        pykrb5_set_krb5_data(&salt_raw, len(salt), <char *>&salt[0])
+    _set_data(&salt_raw, salt)
 
     cdef krb5_data s2kparams_raw
     if s2kparams is None:
-        err = krb5_c_string_to_key(context.raw, enctype, &string_raw, &salt_raw, kb.raw)
+        context.borrow()
+        with nogil:
+            err = krb5_c_string_to_key(context.raw, enctype, &string_raw, &salt_raw, kb.raw)
+        context.release()
     else:
-        if len(s2kparams) == 0:
-           pykrb5_set_krb5_data(&s2kparams_raw, 0, "")
-        else:
-           pykrb5_set_krb5_data(&s2kparams_raw, len(s2kparams), <char *>&s2kparams[0])
+        _set_data(&s2kparams_raw, s2kparams)
 
-        err = krb5_c_string_to_key_with_params(context.raw, enctype, &string_raw, &salt_raw, &s2kparams_raw, kb.raw)
+        context.borrow()
+        with nogil:
+            err = krb5_c_string_to_key_with_params(
+                context.raw,
+                enctype,
+                &string_raw,
+                &salt_raw,
+                &s2kparams_raw,
+                kb.raw,
+            )
+        context.release()
 
     if err:
         raise Krb5Error(context, err)
 
     return kb
+
+
+def c_string_to_keys(
+    Context context not None,
+    requests: typing.Iterable[typing.Tuple[int, bytes, bytes, typing.Optional[bytes]]],
+    threads: typing.Optional[int] = None,
+) -> typing.List[KeyBlock]:
+    context.ensure_open()
+
+    if threads is None:
+        threads = os.cpu_count() or 1
+    elif threads < 1:
+        raise ValueError("threads must be greater than 0")
+
+    requests = list(requests)
+    cdef size_t count = len(requests)
+    cdef size_t thread_count = threads
+    cdef size_t idx
+    cdef pykrb5_s2k_request *raw = NULL
+    cdef const unsigned char[:] string
+    cdef const unsigned char[:] salt
+    cdef const unsigned char[:] s2kparams
+    cdef KeyBlock kb
+
+    if count == 0:
+        return []
+
+    raw = <pykrb5_s2k_request *>calloc(count, sizeof(pykrb5_s2k_request))
+    if raw == NULL:
+        raise MemoryError()
+
+    # Keeps the buffers referenced by the raw requests alive until the keys
+    # have been derived.
+    buffers = []
+    keyblocks = []
+    try:
+        for idx in range(count):
+            enctype, string, salt, params = requests[idx]
+            kb = init_keyblock(context, enctype, None)
+            keyblocks.append(kb)
+            buffers.extend([string, salt])
+
+            raw[idx].enctype = enctype
+            raw[idx].key = kb.raw
+            _set_data(&raw[idx].string, string)
+            _set_data(&raw[idx].salt, salt)
+            if params is not None:
+                s2kparams = params
+                buffers.append(s2kparams)
+                _set_data(&raw[idx].params, s2kparams)
+                raw[idx].has_params = 1
+
+        context.borrow()
+        with nogil:
+            pykrb5_c_string_to_keys(context.raw, raw, count, thread_count)
+        context.release()
+
+        for idx in range(count):
+            if raw[idx].err:
+                # The threads share the context so the extended message could
+                # be from another request, the error uses the message of the
+                # code instead.
+                krb5_clear_error_message(context.raw)
+                raise Krb5Error(context, raw[idx].err)
+
+    finally:
+        free(raw)
+
+    return keyblocks
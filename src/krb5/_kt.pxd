@@ -1,6 +1,8 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+cimport cython
+
 from krb5._context cimport Context
 from krb5._krb5_types cimport *
 
@@ -8,9 +10,21 @@ from krb5._krb5_types cimport *
 cdef class KeyTab:
     cdef Context ctx
     cdef krb5_keytab raw
+    # Serializes the native calls made with raw so the same object can be
+    # shared between threads. ensure_open is checked again once the lock is
+    # held as another thread may have closed the handle in the meantime.
+    cdef cython.pymutex lock
+    # The cursors of the iterations in progress, they are ended before raw is
+    # freed so closing the keytab during an iteration does not leak them.
+    cdef set cursors
+    cdef object __weakref__
+
+    cdef int ensure_open(KeyTab self) except -1
+    cdef int end_cursors(KeyTab self) except -1
 
 
 cdef class KeyTabEntry:
     cdef Context ctx
     cdef krb5_keytab_entry raw
     cdef int needs_free
+    cdef object __weakref__
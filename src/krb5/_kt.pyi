@@ -21,7 +21,19 @@ class KeyTab:
 
         Enumerates through all the entries in a keytab. Will fail if the keytab
         being iterated does not exist. It may not be possible to add/remove
-        entries on a keytab while it is being enumerated.
+        entries on a keytab while it is being enumerated. A closed keytab
+        yields nothing and closing the keytab during the iteration ends it.
+        """
+
+    def __enter__(self) -> KeyTab: ...
+    def __exit__(self, *args: typing.Any) -> None: ...
+    def close(self) -> None:
+        """Close the keytab handle.
+
+        Closes the handle, and any file descriptor it has open, without
+        waiting for the object to be garbage collected. The keytab itself is
+        not removed. Passing a closed keytab to any function raises a
+        ``ValueError``. Calling ``close()`` more than once does nothing.
         """
 
     @property
@@ -138,6 +150,30 @@ def kt_get_entry(
         KeyTabEntry: The entry found in the keytab.
     """
 
+def kt_try_get_entry(
+    context: Context,
+    keytab: KeyTab,
+    principal: Principal,
+    kvno: int = 0,
+    enctype: int = 0,
+) -> typing.Optional[KeyTabEntry]:
+    """Get an entry from a key table if present.
+
+    Like :meth:`kt_get_entry` but returns None instead of raising an exception
+    when no matching entry is found. Other failures, like the keytab file not
+    existing, are still raised as a :class:`Krb5Error`.
+
+    Args:
+        context: Krb5 context.
+        keytab: The keytab to search.
+        principal: The principal to match.
+        kvno: The kvno to match in the keytab or 0 to match the highest kvno.
+        enctype: The encryption type to get in the keytab or 0 to match any.
+
+    Returns:
+        Optional[KeyTabEntry]: The entry found in the keytab or None.
+    """
+
 def kt_get_name(
     context: Context,
     keytab: KeyTab,
@@ -11,9 +11,10 @@ from krb5._exceptions import Krb5Error
 from krb5._principal import PrincipalParseFlags
 
 from krb5._context cimport Context
-from krb5._keyblock cimport KeyBlock
+from krb5._debug cimport track
+from krb5._keyblock cimport KeyBlock, keyblock_contents_size
 from krb5._krb5_types cimport *
-from krb5._principal cimport Principal
+from krb5._principal cimport Principal, principal_native_size
 
 
 cdef extern from "python_krb5.h":
@@ -205,36 +206,70 @@ cdef extern from "python_krb5.h":
 
     krb5_error_code KRB5_CONFIG_NOTENUFSPACE
     krb5_error_code KRB5_KT_END
+    krb5_error_code KRB5_KT_KVNONOTFOUND
+    krb5_error_code KRB5_KT_NOTFOUND
     krb5_error_code KRB5_KT_NAME_TOOLONG
     krb5_error_code KRB5_KT_PREFIX_MAX_LEN
 
 
+cdef class _KeyTabCursor:
+    # The position of an iteration over a KeyTab, raw is only valid while
+    # active is set.
+    cdef krb5_kt_cursor raw
+    cdef int active
+
+
 cdef class KeyTab:
     # cdef Context ctx
     # cdef krb5_keytab raw
+    # cdef cython.pymutex lock
+    # cdef set cursors
 
     def __cinit__(KeyTab self, Context context):
         self.ctx = context
         self.raw = NULL
+        self.cursors = None
+        context.add_dependent(self)
+        track(self)
 
     def __dealloc__(KeyTab self):
-        if self.raw:
+        # Closing the context closes the handle first, raw is only still set
+        # while the context is open.
+        if self.raw and self.ctx.raw:
             krb5_kt_close(self.ctx.raw, self.raw)
             self.raw = NULL
 
+    def __enter__(KeyTab self) -> KeyTab:
+        return self
+
+    def __exit__(KeyTab self, *args: typing.Any) -> None:
+        self.close()
+
     def __iter__(KeyTab self) -> typing.Iterator["KeyTabEntry"]:
         cdef krb5_error_code err = 0
-        cdef krb5_kt_cursor cursor
-
-        err = krb5_kt_start_seq_get(self.ctx.raw, self.raw, &cursor)
+        cdef _KeyTabCursor cursor = _KeyTabCursor()
+
+        # The lock is only held for each native call and never across a
+        # yield so other threads can use the keytab between entries. Closing
+        # the keytab ends the cursor, which stops the iteration.
+        with self.lock:
+            if self.raw != NULL:
+                err = krb5_kt_start_seq_get(self.ctx.raw, self.raw, &cursor.raw)
+                if not err:
+                    cursor.active = 1
+                    if self.cursors is None:
+                        self.cursors = set()
+                    self.cursors.add(cursor)
         if err:
             raise Krb5Error(self.ctx, err)
 
         try:
             while True:
                 entry = KeyTabEntry(self.ctx)
-                err = krb5_kt_next_entry(self.ctx.raw, self.raw, &entry.raw, &cursor)
-                if err == KRB5_KT_END:
+                with self.lock:
+                    if cursor.active:
+                        err = krb5_kt_next_entry(self.ctx.raw, self.raw, &entry.raw, &cursor.raw)
+                if err == KRB5_KT_END or not cursor.active:
                     break
                 elif err:
                     raise Krb5Error(self.ctx, err)
@@ -243,10 +278,41 @@ cdef class KeyTab:
                 yield entry
 
         finally:
-            err = krb5_kt_end_seq_get(self.ctx.raw, self.raw, &cursor)
+            err = 0
+            with self.lock:
+                if cursor.active:
+                    err = krb5_kt_end_seq_get(self.ctx.raw, self.raw, &cursor.raw)
+                    cursor.active = 0
+                    self.cursors.discard(cursor)
             if err:
                 raise Krb5Error(self.ctx, err)
 
+    def close(KeyTab self) -> None:
+        with self.lock:
+            if self.raw:
+                self.ctx.ensure_open()
+                self.end_cursors()
+                krb5_kt_close(self.ctx.raw, self.raw)
+                self.raw = NULL
+
+    cdef int ensure_open(KeyTab self) except -1:
+        if self.raw == NULL:
+            raise ValueError("KeyTab is closed")
+
+        return 0
+
+    cdef int end_cursors(KeyTab self) except -1:
+        # Called with the lock held before raw is freed.
+        cdef _KeyTabCursor cursor
+
+        if self.cursors:
+            for cursor in self.cursors:
+                krb5_kt_end_seq_get(self.ctx.raw, self.raw, &cursor.raw)
+                cursor.active = 0
+            self.cursors.clear()
+
+        return 0
+
     @property
     def addr(self) -> typing.Optional[int]:
         if self.raw:
@@ -298,12 +364,24 @@ cdef class KeyTabEntry:
     def __cinit__(KeyTabEntry self, Context context):
         self.ctx = context
         self.needs_free = 0
+        track(self)
 
     def __dealloc__(KeyTabEntry self):
         if self.needs_free:
             krb5_kt_free_entry_generic(self.ctx.raw, &self.raw)
             self.needs_free = 0
 
+    def __sizeof__(KeyTabEntry self) -> int:
+        cdef size_t size = 0
+        cdef krb5_principal principal = NULL
+        cdef krb5_keyblock *key = NULL
+
+        if self.needs_free:
+            pykrb5_keytab_entry_get(&self.raw, &principal, NULL, NULL, &key)
+            size = principal_native_size(principal) + keyblock_contents_size(key)
+
+        return object.__sizeof__(self) + size
+
     def __repr__(KeyTabEntry self) -> str:
         kwargs = [f"{k}={v}" for k, v in {
             'principal': repr(self.principal),
@@ -354,9 +432,14 @@ def kt_add_entry(
     uint32_t timestamp,
     KeyBlock keyblock not None,
 ) -> None:
+    context.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_kt_add_entry_generic(context.raw, keytab.raw, principal.raw, kvno, timestamp, keyblock.raw)
+    with keytab.lock:
+        keytab.ensure_open()
+        err = krb5_kt_add_entry_generic(context.raw, keytab.raw, principal.raw, kvno, timestamp, keyblock.raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -364,6 +447,8 @@ def kt_add_entry(
 def kt_default(
     Context context not None,
 ) -> KeyTab:
+    context.ensure_open()
+
     kt = KeyTab(context)
     cdef krb5_error_code err = 0
 
@@ -377,6 +462,8 @@ def kt_default(
 def kt_default_name(
     Context context not None,
 ) -> bytes:
+    context.ensure_open()
+
     cdef krb5_error_code err = KRB5_CONFIG_NOTENUFSPACE
     buffer_size = 8192
     buffer_length = buffer_size
@@ -415,11 +502,42 @@ def kt_get_entry(
     krb5_kvno kvno=0,
     krb5_enctype enctype=0,
 ) -> KeyTabEntry:
+    context.ensure_open()
+    keytab.ensure_open()
+
+    return _get_entry(context, keytab, principal, kvno, enctype, 0)
+
+
+def kt_try_get_entry(
+    Context context not None,
+    KeyTab keytab not None,
+    Principal principal not None,
+    krb5_kvno kvno=0,
+    krb5_enctype enctype=0,
+) -> typing.Optional[KeyTabEntry]:
+    context.ensure_open()
+    keytab.ensure_open()
+
+    return _get_entry(context, keytab, principal, kvno, enctype, 1)
+
+
+cdef object _get_entry(
+    Context context,
+    KeyTab keytab,
+    Principal principal,
+    krb5_kvno kvno,
+    krb5_enctype enctype,
+    int missing_ok,
+):
     cdef KeyTabEntry entry = KeyTabEntry(context)
     cdef krb5_error_code err = 0
 
-    err = krb5_kt_get_entry(context.raw, keytab.raw, principal.raw, kvno, enctype, &entry.raw)
+    with keytab.lock:
+        keytab.ensure_open()
+        err = krb5_kt_get_entry(context.raw, keytab.raw, principal.raw, kvno, enctype, &entry.raw)
     if err:
+        if missing_ok and (err == KRB5_KT_NOTFOUND or err == KRB5_KT_KVNONOTFOUND or err == KRB5_KT_END):
+            return None
         raise Krb5Error(context, err)
 
     return entry
@@ -429,6 +547,9 @@ def kt_get_name(
     Context context not None,
     KeyTab keytab not None,
 ) -> bytes:
+    context.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = KRB5_KT_NAME_TOOLONG
     buffer_size = 8192
     buffer_length = buffer_size
@@ -438,7 +559,9 @@ def kt_get_name(
 
     try:
         while err == KRB5_KT_NAME_TOOLONG:
-            err = krb5_kt_get_name(context.raw, keytab.raw, buffer, buffer_length)
+            with keytab.lock:
+                keytab.ensure_open()
+                err = krb5_kt_get_name(context.raw, keytab.raw, buffer, buffer_length)
 
             # Heimdal does not define KRB5_KT_NAME_TOOLONG so fail on the first try.
             if err and (err != KRB5_KT_NAME_TOOLONG or KRB5_KT_NAME_TOOLONG == 1):
@@ -465,12 +588,17 @@ def kt_get_type(
     Context context not None,
     KeyTab keytab not None,
 ) -> bytes:
+    context.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef char *buffer = NULL
 
     if KRB5_KT_PREFIX_MAX_LEN == -1:
         # MIT Kerberos just returns a const char* which shouldn't be freed
-        krb5_kt_get_type_generic(context.raw, keytab.raw, &buffer, 0)
+        with keytab.lock:
+            keytab.ensure_open()
+            krb5_kt_get_type_generic(context.raw, keytab.raw, &buffer, 0)
         return <bytes>buffer
 
     else:
@@ -481,7 +609,9 @@ def kt_get_type(
             raise MemoryError()
 
         try:
-            err = krb5_kt_get_type_generic(context.raw, keytab.raw, &buffer, buffer_length)
+            with keytab.lock:
+                keytab.ensure_open()
+                err = krb5_kt_get_type_generic(context.raw, keytab.raw, &buffer, buffer_length)
             if err:
                 raise Krb5Error(context, err)
 
@@ -499,6 +629,8 @@ def kt_read_service_key(
     krb5_kvno kvno = 0,
     krb5_enctype enctype = 0,
 ) -> KeyBlock:
+    context.ensure_open()
+
     kb = KeyBlock(context)
 
     cdef krb5_error_code err = 0
@@ -520,9 +652,14 @@ def kt_remove_entry(
     KeyTab keytab not None,
     KeyTabEntry entry not None,
 ) -> None:
+    context.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = 0
 
-    err = krb5_kt_remove_entry(context.raw, keytab.raw, &entry.raw)
+    with keytab.lock:
+        keytab.ensure_open()
+        err = krb5_kt_remove_entry(context.raw, keytab.raw, &entry.raw)
     if err:
         raise Krb5Error(context, err)
 
@@ -531,6 +668,8 @@ def kt_resolve(
     Context context not None,
     const unsigned char[:] name not None,
 ) -> KeyTab:
+    context.ensure_open()
+
     kt = KeyTab(context)
     cdef krb5_error_code err = 0
 
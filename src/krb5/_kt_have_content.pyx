@@ -20,6 +20,9 @@ def kt_have_content(
     Context context not None,
     KeyTab keytab not None,
 ) -> bool:
+    context.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = 0
 
     err = krb5_kt_have_content(context.raw, keytab.raw)
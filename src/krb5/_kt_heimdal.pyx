@@ -26,6 +26,9 @@ def kt_get_full_name(
     Context context not None,
     KeyTab keytab not None,
 ) -> bytes:
+    context.ensure_open()
+    keytab.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef char *str = NULL
 
@@ -24,6 +24,8 @@ cdef extern from "python_krb5.h":
 def kt_client_default(
     Context context not None,
 ) -> KeyTab:
+    context.ensure_open()
+
     kt = KeyTab(context)
     cdef krb5_error_code err = 0
 
@@ -38,10 +40,15 @@ def kt_dup(
     Context context not None,
     KeyTab keytab not None,
 ) -> KeyTab:
+    context.ensure_open()
+    keytab.ensure_open()
+
     out_kt = KeyTab(context)
     cdef krb5_error_code err = 0
 
-    err = krb5_kt_dup(context.raw, keytab.raw, &out_kt.raw)
+    with keytab.lock:
+        keytab.ensure_open()
+        err = krb5_kt_dup(context.raw, keytab.raw, &out_kt.raw)
     if err:
         raise Krb5Error(context, err)
 
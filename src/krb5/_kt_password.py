@@ -0,0 +1,148 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import threading
+import time
+import typing
+
+import krb5
+
+if typing.TYPE_CHECKING:
+    from krb5._creds_mit import EtypeInfo
+
+
+def _default_salt(
+    principal: krb5.Principal,
+) -> bytes:
+    # The default salt is the realm followed by each name component.
+    return principal.realm + b"".join(principal.components)
+
+
+def kt_add_password_entries(
+    context: krb5.Context,
+    keytab: krb5.KeyTab,
+    entries: typing.Iterable[typing.Tuple[krb5.Principal, bytes, int]],
+    enctypes: typing.Optional[typing.Iterable[int]] = None,
+    opt: typing.Optional[krb5.GetInitCredsOpt] = None,
+    threads: typing.Optional[int] = None,
+    timestamp: typing.Optional[int] = None,
+    context_factory: typing.Optional[typing.Callable[[], krb5.Context]] = None,
+) -> int:
+    """Add keytab entries derived from the passwords of multiple principals.
+
+    Looks up the etype-info of each principal with :meth:`get_etype_info`,
+    derives the keys with :meth:`c_string_to_keys` and adds them to the keytab
+    with :meth:`kt_add_entry`. The etype-info lookups for multiple principals
+    are done in parallel, each thread with its own context created by
+    ``context_factory``, and the keys are derived in parallel without the GIL.
+    The factory must return a new context every time it is called as the
+    contexts are closed once the lookups are done. A single principal, or
+    ``threads=1``, is looked up with ``context`` on the calling thread.
+
+    The same ``opt`` is read by every lookup thread at the same time. It must
+    not be modified or closed by another thread until the function returns
+    and must not have an in or out ``CCache`` set as the cache handle would
+    be used by the threads without its lock. A FAST ccache only stores the
+    cache name and can be used.
+
+    Each entry is a tuple of the principal, its password and the key version
+    number to store. By default a key is added for the encryption type the KDC
+    returned in the etype-info. When ``enctypes`` is set a key is added for
+    each of those encryption types instead, using the salt from the
+    etype-info or the default salt if the KDC provided no etype-info.
+
+    Every lookup and key is done before the keytab is changed so an error in
+    those steps leaves the keytab untouched. An error adding one of the keys
+    is raised straight away and the keys added before it are kept in the
+    keytab, they are not removed again. To add all or none of the entries,
+    write them to a new ``FILE`` keytab and rename it over the existing one
+    once the function returns.
+
+    Args:
+        context: Krb5 context.
+        keytab: The keytab to add the entries to.
+        entries: The principal, password and kvno of each entry.
+        enctypes: The encryption types to add a key for.
+        opt: Options to use for the etype-info lookups (e.g. for FAST
+            armoring).
+        threads: The number of threads to use, defaults to the number of
+            CPUs.
+        timestamp: The seconds since EPOCH to set on the entries, defaults
+            to the current time.
+        context_factory: Creates a new Krb5 context for each lookup thread,
+            defaults to :meth:`init_context`.
+
+    Returns:
+        int: The number of entries added to the keytab.
+    """
+    if keytab.addr is None:
+        raise ValueError("KeyTab is closed")
+
+    if threads is None:
+        threads = os.cpu_count() or 1
+    elif threads < 1:
+        raise ValueError("threads must be greater than 0")
+
+    entries = list(entries)
+    enctype_list = None if enctypes is None else list(enctypes)
+    if timestamp is None:
+        timestamp = int(time.time())
+
+    principals: typing.Dict[typing.Optional[bytes], krb5.Principal] = {}
+    for principal, _, _ in entries:
+        principals.setdefault(principal.name, principal)
+
+    factory = krb5.init_context if context_factory is None else context_factory
+    lock = threading.Lock()
+    contexts: typing.List[krb5.Context] = []
+    local = threading.local()
+
+    def lookup(principal: krb5.Principal) -> typing.Tuple[typing.Optional[bytes], EtypeInfo]:
+        # A context is not thread safe, each lookup thread uses its own.
+        lookup_context = getattr(local, "context", None)
+        if lookup_context is None:
+            lookup_context = local.context = factory()
+            with lock:
+                contexts.append(lookup_context)
+
+        return principal.name, krb5.get_etype_info(lookup_context, principal, opt)
+
+    if len(principals) == 1 or threads == 1:
+        etype_info = {p.name: krb5.get_etype_info(context, p, opt) for p in principals.values()}
+    else:
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(threads, len(principals))) as executor:
+                etype_info = dict(executor.map(lookup, principals.values()))
+
+        finally:
+            for lookup_context in contexts:
+                lookup_context.close()
+
+    requests = []
+    targets = []
+    for principal, password, kvno in entries:
+        info = etype_info[principal.name]
+        if enctype_list is None:
+            if info.salt is None:
+                name = (principal.name or b"").decode("utf-8")
+                raise ValueError(f"The KDC provided no etype-info for {name}, enctypes must be set")
+            principal_enctypes = [info.etype]
+        else:
+            principal_enctypes = enctype_list
+
+        salt = _default_salt(principal) if info.salt is None else info.salt
+        for enctype in principal_enctypes:
+            # The s2kparams only apply to the enctype they were returned for.
+            s2kparams = info.s2kparams if enctype == info.etype else None
+            requests.append((enctype, password, salt, s2kparams))
+            targets.append((principal, kvno))
+
+    keys = krb5.c_string_to_keys(context, requests, threads)
+    for (principal, kvno), key in zip(targets, keys):
+        krb5.kt_add_entry(context, keytab, principal, kvno, timestamp, key)
+
+    return len(keys)
@@ -10,3 +10,8 @@ cdef class Principal:
     cdef krb5_principal raw
     cdef int needs_free
     cdef int _parse_flags
+    cdef object __weakref__
+
+
+# The approximate number of bytes allocated for the principal data.
+cdef size_t principal_native_size(krb5_principal raw)
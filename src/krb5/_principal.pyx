@@ -9,6 +9,7 @@ from libc.stdint cimport int32_t, uintptr_t
 from krb5._exceptions import Krb5Error
 
 from krb5._context cimport Context
+from krb5._debug cimport track
 from krb5._krb5_types cimport *
 
 
@@ -279,6 +280,7 @@ cdef class Principal:
         self.raw = NULL
         self.needs_free = needs_free
         self._parse_flags = flags
+        track(self)
 
     def __copy__(Principal self):
         return copy_principal(self.ctx, self)
@@ -288,6 +290,14 @@ cdef class Principal:
             krb5_free_principal(self.ctx.raw, self.raw)
             self.raw = NULL
 
+    def __sizeof__(Principal self) -> int:
+        cdef size_t size = 0
+
+        if self.needs_free:
+            size = principal_native_size(self.raw)
+
+        return object.__sizeof__(self) + size
+
     @property
     def addr(Principal self) -> typing.Optional[int]:
         if self.raw:
@@ -372,10 +382,30 @@ cdef class Principal:
         pykrb5_principal_set_type(self.raw, value)
 
 
+cdef size_t principal_native_size(krb5_principal raw):
+    cdef size_t size
+    cdef size_t length
+    cdef size_t count
+    cdef size_t pos
+
+    if raw == NULL:
+        return 0
+
+    pykrb5_principal_get(raw, &length, NULL, &count, NULL)
+    size = sizeof(krb5_principal_data) + length + count * sizeof(krb5_data)
+    for pos in range(count):
+        pykrb5_principal_get_component(raw, pos, &length, NULL)
+        size += length
+
+    return size
+
+
 def copy_principal(
     Context context not None,
     Principal principal not None,
 ) -> Principal:
+    context.ensure_open()
+
     out = Principal(context, principal._parse_flags)
     cdef krb5_error_code err = 0
 
@@ -391,6 +421,8 @@ def parse_name_flags(
     const unsigned char[:] name not None,
     int flags=PrincipalParseFlags.none,
 ) -> Principal:
+    context.ensure_open()
+
     principal = Principal(context, flags)
     cdef krb5_error_code err = 0
 
@@ -412,6 +444,8 @@ def unparse_name_flags(
     Principal principal not None,
     int flags=PrincipalUnparseFlags.none,
 ) -> bytes:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef char *name = NULL
 
@@ -435,6 +469,8 @@ def build_principal(
     const unsigned char[:] realm not None,
     components: typing.Iterable[bytes],
 ) -> Principal:
+    context.ensure_open()
+
     component_list = list(components)
     component_count = len(component_list)
 
@@ -17,4 +17,6 @@ def principal_get_realm(
     Context context not None,
     Principal principal not None,
 ) -> bytes:
+    context.ensure_open()
+
     return <bytes>krb5_principal_get_realm(context.raw, principal.raw)
@@ -76,6 +76,8 @@ def set_password(
     const unsigned char[:] newpw not None,
     Principal change_password_for = None,
 ) -> SetPasswordResult:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef int result_code
     cdef krb5_data krb5_result_code_string
@@ -136,6 +138,9 @@ def set_password_using_ccache(
     const unsigned char[:] newpw not None,
     Principal change_password_for = None,
 ) -> SetPasswordResult:
+    context.ensure_open()
+    ccache.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef int result_code
     cdef krb5_data krb5_result_code_string
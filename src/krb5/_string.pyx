@@ -65,6 +65,8 @@ def enctype_to_string(
     Context context not None,
     krb5_enctype enctype,
 ) -> str:
+    context.ensure_open()
+
     cdef krb5_error_code err = 0
     cdef char *buffer = NULL
 
@@ -82,6 +84,8 @@ def string_to_enctype(
     Context context not None,
     str string,
 ) -> int:
+    context.ensure_open()
+
     cdef krb5_enctype enctype = 0
     cdef krb5_error_code err = 0
     b_string = string.encode("utf-8")
@@ -0,0 +1,1105 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""In memory caches for Kerberos keytabs and credential caches.
+
+The Kerberos library reads a ``FILE`` keytab or credential cache from disk for
+every call. This module keeps a copy of the keytab in a ``MEMORY`` keytab and
+only reloads it when the file on disk has changed. Credentials can also be
+stored in a ``MEMORY`` credential cache which is written back to the file in
+the background and the caches in a collection can be indexed by principal.
+The etype-info returned by the KDC can be cached to avoid an AS exchange for
+every lookup and a single FAST armor TGT can be kept fresh for many requests.
+
+Example:
+    import krb5
+    import krb5.caching
+
+    kt_cache = krb5.caching.KeyTabCache(b"FILE:/etc/krb5.keytab")
+    ctx = krb5.init_context()
+    with kt_cache.resolve(ctx) as kt:
+        creds = krb5.get_init_creds_keytab(ctx, princ, opt, kt)
+
+    with krb5.caching.WriteBackCCache(b"FILE:/tmp/krb5cc_1000") as cc_cache:
+        cc_cache.store_cred(creds)
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+import time
+import typing
+import uuid
+
+import krb5
+
+if typing.TYPE_CHECKING:
+    from krb5._creds_mit import EtypeInfo
+
+_StatKey = typing.Tuple[int, int, int]
+
+
+class _KeyTabGeneration(typing.NamedTuple):
+    name: bytes
+    keytab: krb5.KeyTab
+
+
+class _EtypeInfoEntry(typing.NamedTuple):
+    info: EtypeInfo
+    expires: float
+    # Keeps the options alive so the id used in the key is not reused.
+    opt: typing.Optional[krb5.GetInitCredsOpt]
+
+
+def _file_path(
+    name: bytes,
+    kind: str,
+) -> bytes:
+    cache_type, sep, residual = name.partition(b":")
+    if not sep:
+        return name
+    elif cache_type != b"FILE":
+        raise ValueError(f"Cannot cache {cache_type.decode()} {kind}, only FILE is supported")
+
+    return residual
+
+
+def _stat_key(path: bytes) -> _StatKey:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class KeyTabCache:
+    """A FILE keytab preloaded into a MEMORY keytab.
+
+    The entries of the keytab are copied into a new ``MEMORY`` keytab, a
+    generation, that is used for lookups instead of the file. When the file is
+    changed the entries are loaded into a new generation which then replaces
+    the current one. A generation is never modified once it has been loaded so
+    a handle always sees a complete keytab, either the old or the new one.
+
+    The file is checked for changes, by its modification time, size and inode,
+    on :meth:`resolve` once ``check_interval`` seconds have passed since the
+    last check. If the reload fails, for example the file is being replaced,
+    the current generation is kept and the reload is tried again on the next
+    check. :meth:`refresh` can be used to reload the keytab straight away.
+
+    A ``MEMORY`` keytab only exists while there is an open handle to it. Use
+    :meth:`resolve` to get a handle to the current generation rather than
+    resolving :attr:`name` directly, the generation may have been replaced
+    and released in the meantime.
+
+    The cache can be shared between threads. It holds its own
+    :class:`krb5.Context` which is released with :meth:`close`.
+
+    Args:
+        name: The keytab to load, either ``FILE:<path>`` or a path.
+        check_interval: The seconds between checks for changes to the file.
+    """
+
+    def __init__(
+        self,
+        name: bytes,
+        check_interval: float = 5.0,
+    ) -> None:
+        self._path = _file_path(name, "keytab")
+        self.source = b"FILE:" + self._path
+        self.check_interval = check_interval
+        self._context = krb5.init_context()
+        self._load_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._current: typing.Optional[_KeyTabGeneration] = None
+        self._stat: typing.Optional[_StatKey] = None
+        self._last_check = 0.0
+
+        with self._load_lock:
+            self._reload()
+
+    def __enter__(self) -> KeyTabCache:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    @property
+    def name(self) -> bytes:
+        """The name of the current MEMORY keytab generation."""
+        return self._get_current().name
+
+    def resolve(
+        self,
+        context: krb5.Context,
+    ) -> krb5.KeyTab:
+        """Get a handle to the current keytab generation.
+
+        The returned handle keeps its generation alive and continues to
+        reference it after a newer generation has been loaded. Resolve the
+        keytab again to pick up any changes.
+
+        Args:
+            context: Krb5 context to resolve the keytab with.
+
+        Returns:
+            KeyTab: A handle to the current MEMORY keytab.
+        """
+        if time.monotonic() - self._last_check >= self.check_interval and self._load_lock.acquire(blocking=False):
+            # Only one thread reloads the keytab, the others continue to use
+            # the current generation in the meantime.
+            try:
+                if self._current is not None:
+                    self._refresh(False)
+            except (OSError, krb5.Krb5Error):
+                pass
+            finally:
+                self._load_lock.release()
+
+        with self._swap_lock:
+            return krb5.kt_resolve(context, self._get_current().name)
+
+    def refresh(
+        self,
+        force: bool = False,
+    ) -> bool:
+        """Reload the keytab if it has changed.
+
+        Checks the file for changes and loads the entries into a new
+        generation if it has changed or ``force`` is set. Unlike the automatic
+        checks done by :meth:`resolve`, any error that occurs while loading the
+        keytab is raised.
+
+        Args:
+            force: Reload the keytab even if the file has not changed.
+
+        Returns:
+            bool: Whether a new generation was loaded.
+        """
+        with self._load_lock:
+            self._get_current()
+            return self._refresh(force)
+
+    def close(self) -> None:
+        """Release the current generation and the context of the cache.
+
+        Any handles returned by :meth:`resolve` should be closed before the
+        cache. Calling ``close()`` more than once does nothing.
+        """
+        with self._load_lock, self._swap_lock:
+            current, self._current = self._current, None
+            if current is not None:
+                current.keytab.close()
+                self._context.close()
+
+    def _get_current(self) -> _KeyTabGeneration:
+        current = self._current
+        if current is None:
+            raise ValueError("KeyTabCache is closed")
+
+        return current
+
+    def _refresh(
+        self,
+        force: bool,
+    ) -> bool:
+        self._last_check = time.monotonic()
+        if not force and _stat_key(self._path) == self._stat:
+            return False
+
+        self._reload()
+        return True
+
+    def _reload(self) -> None:
+        # The stat before loading is stored so a change made while the file
+        # was being read is picked up by the next check.
+        stat = _stat_key(self._path)
+        ctx = self._context
+
+        name = b"MEMORY:krb5-keytab-cache-" + uuid.uuid4().hex.encode()
+        keytab = krb5.kt_resolve(ctx, name)
+        try:
+            with krb5.kt_resolve(ctx, self.source) as source:
+                for entry in source:
+                    krb5.kt_add_entry(ctx, keytab, entry.principal, entry.kvno, entry.timestamp, entry.key)
+        except BaseException:
+            keytab.close()
+            raise
+
+        # The previous generation is not closed explicitly, it is released
+        # once the handles returned by resolve() for it are gone.
+        with self._swap_lock:
+            self._current = _KeyTabGeneration(name, keytab)
+            self._stat = stat
+            self._last_check = time.monotonic()
+
+
+class WriteBackCCache:
+    """A FILE credential cache that is written back from a MEMORY cache.
+
+    The credentials are read from the ``FILE`` cache once into a new
+    ``MEMORY`` cache created with :meth:`krb5.cc_new_unique`. Credentials are
+    then stored in and retrieved from the ``MEMORY`` cache and the changes are
+    written back to the file by a background thread every ``flush_interval``
+    seconds, on :meth:`flush`, and on :meth:`close` which is also called when
+    the interpreter exits. The file is only written if the cache has changed
+    since it was last written.
+
+    By default the file is rewritten in place which leaves a partial cache if
+    the process is killed while the file is being written. With ``atomic``
+    the credentials are written to a temporary file in the same directory
+    which then replaces the cache file, the file always contains either the
+    previous or the new credentials. Changes that have not been flushed are
+    lost if the process is killed in either mode.
+
+    The methods use a context that is private to the cache and can be called
+    from multiple threads. Use :meth:`resolve` to get a handle to the
+    ``MEMORY`` cache for other APIs, any changes made through that handle are
+    only written back after :meth:`mark_dirty` is called.
+
+    Args:
+        name: The credential cache, either ``FILE:<path>`` or a path.
+        flush_interval: The seconds between writes to the file, set to
+            ``None`` to only write on :meth:`flush` and :meth:`close`.
+        atomic: Replace the file atomically when writing the credentials.
+    """
+
+    def __init__(
+        self,
+        name: bytes,
+        flush_interval: typing.Optional[float] = 30.0,
+        atomic: bool = False,
+    ) -> None:
+        self._path = _file_path(name, "credential cache")
+        self.source = b"FILE:" + self._path
+        self.flush_interval = flush_interval
+        self.atomic = atomic
+
+        self._context = krb5.init_context()
+        self._memory = krb5.cc_new_unique(self._context, b"MEMORY")
+        self._memory_name = b"MEMORY:" + krb5.cc_get_name(self._context, self._memory)
+
+        # Flushing uses its own context and handle to the MEMORY cache so the
+        # file can be written without blocking the callers.
+        self._flush_context = krb5.init_context()
+        self._flush_memory = krb5.cc_resolve(self._flush_context, self._memory_name)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._initialized = False
+        self._version = 0
+        self._flushed = 0
+
+        if os.path.exists(self._path):
+            with krb5.cc_resolve(self._context, self.source) as cache:
+                principal = krb5.cc_get_principal(self._context, cache)
+                krb5.cc_initialize(self._context, self._memory, principal)
+                krb5.cc_copy_creds(self._context, cache, self._memory)
+            self._initialized = True
+
+        self._stop = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._flush_loop,
+                name="krb5-ccache-write-back",
+                daemon=True,
+            )
+            self._thread.start()
+
+        atexit.register(self.close)
+
+    def __enter__(self) -> WriteBackCCache:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the cache has changes that have not been written back."""
+        return self._version != self._flushed
+
+    @property
+    def name(self) -> bytes:
+        """The name of the MEMORY credential cache."""
+        return self._memory_name
+
+    def initialize(
+        self,
+        principal: krb5.Principal,
+    ) -> None:
+        """Remove all the credentials and set the default principal.
+
+        Args:
+            principal: The default principal of the cache.
+        """
+        with self._lock:
+            self._ensure_open()
+            krb5.cc_initialize(self._context, self._memory, principal)
+            self._initialized = True
+            self._version += 1
+
+    def get_principal(self) -> krb5.Principal:
+        """Get the default principal of the cache.
+
+        Returns:
+            Principal: The default principal.
+        """
+        with self._lock:
+            self._ensure_open()
+            return krb5.cc_get_principal(self._context, self._memory)
+
+    def store_cred(
+        self,
+        creds: krb5.Creds,
+    ) -> None:
+        """Store the credentials in the cache.
+
+        Args:
+            creds: The credentials to store.
+        """
+        with self._lock:
+            self._ensure_open()
+            krb5.cc_store_cred(self._context, self._memory, creds)
+            self._version += 1
+
+    def retrieve_cred(
+        self,
+        flags: typing.Union[int, krb5.CredentialsRetrieveFlags],
+        mcreds: krb5.Creds,
+    ) -> krb5.Creds:
+        """Retrieve the credentials that match mcreds.
+
+        See :meth:`krb5.cc_retrieve_cred` for more details.
+
+        Args:
+            flags: Options to control how the credentials are matched.
+            mcreds: The credentials to match.
+
+        Returns:
+            Creds: The matched credentials.
+        """
+        with self._lock:
+            self._ensure_open()
+            return krb5.cc_retrieve_cred(self._context, self._memory, flags, mcreds)
+
+    def remove_cred(
+        self,
+        flags: typing.Union[int, krb5.CredentialsRetrieveFlags],
+        creds: krb5.Creds,
+    ) -> None:
+        """Remove the credentials that match creds.
+
+        See :meth:`krb5.cc_remove_cred` for more details.
+
+        Args:
+            flags: Options to control how the credentials are matched.
+            creds: The credentials to match.
+        """
+        with self._lock:
+            self._ensure_open()
+            krb5.cc_remove_cred(self._context, self._memory, flags, creds)
+            self._version += 1
+
+    def resolve(
+        self,
+        context: krb5.Context,
+    ) -> krb5.CCache:
+        """Get a handle to the MEMORY credential cache.
+
+        Call :meth:`mark_dirty` after any change made through the handle so it
+        is written back to the file.
+
+        Args:
+            context: Krb5 context to resolve the cache with.
+
+        Returns:
+            CCache: A handle to the MEMORY credential cache.
+        """
+        with self._lock:
+            self._ensure_open()
+            return krb5.cc_resolve(context, self._memory_name)
+
+    def mark_dirty(self) -> None:
+        """Mark the cache as changed so it is written on the next flush."""
+        with self._lock:
+            self._ensure_open()
+            self._initialized = True
+            self._version += 1
+
+    def flush(
+        self,
+        force: bool = False,
+    ) -> bool:
+        """Write the credentials back to the file.
+
+        Args:
+            force: Write the credentials even if the cache has not changed.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        with self._lock:
+            self._ensure_open()
+
+        return self._flush(force)
+
+    def close(self) -> None:
+        """Write any changes back to the file and release the MEMORY cache.
+
+        The MEMORY cache and the contexts of the cache are released even if
+        writing the changes fails, the error is raised afterwards. Calling
+        ``close()`` more than once does nothing.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        atexit.unregister(self.close)
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+        try:
+            self._flush(False)
+        finally:
+            with self._flush_lock, self._lock:
+                self._flush_memory.close()
+                krb5.cc_destroy(self._context, self._memory)
+                self._flush_context.close()
+                self._context.close()
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise ValueError("WriteBackCCache is closed")
+
+    def _flush_loop(self) -> None:
+        interval = typing.cast(float, self.flush_interval)
+        while not self._stop.wait(interval):
+            try:
+                self._flush(False)
+            except (OSError, krb5.Krb5Error):
+                # The changes are kept and written on the next attempt.
+                pass
+
+    def _flush(
+        self,
+        force: bool,
+    ) -> bool:
+        with self._flush_lock:
+            with self._lock:
+                version = self._version
+                if not self._initialized or (not force and version == self._flushed):
+                    return False
+
+            ctx = self._flush_context
+            principal = krb5.cc_get_principal(ctx, self._flush_memory)
+            if self.atomic:
+                fd, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(self._path) or b".",
+                    prefix=os.path.basename(self._path) + b".",
+                )
+                os.close(fd)
+                try:
+                    with krb5.cc_resolve(ctx, b"FILE:" + temp_path) as cache:
+                        krb5.cc_initialize(ctx, cache, principal)
+                        krb5.cc_copy_creds(ctx, self._flush_memory, cache)
+                    os.replace(temp_path, self._path)
+
+                except BaseException:
+                    try:
+                        os.unlink(temp_path)
+                    except FileNotFoundError:
+                        pass
+                    raise
+
+            else:
+                with krb5.cc_resolve(ctx, self.source) as cache:
+                    krb5.cc_initialize(ctx, cache, principal)
+                    krb5.cc_copy_creds(ctx, self._flush_memory, cache)
+
+            # Any change made while the file was written has a newer version
+            # and is written on the next flush.
+            self._flushed = version
+            return True
+
+
+class CollectionIndex:
+    """An index of the caches in a credential cache collection by principal.
+
+    Finding the cache of a principal with :meth:`krb5.cc_cache_match` opens
+    every cache in the collection until one matches. This index maps the
+    default principal of each cache in the collection, read once with
+    :meth:`krb5.cccol_iter`, to the name of the cache so the lookup does not
+    need to scan the collection.
+
+    The index is rebuilt once it is older than ``ttl`` seconds. For a ``DIR``
+    collection it is also rebuilt when the modification time of the directory
+    changes, which happens when a cache is added or removed. Reinitializing an
+    existing cache for another principal does not change the directory so
+    :meth:`resolve` checks the principal of the cache it opens and rebuilds
+    the index if it no longer matches.
+
+    The collection is the one of the default credential cache, or ``name`` if
+    set, of a context that is private to the index. The index can be shared
+    between threads.
+
+    Args:
+        name: The collection to index, defaults to the collection of the
+            default credential cache.
+        ttl: The seconds before the index is rebuilt, set to ``None`` to only
+            rebuild it on changes to a ``DIR`` collection or :meth:`refresh`.
+    """
+
+    def __init__(
+        self,
+        name: typing.Optional[bytes] = None,
+        ttl: typing.Optional[float] = 300.0,
+    ) -> None:
+        self.ttl = ttl
+        self._context = krb5.init_context()
+        if name is not None:
+            krb5.cc_set_default_name(self._context, name)
+
+        default_name = krb5.cc_default_name(self._context)
+        self._directory: typing.Optional[bytes] = None
+        if default_name.startswith(b"DIR::"):
+            self._directory = os.path.dirname(default_name[5:])
+        elif default_name.startswith(b"DIR:"):
+            self._directory = default_name[4:]
+
+        self._lock = threading.Lock()
+        self._caches: typing.Dict[bytes, bytes] = {}
+        self._built = 0.0
+        self._mtime: typing.Optional[int] = None
+
+        with self._lock:
+            self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._caches)
+
+    def lookup(
+        self,
+        principal: krb5.Principal,
+    ) -> typing.Optional[bytes]:
+        """Get the name of the cache for the principal.
+
+        The name is taken from the index without checking the cache itself.
+
+        Args:
+            principal: The principal to find.
+
+        Returns:
+            Optional[bytes]: The full name of the cache or ``None`` if no cache
+            in the collection is for the principal.
+        """
+        if self._is_stale() and self._lock.acquire(blocking=False):
+            # Only one thread rebuilds the index, the others continue to use
+            # the current index in the meantime.
+            try:
+                if self._is_stale():
+                    self._rebuild()
+            except (OSError, krb5.Krb5Error):
+                pass
+            finally:
+                self._lock.release()
+
+        return self._caches.get(principal.name or b"")
+
+    def resolve(
+        self,
+        context: krb5.Context,
+        principal: krb5.Principal,
+    ) -> typing.Optional[krb5.CCache]:
+        """Open the cache for the principal.
+
+        Like :meth:`krb5.cc_cache_match` but uses the index to find the cache.
+        If the cache in the index is missing or is now for another principal
+        the index is rebuilt and the lookup tried again. A principal that is
+        not in the index does not rebuild it, that only happens once the index
+        is stale.
+
+        Args:
+            context: Krb5 context to resolve the cache with.
+            principal: The principal to find.
+
+        Returns:
+            Optional[CCache]: The opened cache or ``None`` if no cache in the
+            collection is for the principal.
+        """
+        for attempt in range(2):
+            if attempt:
+                # Only a stale entry in the index gets here.
+                self.refresh(force=True)
+
+            name = self.lookup(principal)
+            if name is None:
+                return None
+
+            cache = krb5.cc_resolve(context, name)
+            try:
+                cache_principal = krb5.cc_get_principal(context, cache)
+            except krb5.Krb5Error:
+                cache.close()
+                continue
+
+            if cache_principal.name == principal.name:
+                return cache
+            cache.close()
+
+        return None
+
+    def refresh(
+        self,
+        force: bool = False,
+    ) -> bool:
+        """Rebuild the index if it is stale.
+
+        Args:
+            force: Rebuild the index even if it is not stale.
+
+        Returns:
+            bool: Whether the index was rebuilt.
+        """
+        with self._lock:
+            if not force and not self._is_stale():
+                return False
+
+            self._rebuild()
+            return True
+
+    def _directory_mtime(self) -> typing.Optional[int]:
+        if self._directory is None:
+            return None
+
+        try:
+            return os.stat(self._directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _is_stale(self) -> bool:
+        if self.ttl is not None and time.monotonic() - self._built >= self.ttl:
+            return True
+
+        return self._directory is not None and self._directory_mtime() != self._mtime
+
+    def _rebuild(self) -> None:
+        # The mtime before the scan is stored so a cache added during the scan
+        # causes another rebuild.
+        mtime = self._directory_mtime()
+        ctx = self._context
+
+        caches: typing.Dict[bytes, bytes] = {}
+        for cache in krb5.cccol_iter(ctx):
+            with cache:
+                try:
+                    principal = krb5.cc_get_principal(ctx, cache)
+                except krb5.Krb5Error:
+                    continue
+
+                # The first cache for a principal is kept, the same one
+                # cc_cache_match would return.
+                name = krb5.cc_get_type(ctx, cache) + b":" + krb5.cc_get_name(ctx, cache)
+                caches.setdefault(principal.name or b"", name)
+
+        self._caches = caches
+        self._mtime = mtime
+        self._built = time.monotonic()
+
+
+class EtypeInfoCache:
+    """A cache of the etype-info of principals.
+
+    Every call to :meth:`krb5.get_etype_info` starts an AS exchange with the
+    KDC. This caches the result for each principal and set of options for
+    ``ttl`` seconds. A result without any etype-info, where the salt is
+    ``None``, is cached for ``negative_ttl`` seconds instead.
+
+    The options are part of the key, by default the same
+    :class:`krb5.GetInitCredsOpt` object must be used for a lookup to hit the
+    cache. Set ``fingerprint`` to a hashable value that identifies the
+    options to share the results between different option objects.
+
+    Changing the password of a principal can change its etype-info. Use
+    :meth:`set_password` or :meth:`set_password_using_ccache` to change the
+    password and invalidate the cached result, or call :meth:`invalidate`
+    after changing it in another way. A lookup that was started before the
+    principal was invalidated returns its result without caching it. The
+    cache can be shared between threads. This requires :meth:`krb5.get_etype_info` which is only
+    available with MIT krb5.
+
+    Args:
+        ttl: The seconds a result is cached for.
+        negative_ttl: The seconds a result without etype-info is cached for.
+        max_entries: The maximum number of results to cache, the oldest
+            result is removed once the cache is full.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        max_entries: int = 4096,
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: typing.Dict[typing.Tuple[bytes, typing.Hashable], _EtypeInfoEntry] = {}
+        # Bumped by invalidate so a lookup that overlaps it is not cached.
+        self._generation = 0
+        self._principal_generations: typing.Dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_etype_info(
+        self,
+        context: krb5.Context,
+        principal: krb5.Principal,
+        opt: typing.Optional[krb5.GetInitCredsOpt] = None,
+        fingerprint: typing.Optional[typing.Hashable] = None,
+    ) -> EtypeInfo:
+        """Get the etype-info of a principal.
+
+        Returns the cached result or calls :meth:`krb5.get_etype_info` if
+        there is no result for the principal and options or it has expired.
+
+        Args:
+            context: Krb5 context.
+            principal: Principal to fetch the information for.
+            opt: Options to use (e.g. for FAST armoring).
+            fingerprint: Identifies the options in the cache key instead of
+                the options object.
+
+        Returns:
+            EtypeInfo: The enctype, salt and s2kparams of the principal.
+        """
+        if fingerprint is None and opt is not None:
+            fingerprint = ("opt", id(opt))
+        name = principal.name or b""
+        key = (name, fingerprint)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > now:
+                return entry.info
+            generation = self._get_generation(name)
+
+        info = krb5.get_etype_info(context, principal, opt)
+        ttl = self.negative_ttl if info.salt is None else self.ttl
+
+        with self._lock:
+            if self._get_generation(name) != generation:
+                return info
+
+            self._entries.pop(key, None)
+            while self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = _EtypeInfoEntry(info, time.monotonic() + ttl, opt)
+
+        return info
+
+    def invalidate(
+        self,
+        principal: typing.Optional[krb5.Principal] = None,
+    ) -> None:
+        """Remove the cached results of a principal.
+
+        Args:
+            principal: The principal to remove the results for, every result
+                is removed if ``None``.
+        """
+        with self._lock:
+            if principal is None:
+                self._entries.clear()
+                self._generation += 1
+                self._principal_generations.clear()
+                return
+
+            name = principal.name or b""
+            for key in [k for k in self._entries if k[0] == name]:
+                del self._entries[key]
+            self._principal_generations[name] = self._principal_generations.get(name, 0) + 1
+
+    def set_password(
+        self,
+        context: krb5.Context,
+        creds: krb5.Creds,
+        newpw: bytes,
+        change_password_for: typing.Optional[krb5.Principal] = None,
+    ) -> krb5.SetPasswordResult:
+        """Set the password of a principal and invalidate its results.
+
+        See :meth:`krb5.set_password` for more details.
+
+        Args:
+            context: Krb5 context.
+            creds: Credentials for kadmin/changepw service.
+            newpw: New password.
+            change_password_for: `None` or the principal to set the password
+                for.
+
+        Returns:
+            SetPasswordResult: The result of the password change.
+        """
+        try:
+            return krb5.set_password(context, creds, newpw, change_password_for=change_password_for)
+        finally:
+            self.invalidate(change_password_for or creds.client)
+
+    def set_password_using_ccache(
+        self,
+        context: krb5.Context,
+        ccache: krb5.CCache,
+        newpw: bytes,
+        change_password_for: typing.Optional[krb5.Principal] = None,
+    ) -> krb5.SetPasswordResult:
+        """Set the password of a principal and invalidate its results.
+
+        See :meth:`krb5.set_password_using_ccache` for more details.
+
+        Args:
+            context: Krb5 context.
+            ccache: The cache with the credentials for kadmin/changepw.
+            newpw: New password.
+            change_password_for: `None` or the principal to set the password
+                for.
+
+        Returns:
+            SetPasswordResult: The result of the password change.
+        """
+        try:
+            return krb5.set_password_using_ccache(context, ccache, newpw, change_password_for=change_password_for)
+        finally:
+            self.invalidate(change_password_for or krb5.cc_get_principal(context, ccache))
+
+    def _get_generation(
+        self,
+        name: bytes,
+    ) -> typing.Tuple[int, int]:
+        return self._generation, self._principal_generations.get(name, 0)
+
+
+class FastArmorCache:
+    """A credential cache with a TGT that is kept fresh to armor FAST requests.
+
+    The armor TGT for ``principal`` is got with the key in ``keytab`` and
+    stored in a credential cache, by default a new ``MEMORY`` cache. Use
+    :meth:`apply`, or :meth:`template` with a
+    :class:`krb5.GetInitCredsOptTemplate`, to armor the requests made with
+    any number of :class:`krb5.GetInitCredsOpt` objects with the one TGT
+    instead of getting a new armor TGT for each batch of requests.
+
+    The TGT is replaced once it expires within ``renew_before`` seconds. This
+    is checked by a background thread every ``refresh_interval`` seconds and
+    by :meth:`apply` and :meth:`refresh`. A renewable TGT is renewed with a
+    TGS request, otherwise a new TGT is got with the keytab. The new TGT is
+    moved into the cache in one operation so requests that are started during
+    the refresh use either the previous or the new TGT. The options reference
+    the cache by name so requests made with options that were already
+    configured use the new TGT.
+
+    The cache can be shared between threads. FAST is only available with MIT
+    krb5.
+
+    Args:
+        principal: The principal of the armor TGT, usually the host principal.
+        keytab: The keytab with the key of the principal, defaults to the
+            default keytab.
+        name: The credential cache to store the armor TGT in, defaults to a
+            new ``MEMORY`` cache that is destroyed on :meth:`close`.
+        renew_before: The seconds before the TGT expires that it is replaced.
+        refresh_interval: The seconds between checks by the background thread,
+            set to ``None`` to only check on :meth:`apply` and
+            :meth:`refresh`.
+        fast_flags: The :class:`krb5.FastFlags` set with the armor cache.
+    """
+
+    def __init__(
+        self,
+        principal: bytes,
+        keytab: typing.Optional[bytes] = None,
+        name: typing.Optional[bytes] = None,
+        renew_before: float = 300.0,
+        refresh_interval: typing.Optional[float] = 60.0,
+        fast_flags: typing.Optional[int] = None,
+    ) -> None:
+        self.renew_before = renew_before
+        self.refresh_interval = refresh_interval
+        self.fast_flags = fast_flags
+
+        self._context = krb5.init_context()
+        self._principal = krb5.parse_name_flags(self._context, principal)
+        if keytab is None:
+            self._keytab = krb5.kt_default(self._context)
+        else:
+            self._keytab = krb5.kt_resolve(self._context, keytab)
+        self._opt = krb5.get_init_creds_opt_alloc(self._context)
+
+        self._owned = name is None
+        if name is None:
+            self._ccache = krb5.cc_new_unique(self._context, b"MEMORY")
+            name = b"MEMORY:" + krb5.cc_get_name(self._context, self._ccache)
+        else:
+            self._ccache = krb5.cc_resolve(self._context, name)
+        self._name = name
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._endtime = 0
+        self._renew_till = 0
+        self.refresh(force=True)
+
+        self._stop = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        if refresh_interval is not None:
+            self._thread = threading.Thread(
+                target=self._refresh_loop,
+                name="krb5-fast-armor",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def __enter__(self) -> FastArmorCache:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    @property
+    def name(self) -> bytes:
+        """The name of the credential cache with the armor TGT."""
+        return self._name
+
+    @property
+    def endtime(self) -> int:
+        """The time the current armor TGT expires."""
+        return self._endtime
+
+    def apply(
+        self,
+        context: krb5.Context,
+        opt: krb5.GetInitCredsOpt,
+    ) -> None:
+        """Armor the requests made with the options.
+
+        Sets the armor cache, and the ``fast_flags``, on the options. The TGT
+        is replaced first if it is about to expire. This can be used as the
+        ``configure_opt`` of :class:`krb5.verify.PasswordVerifier`.
+
+        Args:
+            context: Krb5 context.
+            opt: The options to armor.
+        """
+        self.refresh()
+        krb5.get_init_creds_opt_set_fast_ccache_name(context, opt, self._name)
+        if self.fast_flags is not None:
+            krb5.get_init_creds_opt_set_fast_flags(context, opt, self.fast_flags)
+
+    def template(
+        self,
+        base: typing.Optional[krb5.GetInitCredsOptTemplate] = None,
+    ) -> krb5.GetInitCredsOptTemplate:
+        """Create an options template that armors the requests.
+
+        Args:
+            base: The template with the other settings.
+
+        Returns:
+            GetInitCredsOptTemplate: The template with the armor cache set.
+        """
+        base = base or krb5.GetInitCredsOptTemplate()
+        return base.replace(fast_ccache_name=self._name, fast_flags=self.fast_flags)
+
+    def refresh(
+        self,
+        force: bool = False,
+    ) -> bool:
+        """Replace the armor TGT if it is about to expire.
+
+        Args:
+            force: Replace the TGT even if it is not about to expire.
+
+        Returns:
+            bool: Whether the TGT was replaced.
+        """
+        if not force and not self._expiring():
+            return False
+
+        with self._lock:
+            if self._closed:
+                raise ValueError("FastArmorCache is closed")
+
+            # Another thread may have replaced the TGT while this one waited.
+            if not force and not self._expiring():
+                return False
+
+            ctx = self._context
+            creds = None
+            if self._renew_till > time.time() + self.renew_before:
+                try:
+                    creds = krb5.get_renewed_creds(ctx, self._principal, self._ccache)
+                except krb5.Krb5Error:
+                    pass
+
+            if creds is None:
+                creds = krb5.get_init_creds_keytab(ctx, self._principal, self._opt, self._keytab)
+
+            new_cache = krb5.cc_new_unique(ctx, b"MEMORY")
+            try:
+                krb5.cc_initialize(ctx, new_cache, self._principal)
+                krb5.cc_store_cred(ctx, new_cache, creds)
+            except BaseException:
+                krb5.cc_destroy(ctx, new_cache)
+                raise
+            krb5.cc_move(ctx, new_cache, self._ccache)
+
+            self._endtime = creds.times.endtime
+            self._renew_till = creds.times.renew_till
+            return True
+
+    def close(self) -> None:
+        """Stop the background thread and release the armor cache.
+
+        A ``MEMORY`` cache created by this object is destroyed, a cache
+        provided with ``name`` is kept. The context of the object is closed
+        last. Calling ``close()`` more than once does
+        nothing.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+        with self._lock:
+            if self._owned:
+                krb5.cc_destroy(self._context, self._ccache)
+            else:
+                self._ccache.close()
+            self._keytab.close()
+            self._opt.close()
+            self._context.close()
+
+    def _expiring(self) -> bool:
+        return self._endtime - time.time() <= self.renew_before
+
+    def _refresh_loop(self) -> None:
+        interval = typing.cast(float, self.refresh_interval)
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except krb5.Krb5Error:
+                # The current TGT is kept and replaced on the next attempt.
+                pass
+            except ValueError:
+                return
@@ -0,0 +1,72 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""Live object and native memory accounting for the krb5 wrapper types.
+
+This module is opt-in and is not imported by ``krb5`` itself. Once
+:meth:`enable` is called every ``Context``, ``CCache``, ``KeyTab``,
+``KeyTabEntry``, ``Creds``, ``Principal`` and ``KeyBlock`` object that is
+created is tracked through a weak reference. :meth:`memory_stats` reports how
+many of them are still alive and the approximate number of bytes the
+Kerberos library has allocated for them, as reported by their ``__sizeof__``.
+Objects created before tracking was enabled are not counted.
+
+Example:
+    import krb5
+    import krb5.debug
+
+    krb5.debug.enable()
+    ...
+    print(krb5.debug.memory_stats())
+"""
+
+from __future__ import annotations
+
+import typing
+
+from krb5._debug import (
+    disable_tracking,
+    enable_tracking,
+    is_tracking,
+    tracked_objects,
+)
+
+
+class TypeMemoryStats(typing.NamedTuple):
+    """The live object count and native memory of a wrapper type."""
+
+    live: int
+    native_bytes: int
+
+
+def enable() -> None:
+    """Start tracking the wrapper objects created from now on."""
+    enable_tracking()
+
+
+def disable() -> None:
+    """Stop tracking the wrapper objects and forget the tracked objects."""
+    disable_tracking()
+
+
+def is_enabled() -> bool:
+    """Whether the wrapper objects are being tracked."""
+    return is_tracking()
+
+
+def memory_stats() -> typing.Dict[str, TypeMemoryStats]:
+    """Get the live object count and native bytes held per wrapper type.
+
+    The native bytes are the allocations owned by the objects outside of the
+    Python object itself, like the ticket, key and principal data. Objects
+    that borrow their data from another object report 0 bytes.
+
+    Returns:
+        Dict[str, TypeMemoryStats]: The stats keyed by the wrapper type name.
+    """
+    stats = {}
+    for obj_type, objects in tracked_objects().items():
+        native_bytes = sum(obj.__sizeof__() - object.__sizeof__(obj) for obj in objects)
+        stats[obj_type.__name__] = TypeMemoryStats(len(objects), native_bytes)
+
+    return stats
@@ -0,0 +1,373 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""Operational metrics for the krb5 API calls.
+
+This module is opt-in and is not imported by ``krb5`` itself. Calling
+:meth:`enable` wraps the credential, ccache and keytab functions exposed on
+the ``krb5`` namespace so every call is counted, timed and, on failure,
+recorded against the :class:`krb5.Krb5Error` error code. The counters are kept
+per thread so recording never takes a lock, the values are only summed when a
+snapshot or exposition is requested.
+
+Example:
+    import krb5
+    import krb5.metrics
+
+    krb5.metrics.enable()
+    ...
+    print(krb5.metrics.default_collector.exposition())
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+import typing
+
+import krb5
+
+DEFAULT_BUCKETS: typing.Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+TGT_ACQUISITION_OPERATIONS = frozenset(
+    [
+        "get_init_creds_keytab",
+        "get_init_creds_password",
+        "init_creds_get",
+    ]
+)
+RENEWAL_OPERATIONS = frozenset(["get_renewed_creds"])
+
+F = typing.TypeVar("F", bound=typing.Callable[..., typing.Any])
+
+
+class _Shard:
+    """Counters owned and written by a single thread."""
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_count = bucket_count
+        self.calls: typing.Dict[str, int] = {}
+        self.failures: typing.Dict[typing.Tuple[str, int], int] = {}
+        # operation -> [bucket counts..., +Inf count, sum]
+        self.durations: typing.Dict[str, typing.List[float]] = {}
+
+
+class MetricsCollector:
+    """Aggregates counters and latency histograms for krb5 operations.
+
+    Each thread records into its own shard so :meth:`record` is lock free. A
+    shard is registered once per thread under a lock and is kept after the
+    thread exits so the counters remain cumulative.
+
+    Args:
+        buckets: The upper bounds, in seconds, of the duration histogram.
+    """
+
+    def __init__(
+        self,
+        buckets: typing.Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: typing.List[_Shard] = []
+        self._lock = threading.Lock()
+        self._ccaches: typing.Dict[str, typing.Tuple[int, int]] = {}
+
+    def _get_shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard(len(self.buckets))
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+
+        return shard
+
+    def record(
+        self,
+        operation: str,
+        duration: float,
+        err_code: typing.Optional[int] = None,
+    ) -> None:
+        """Record the outcome of an operation.
+
+        Args:
+            operation: The name of the operation, e.g. ``cc_store_cred``.
+            duration: How long the operation took in seconds.
+            err_code: The Kerberos error code if the operation failed.
+        """
+        shard = self._get_shard()
+        shard.calls[operation] = shard.calls.get(operation, 0) + 1
+
+        if err_code is not None:
+            key = (operation, err_code)
+            shard.failures[key] = shard.failures.get(key, 0) + 1
+
+        hist = shard.durations.get(operation)
+        if hist is None:
+            hist = [0.0] * (shard.bucket_count + 2)
+            shard.durations[operation] = hist
+
+        for idx, bound in enumerate(self.buckets):
+            if duration <= bound:
+                hist[idx] += 1
+                break
+        else:
+            hist[shard.bucket_count] += 1
+        hist[-1] += duration
+
+    def observe_ccache(
+        self,
+        context: krb5.Context,
+        cache: krb5.CCache,
+        within: int = 300,
+    ) -> None:
+        """Record the size of a credential cache and how many tickets expire soon.
+
+        Iterates the credential cache and stores the number of entries and the
+        number of tickets that expire within the specified time as gauges for
+        that cache. Configuration entries are not counted.
+
+        Args:
+            context: Krb5 context.
+            cache: The credential cache to observe.
+            within: Tickets that expire within this many seconds are counted as
+                near expiry.
+        """
+        now = krb5.timeofday(context)
+        entries = 0
+        expiring = 0
+        for creds in cache:
+            if creds.server.realm == b"X-CACHECONF:":
+                continue
+
+            entries += 1
+            if creds.times.endtime - now <= within:
+                expiring += 1
+
+        with self._lock:
+            self._ccaches[str(cache)] = (entries, expiring)
+
+    def reset(self) -> None:
+        """Clear all the recorded values."""
+        with self._lock:
+            self._shards = []
+            self._ccaches = {}
+            self._local = threading.local()
+
+    def snapshot(self) -> typing.Dict[str, typing.Any]:
+        """Get the current values of all the metrics.
+
+        The returned dict contains the following keys:
+
+        - ``calls``: Number of calls per operation
+        - ``failures``: Number of failures per ``(operation, err_code)``
+        - ``tgt_acquisitions``: Successful initial credential acquisitions
+        - ``renewals``: Successful ticket renewals
+        - ``durations``: The histogram per operation as a dict with the
+          ``buckets`` (cumulative count per upper bound), ``count`` and ``sum``
+        - ``ccaches``: The ``entries`` and ``expiring`` gauges per ccache name
+
+        Returns:
+            Dict[str, Any]: The metric values.
+        """
+        with self._lock:
+            shards = list(self._shards)
+            ccaches = dict(self._ccaches)
+
+        calls: typing.Dict[str, int] = {}
+        failures: typing.Dict[typing.Tuple[str, int], int] = {}
+        raw_durations: typing.Dict[str, typing.List[float]] = {}
+        for shard in shards:
+            for op, count in list(shard.calls.items()):
+                calls[op] = calls.get(op, 0) + count
+
+            for key, count in list(shard.failures.items()):
+                failures[key] = failures.get(key, 0) + count
+
+            for op, hist in list(shard.durations.items()):
+                total = raw_durations.setdefault(op, [0.0] * len(hist))
+                for idx, value in enumerate(list(hist)):
+                    total[idx] += value
+
+        failed_ops: typing.Dict[str, int] = {}
+        for (op, _), count in failures.items():
+            failed_ops[op] = failed_ops.get(op, 0) + count
+
+        durations: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        for op, hist in raw_durations.items():
+            cumulative = 0
+            buckets: typing.Dict[float, int] = {}
+            for bound, value in zip(self.buckets, hist):
+                cumulative += int(value)
+                buckets[bound] = cumulative
+
+            durations[op] = {
+                "buckets": buckets,
+                "count": cumulative + int(hist[len(self.buckets)]),
+                "sum": hist[-1],
+            }
+
+        return {
+            "calls": calls,
+            "failures": failures,
+            "tgt_acquisitions": sum(
+                calls[op] - failed_ops.get(op, 0) for op in calls if op in TGT_ACQUISITION_OPERATIONS
+            ),
+            "renewals": sum(calls[op] - failed_ops.get(op, 0) for op in calls if op in RENEWAL_OPERATIONS),
+            "durations": durations,
+            "ccaches": {
+                name: {
+                    "entries": entries,
+                    "expiring": expiring,
+                }
+                for name, (entries, expiring) in ccaches.items()
+            },
+        }
+
+    def exposition(self) -> str:
+        """Get the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics in the text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines: typing.List[str] = []
+
+        def add_family(name: str, metric_type: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        add_family("krb5_tgt_acquisitions_total", "counter", "Successful initial credential acquisitions.")
+        lines.append(f"krb5_tgt_acquisitions_total {snapshot['tgt_acquisitions']}")
+
+        add_family("krb5_tgt_renewals_total", "counter", "Successful ticket renewals.")
+        lines.append(f"krb5_tgt_renewals_total {snapshot['renewals']}")
+
+        add_family("krb5_calls_total", "counter", "Number of krb5 API calls.")
+        for op, count in sorted(snapshot["calls"].items()):
+            lines.append(f"krb5_calls_total{_labels(operation=op)} {count}")
+
+        add_family("krb5_failures_total", "counter", "Number of krb5 API calls that raised a Krb5Error.")
+        for (op, err_code), count in sorted(snapshot["failures"].items()):
+            lines.append(f"krb5_failures_total{_labels(operation=op, err_code=str(err_code))} {count}")
+
+        add_family("krb5_call_duration_seconds", "histogram", "Duration of krb5 API calls.")
+        for op, hist in sorted(snapshot["durations"].items()):
+            for bound, count in hist["buckets"].items():
+                lines.append(f"krb5_call_duration_seconds_bucket{_labels(operation=op, le=repr(bound))} {count}")
+            lines.append(f"krb5_call_duration_seconds_bucket{_labels(operation=op, le='+Inf')} {hist['count']}")
+            lines.append(f"krb5_call_duration_seconds_count{_labels(operation=op)} {hist['count']}")
+            lines.append(f"krb5_call_duration_seconds_sum{_labels(operation=op)} {hist['sum']!r}")
+
+        add_family("krb5_ccache_entries", "gauge", "Number of credentials in a ccache.")
+        for name, values in sorted(snapshot["ccaches"].items()):
+            lines.append(f"krb5_ccache_entries{_labels(ccache=name)} {values['entries']}")
+
+        add_family("krb5_ccache_expiring_tickets", "gauge", "Number of tickets in a ccache near expiry.")
+        for name, values in sorted(snapshot["ccaches"].items()):
+            lines.append(f"krb5_ccache_expiring_tickets{_labels(ccache=name)} {values['expiring']}")
+
+        return "\n".join(lines) + "\n"
+
+    def instrument(
+        self,
+        func: F,
+        operation: typing.Optional[str] = None,
+    ) -> F:
+        """Wrap a function so each call is recorded in this collector.
+
+        Args:
+            func: The function to wrap.
+            operation: The operation name to record, defaults to the function
+                name.
+
+        Returns:
+            The wrapped function.
+        """
+        name = operation or func.__name__
+        record = self.record
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            start = perf_counter()
+            try:
+                res = func(*args, **kwargs)
+            except krb5.Krb5Error as e:
+                record(name, perf_counter() - start, e.err_code)
+                raise
+
+            record(name, perf_counter() - start)
+            return res
+
+        return typing.cast(F, wrapper)
+
+
+def _labels(**labels: str) -> str:
+    values = []
+    for k, v in labels.items():
+        v = v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        values.append(f'{k}="{v}"')
+
+    return "{" + ",".join(values) + "}"
+
+
+def _instrumented_names() -> typing.List[str]:
+    names = []
+    for name in krb5.__all__:
+        if name in TGT_ACQUISITION_OPERATIONS or name in RENEWAL_OPERATIONS:
+            names.append(name)
+
+        elif name.startswith("cc_") or name.startswith("kt_"):
+            names.append(name)
+
+    return names
+
+
+default_collector = MetricsCollector()
+_enable_lock = threading.Lock()
+_originals: typing.Dict[str, typing.Any] = {}
+
+
+def enable(
+    collector: typing.Optional[MetricsCollector] = None,
+) -> MetricsCollector:
+    """Start recording metrics for the krb5 API calls.
+
+    Replaces the credential acquisition, renewal, ``cc_*`` and ``kt_*``
+    functions on the ``krb5`` namespace with wrappers that record each call in
+    the collector. Only lookups done through the ``krb5`` namespace after this
+    is called are recorded, a function imported with ``from krb5 import ...``
+    before enabling the metrics is not affected.
+
+    Args:
+        collector: The collector to record into, defaults to
+            :data:`default_collector`.
+
+    Returns:
+        MetricsCollector: The collector that is recording the calls.
+    """
+    collector = collector or default_collector
+
+    with _enable_lock:
+        _disable()
+        for name in _instrumented_names():
+            func = getattr(krb5, name)
+            _originals[name] = func
+            setattr(krb5, name, collector.instrument(func, name))
+
+    return collector
+
+
+def disable() -> None:
+    """Stop recording metrics and restore the original krb5 functions."""
+    with _enable_lock:
+        _disable()
+
+
+def _disable() -> None:
+    for name, func in _originals.items():
+        setattr(krb5, name, func)
+    _originals.clear()
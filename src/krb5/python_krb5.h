@@ -24,3 +24,8 @@ typedef krb5_ticket_times pykrb5_ticket_times;
 #ifndef KRB5_TC_SUPPORTED_KTYPES
 #define KRB5_TC_SUPPORTED_KTYPES 0
 #endif
+
+// Heimdal does not define this, it returns KRB5_KT_NOTFOUND instead
+#ifndef KRB5_KT_KVNONOTFOUND
+#define KRB5_KT_KVNONOTFOUND KRB5_KT_NOTFOUND
+#endif
@@ -0,0 +1,487 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""Pooled TCP transport for the KDC exchanges.
+
+The ``get_init_creds_*`` and ``get_credentials`` style APIs let the Kerberos
+library open a new connection to the KDC for every request. This module drives
+the MIT step APIs :meth:`krb5.init_creds_step` and :meth:`krb5.tkt_creds_step`
+instead and sends the requests over TCP connections that are kept open and
+reused for later requests to the same KDC.
+
+Kerberos over TCP, RFC 4120 7.2.2, has no request identifiers so requests
+cannot be pipelined on a single connection. Concurrent exchanges each check out
+their own connection from the pool and return it once the reply has been read.
+Some KDCs close the connection after every reply, a pooled connection that was
+closed by the KDC is detected and discarded before it is reused and a request
+that fails on a reused connection is retried on a new one.
+
+The KDC addresses are not looked up through the krb5 configuration or DNS, the
+caller provides the addresses for each realm that is contacted.
+
+Example:
+    import krb5
+    import krb5.transport
+
+    pool = krb5.transport.KdcConnectionPool({b"EXAMPLE.COM": [("kdc.example.com", 88)]})
+    ctx = krb5.init_context()
+    icc = krb5.init_creds_init(ctx, princ, opt)
+    krb5.init_creds_set_password(ctx, icc, b"password")
+    pool.init_creds_get(ctx, icc)
+    creds = krb5.init_creds_get_creds(ctx, icc)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import select
+import socket
+import struct
+import threading
+import time
+import typing
+
+import krb5
+
+KdcAddress = typing.Tuple[str, int]
+
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+_StepFunc = typing.Callable[[krb5.Context, typing.Any, typing.Optional[bytes]], typing.Any]
+
+
+class _PooledSocket(typing.NamedTuple):
+    sock: socket.socket
+    idle_since: float
+
+
+class _PooledStream(typing.NamedTuple):
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    idle_since: float
+
+
+def _exchange(
+    step: _StepFunc,
+    context: krb5.Context,
+    ctx: typing.Any,
+) -> typing.Generator[typing.Tuple[bytes, bytes], bytes, None]:
+    """Run the step function until it completes.
+
+    Yields the realm and the request to send to the KDC of that realm and
+    expects the reply to be sent back into the generator.
+    """
+    reply: typing.Optional[bytes] = None
+    while True:
+        res = step(context, ctx, reply)
+        if not res.continue_needed:
+            return
+
+        reply = yield res.realm, res.out_data
+
+
+def _unpack_length(header: bytes) -> int:
+    length = _LENGTH.unpack(header)[0]
+    if length & 0x80000000:
+        raise ConnectionError("KDC reply uses the reserved TCP length bit")
+    if length > MAX_MESSAGE_SIZE:
+        raise ConnectionError(f"KDC reply of {length} bytes exceeds the maximum of {MAX_MESSAGE_SIZE}")
+
+    return length
+
+
+class _BasePool:
+    def __init__(
+        self,
+        kdcs: typing.Mapping[bytes, typing.Sequence[KdcAddress]],
+        timeout: float = 10.0,
+        max_idle: int = 4,
+        idle_timeout: float = 60.0,
+    ) -> None:
+        self.kdcs = {realm: list(addresses) for realm, addresses in kdcs.items()}
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+
+    def _addresses(
+        self,
+        realm: bytes,
+    ) -> typing.List[KdcAddress]:
+        addresses = self.kdcs.get(realm)
+        if not addresses:
+            raise ConnectionError(f"No KDC address configured for realm {realm.decode('utf-8', errors='replace')}")
+
+        return addresses
+
+
+class KdcConnectionPool(_BasePool):
+    """A pool of persistent TCP connections to the KDCs for use with threads.
+
+    The pool can be shared between threads, each exchange uses its own
+    connection while it is in progress. The krb5 Context and step contexts
+    passed to :meth:`init_creds_get` and :meth:`tkt_creds_get` are not shared
+    and should be owned by the calling thread.
+
+    Args:
+        kdcs: The KDC ``(host, port)`` addresses for each realm, the
+            addresses are tried in order.
+        timeout: Timeout in seconds for connecting and for each request.
+        max_idle: The maximum number of idle connections kept per KDC.
+        idle_timeout: Idle connections older than this many seconds are
+            closed instead of being reused.
+    """
+
+    def __init__(
+        self,
+        kdcs: typing.Mapping[bytes, typing.Sequence[KdcAddress]],
+        timeout: float = 10.0,
+        max_idle: int = 4,
+        idle_timeout: float = 60.0,
+    ) -> None:
+        super().__init__(kdcs, timeout=timeout, max_idle=max_idle, idle_timeout=idle_timeout)
+        self._lock = threading.Lock()
+        self._idle: typing.Dict[KdcAddress, typing.Deque[_PooledSocket]] = collections.defaultdict(collections.deque)
+
+    def __enter__(self) -> KdcConnectionPool:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all the idle connections in the pool."""
+        with self._lock:
+            idle = [entry.sock for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+
+        for sock in idle:
+            sock.close()
+
+    def init_creds_get(
+        self,
+        context: krb5.Context,
+        ctx: krb5.InitCredsContext,
+    ) -> None:
+        """Acquire initial credentials using the pooled connections.
+
+        This is the equivalent of :meth:`krb5.init_creds_get`, the credentials
+        can be retrieved with :meth:`krb5.init_creds_get_creds`.
+
+        Args:
+            context: Krb5 context.
+            ctx: Initial credentials context.
+        """
+        self._run(_exchange(krb5.init_creds_step, context, ctx))
+
+    def tkt_creds_get(
+        self,
+        context: krb5.Context,
+        ctx: krb5.TktCredsContext,
+    ) -> None:
+        """Acquire a service ticket using the pooled connections.
+
+        This is the equivalent of :meth:`krb5.tkt_creds_get`, the credentials
+        can be retrieved with :meth:`krb5.tkt_creds_get_creds`.
+
+        Args:
+            context: Krb5 context.
+            ctx: TGS request context.
+        """
+        self._run(_exchange(krb5.tkt_creds_step, context, ctx))
+
+    def send(
+        self,
+        realm: bytes,
+        data: bytes,
+    ) -> bytes:
+        """Send a request to a KDC of the realm and return the reply.
+
+        Args:
+            realm: The realm of the KDC to send the request to.
+            data: The encoded KDC request.
+
+        Returns:
+            bytes: The encoded KDC reply.
+        """
+        last_exc: typing.Optional[Exception] = None
+        for address in self._addresses(realm):
+            entry = self._checkout(address)
+            if entry:
+                try:
+                    return self._request(address, entry.sock, data)
+                except OSError:
+                    # The KDC closed the pooled connection, retry on a new one.
+                    pass
+
+            try:
+                sock = socket.create_connection(address, timeout=self.timeout)
+            except OSError as e:
+                last_exc = e
+                continue
+
+            try:
+                return self._request(address, sock, data)
+            except OSError as e:
+                last_exc = e
+
+        raise ConnectionError(
+            f"Cannot contact any KDC for realm {realm.decode('utf-8', errors='replace')}"
+        ) from last_exc
+
+    def _run(
+        self,
+        exchange: typing.Generator[typing.Tuple[bytes, bytes], bytes, None],
+    ) -> None:
+        try:
+            realm, data = next(exchange)
+            while True:
+                realm, data = exchange.send(self.send(realm, data))
+        except StopIteration:
+            pass
+
+    def _request(
+        self,
+        address: KdcAddress,
+        sock: socket.socket,
+        data: bytes,
+    ) -> bytes:
+        try:
+            sock.settimeout(self.timeout)
+            sock.sendall(_LENGTH.pack(len(data)) + data)
+            length = _unpack_length(self._recv(sock, _LENGTH.size))
+            reply = self._recv(sock, length)
+        except BaseException:
+            sock.close()
+            raise
+
+        self._checkin(address, sock)
+        return reply
+
+    def _recv(
+        self,
+        sock: socket.socket,
+        length: int,
+    ) -> bytes:
+        buffer = bytearray(length)
+        view = memoryview(buffer)
+        while view:
+            read = sock.recv_into(view)
+            if not read:
+                raise ConnectionResetError("KDC closed the connection")
+            view = view[read:]
+
+        return bytes(buffer)
+
+    def _checkout(
+        self,
+        address: KdcAddress,
+    ) -> typing.Optional[_PooledSocket]:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                idle = self._idle.get(address)
+                if not idle:
+                    return None
+                entry = idle.pop()
+
+            # An idle connection should have nothing to read, if it is
+            # readable the KDC has closed it.
+            if now - entry.idle_since > self.idle_timeout or select.select([entry.sock], [], [], 0)[0]:
+                entry.sock.close()
+                continue
+
+            return entry
+
+    def _checkin(
+        self,
+        address: KdcAddress,
+        sock: socket.socket,
+    ) -> None:
+        with self._lock:
+            idle = self._idle[address]
+            if len(idle) < self.max_idle:
+                idle.append(_PooledSocket(sock, time.monotonic()))
+                return
+
+        sock.close()
+
+
+class AsyncKdcConnectionPool(_BasePool):
+    """A pool of persistent TCP connections to the KDCs for use with asyncio.
+
+    The pool is bound to the event loop it is first used on. The step calls
+    are run on the event loop thread, they do not perform any network IO but
+    can spend some time deriving the client key with a password.
+
+    Args:
+        kdcs: The KDC ``(host, port)`` addresses for each realm, the
+            addresses are tried in order.
+        timeout: Timeout in seconds for connecting and for each request.
+        max_idle: The maximum number of idle connections kept per KDC.
+        idle_timeout: Idle connections older than this many seconds are
+            closed instead of being reused.
+    """
+
+    def __init__(
+        self,
+        kdcs: typing.Mapping[bytes, typing.Sequence[KdcAddress]],
+        timeout: float = 10.0,
+        max_idle: int = 4,
+        idle_timeout: float = 60.0,
+    ) -> None:
+        super().__init__(kdcs, timeout=timeout, max_idle=max_idle, idle_timeout=idle_timeout)
+        self._idle: typing.Dict[KdcAddress, typing.Deque[_PooledStream]] = collections.defaultdict(collections.deque)
+
+    async def __aenter__(self) -> AsyncKdcConnectionPool:
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all the idle connections in the pool."""
+        idle = [entry.writer for entries in self._idle.values() for entry in entries]
+        self._idle.clear()
+
+        for writer in idle:
+            writer.close()
+        for writer in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def init_creds_get(
+        self,
+        context: krb5.Context,
+        ctx: krb5.InitCredsContext,
+    ) -> None:
+        """Acquire initial credentials using the pooled connections.
+
+        This is the equivalent of :meth:`krb5.init_creds_get`, the credentials
+        can be retrieved with :meth:`krb5.init_creds_get_creds`.
+
+        Args:
+            context: Krb5 context.
+            ctx: Initial credentials context.
+        """
+        await self._run(_exchange(krb5.init_creds_step, context, ctx))
+
+    async def tkt_creds_get(
+        self,
+        context: krb5.Context,
+        ctx: krb5.TktCredsContext,
+    ) -> None:
+        """Acquire a service ticket using the pooled connections.
+
+        This is the equivalent of :meth:`krb5.tkt_creds_get`, the credentials
+        can be retrieved with :meth:`krb5.tkt_creds_get_creds`.
+
+        Args:
+            context: Krb5 context.
+            ctx: TGS request context.
+        """
+        await self._run(_exchange(krb5.tkt_creds_step, context, ctx))
+
+    async def send(
+        self,
+        realm: bytes,
+        data: bytes,
+    ) -> bytes:
+        """Send a request to a KDC of the realm and return the reply.
+
+        Args:
+            realm: The realm of the KDC to send the request to.
+            data: The encoded KDC request.
+
+        Returns:
+            bytes: The encoded KDC reply.
+        """
+        last_exc: typing.Optional[Exception] = None
+        for address in self._addresses(realm):
+            entry = self._checkout(address)
+            if entry:
+                try:
+                    return await self._request(address, entry.reader, entry.writer, data)
+                except (OSError, asyncio.IncompleteReadError):
+                    # The KDC closed the pooled connection, retry on a new one.
+                    pass
+
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(*address), self.timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                last_exc = e
+                continue
+
+            try:
+                return await self._request(address, reader, writer, data)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                last_exc = e
+
+        raise ConnectionError(
+            f"Cannot contact any KDC for realm {realm.decode('utf-8', errors='replace')}"
+        ) from last_exc
+
+    async def _run(
+        self,
+        exchange: typing.Generator[typing.Tuple[bytes, bytes], bytes, None],
+    ) -> None:
+        try:
+            realm, data = next(exchange)
+            while True:
+                realm, data = exchange.send(await self.send(realm, data))
+        except StopIteration:
+            pass
+
+    async def _request(
+        self,
+        address: KdcAddress,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        data: bytes,
+    ) -> bytes:
+        async def request() -> bytes:
+            writer.write(_LENGTH.pack(len(data)) + data)
+            await writer.drain()
+            length = _unpack_length(await reader.readexactly(_LENGTH.size))
+            return await reader.readexactly(length)
+
+        try:
+            reply = await asyncio.wait_for(request(), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+
+        self._checkin(address, reader, writer)
+        return reply
+
+    def _checkout(
+        self,
+        address: KdcAddress,
+    ) -> typing.Optional[_PooledStream]:
+        now = time.monotonic()
+        idle = self._idle.get(address)
+        while idle:
+            entry = idle.pop()
+            if now - entry.idle_since > self.idle_timeout or entry.reader.at_eof() or entry.writer.is_closing():
+                entry.writer.close()
+                continue
+
+            return entry
+
+        return None
+
+    def _checkin(
+        self,
+        address: KdcAddress,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        idle = self._idle[address]
+        if len(idle) < self.max_idle:
+            idle.append(_PooledStream(reader, writer, time.monotonic()))
+        else:
+            writer.close()
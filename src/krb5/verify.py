@@ -0,0 +1,265 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+"""Password verification with the KDC.
+
+A password is verified by getting initial credentials for the user with
+:meth:`krb5.get_init_creds_password` and then verifying those credentials with
+:meth:`krb5.verify_init_creds` and a service keytab. The second step is needed
+to authenticate a user, without it anyone who can spoof the KDC can return
+credentials for any password.
+
+The :class:`PasswordVerifier` keeps a pool of contexts, each with its own
+:class:`krb5.GetInitCredsOpt`, and loads a ``FILE`` keytab once into memory
+so the setup is not repeated for every verification. The verifications can be
+run on the calling thread, on the bounded thread pool of the verifier or from
+``asyncio``.
+
+Example:
+    import krb5.verify
+
+    with krb5.verify.PasswordVerifier(b"FILE:/etc/krb5.keytab") as verifier:
+        res = verifier.verify(b"user@EXAMPLE.COM", b"password")
+        if res.verified:
+            ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import typing
+
+import krb5
+import krb5.caching
+
+
+class VerifyResult(typing.NamedTuple):
+    """The result of a password verification."""
+
+    username: bytes
+    """The username that was verified."""
+
+    verified: bool
+    """Whether the password was verified."""
+
+    duration: float
+    """The seconds the verification took."""
+
+    error: typing.Optional[krb5.Krb5Error]
+    """The error that failed the verification."""
+
+
+class _Worker:
+    def __init__(
+        self,
+        context: krb5.Context,
+        opt: krb5.GetInitCredsOpt,
+        server: typing.Optional[krb5.Principal],
+        keytab: typing.Optional[krb5.KeyTab],
+    ) -> None:
+        self.context = context
+        self.opt = opt
+        self.server = server
+        self.keytab = keytab
+
+    def close(self) -> None:
+        if self.keytab is not None:
+            self.keytab.close()
+        self.opt.close()
+        self.context.close()
+
+
+class PasswordVerifier:
+    """Verifies passwords with the KDC and a service keytab.
+
+    Each verification gets initial credentials for the user with the password
+    and verifies them with :meth:`krb5.verify_init_creds` and the key of
+    ``server`` in the keytab. A ``FILE`` keytab is loaded into memory with
+    :class:`krb5.caching.KeyTabCache` and reloaded when the file changes.
+
+    A verification uses a context, with its own options and keytab handle,
+    from a pool that is shared between threads. ``configure_opt`` is called
+    once for the options of each new context to set the options used for the
+    initial credentials. :meth:`submit`, :meth:`verify_many` and
+    :meth:`averify` run the verifications on a thread pool of ``max_workers``
+    threads owned by the verifier.
+
+    Args:
+        keytab: The keytab with the key of the server.
+        server: The service principal to verify the credentials with,
+            defaults to the host principal of the local host.
+        max_workers: The number of threads used to run the verifications and
+            the number of idle contexts that are kept.
+        configure_opt: Called with a new context and options to configure the
+            options.
+        check_interval: The seconds between checks for changes to a ``FILE``
+            keytab.
+    """
+
+    def __init__(
+        self,
+        keytab: bytes,
+        server: typing.Optional[bytes] = None,
+        max_workers: int = 8,
+        configure_opt: typing.Optional[typing.Callable[[krb5.Context, krb5.GetInitCredsOpt], None]] = None,
+        check_interval: float = 5.0,
+    ) -> None:
+        self.keytab = keytab
+        self.server = server
+        self.max_workers = max_workers
+        self._configure_opt = configure_opt
+
+        self._kt_cache: typing.Optional[krb5.caching.KeyTabCache] = None
+        kt_type, sep, _ = keytab.partition(b":")
+        if not sep or kt_type == b"FILE":
+            self._kt_cache = krb5.caching.KeyTabCache(keytab, check_interval=check_interval)
+
+        self._lock = threading.Lock()
+        self._idle: typing.List[_Worker] = []
+        self._closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="krb5-verify",
+        )
+
+    def __enter__(self) -> PasswordVerifier:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def verify(
+        self,
+        username: bytes,
+        password: bytes,
+    ) -> VerifyResult:
+        """Verify the password of a user on the calling thread.
+
+        Args:
+            username: The principal name of the user.
+            password: The password to verify.
+
+        Returns:
+            VerifyResult: The result of the verification, a failed
+            verification does not raise an exception.
+        """
+        start = time.perf_counter()
+        worker = self._checkout()
+        error = None
+        try:
+            context = worker.context
+            principal = krb5.parse_name_flags(context, username)
+            creds = krb5.get_init_creds_password(context, principal, worker.opt, password)
+
+            if self._kt_cache is not None:
+                # Picks up the latest copy of the keytab for every verification.
+                with self._kt_cache.resolve(context) as keytab:
+                    krb5.verify_init_creds(context, creds, worker.server, keytab, ap_req_nofail=True)
+            else:
+                krb5.verify_init_creds(context, creds, worker.server, worker.keytab, ap_req_nofail=True)
+
+        except krb5.Krb5Error as e:
+            error = e
+
+        finally:
+            self._checkin(worker)
+
+        return VerifyResult(username, error is None, time.perf_counter() - start, error)
+
+    def submit(
+        self,
+        username: bytes,
+        password: bytes,
+    ) -> concurrent.futures.Future[VerifyResult]:
+        """Verify the password of a user on the thread pool.
+
+        Args:
+            username: The principal name of the user.
+            password: The password to verify.
+
+        Returns:
+            Future[VerifyResult]: The future for the result.
+        """
+        return self._executor.submit(self.verify, username, password)
+
+    def verify_many(
+        self,
+        credentials: typing.Iterable[typing.Tuple[bytes, bytes]],
+    ) -> typing.List[VerifyResult]:
+        """Verify the passwords of multiple users on the thread pool.
+
+        Args:
+            credentials: The username and password of each user.
+
+        Returns:
+            List[VerifyResult]: The results in the same order as the
+            credentials.
+        """
+        return list(self._executor.map(lambda c: self.verify(*c), credentials))
+
+    async def averify(
+        self,
+        username: bytes,
+        password: bytes,
+    ) -> VerifyResult:
+        """Verify the password of a user on the thread pool from asyncio.
+
+        Args:
+            username: The principal name of the user.
+            password: The password to verify.
+
+        Returns:
+            VerifyResult: The result of the verification.
+        """
+        return await asyncio.wrap_future(self.submit(username, password))
+
+    def close(self) -> None:
+        """Wait for the pending verifications and release the contexts.
+
+        Calling ``close()`` more than once does nothing.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+        if self._kt_cache is not None:
+            self._kt_cache.close()
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise ValueError("PasswordVerifier is closed")
+
+            if self._idle:
+                return self._idle.pop()
+
+        context = krb5.init_context()
+        opt = krb5.get_init_creds_opt_alloc(context)
+        if self._configure_opt is not None:
+            self._configure_opt(context, opt)
+
+        server = None if self.server is None else krb5.parse_name_flags(context, self.server)
+        keytab = None if self._kt_cache is not None else krb5.kt_resolve(context, self.keytab)
+
+        return _Worker(context, opt, server, keytab)
+
+    def _checkin(
+        self,
+        worker: _Worker,
+    ) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_workers:
+                self._idle.append(worker)
+                return
+
+        worker.close()
@@ -0,0 +1,322 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import os
+import pathlib
+import time
+import typing
+
+import k5test
+import pytest
+
+import krb5
+import krb5.caching
+
+
+def test_keytab_cache(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    kt_name = f"FILE:{tmp_path / 'keytab'}".encode()
+    kt = krb5.kt_resolve(ctx, kt_name)
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    krb5.kt_add_entry(ctx, kt, princ, 1, 0, key_block)
+
+    with krb5.caching.KeyTabCache(kt_name, check_interval=0) as kt_cache:
+        assert kt_cache.source == kt_name
+        first_name = kt_cache.name
+        assert first_name.startswith(b"MEMORY:")
+
+        first = kt_cache.resolve(ctx)
+        assert [e.kvno for e in first] == [1]
+        assert kt_cache.refresh() is False
+        assert kt_cache.name == first_name
+
+        krb5.kt_add_entry(ctx, kt, princ, 2, 0, key_block)
+        # Ensures the change is detected on filesystems with a coarse mtime.
+        os.utime(tmp_path / "keytab", ns=(0, 0))
+
+        second = kt_cache.resolve(ctx)
+        assert kt_cache.name != first_name
+        assert krb5.kt_get_entry(ctx, second, princ).kvno == 2
+
+        # The existing handle still references the previous generation.
+        assert [e.kvno for e in first] == [1]
+        first.close()
+        second.close()
+
+        assert kt_cache.refresh(force=True) is True
+
+    with pytest.raises(ValueError, match="KeyTabCache is closed"):
+        kt_cache.resolve(ctx)
+    kt_cache.close()
+
+
+def test_keytab_cache_not_file() -> None:
+    with pytest.raises(ValueError, match="Cannot cache MEMORY keytab, only FILE is supported"):
+        krb5.caching.KeyTabCache(b"MEMORY:keytab")
+
+
+def test_write_back_ccache(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+    cc_path = tmp_path / "ccache"
+    cc_name = f"FILE:{cc_path}".encode()
+
+    with krb5.caching.WriteBackCCache(cc_name, flush_interval=None) as cc_cache:
+        assert cc_cache.name.startswith(b"MEMORY:")
+        assert cc_cache.flush() is False
+
+        cc_cache.initialize(princ)
+        cc_cache.store_cred(creds)
+        assert cc_cache.dirty
+        assert not cc_path.exists()
+        assert cc_cache.get_principal().name == princ.name
+        assert cc_cache.retrieve_cred(0, creds).server.name == creds.server.name
+
+        assert cc_cache.flush() is True
+        assert not cc_cache.dirty
+        assert cc_cache.flush() is False
+
+    cc = krb5.cc_resolve(ctx, cc_name)
+    assert krb5.cc_get_principal(ctx, cc).name == princ.name
+    assert krb5.cc_retrieve_cred(ctx, cc, 0, creds).server.name == creds.server.name
+
+    with pytest.raises(ValueError, match="WriteBackCCache is closed"):
+        cc_cache.store_cred(creds)
+    cc_cache.close()
+
+    for cache_ctx in [cc_cache._context, cc_cache._flush_context]:
+        with pytest.raises(ValueError, match="Context is closed"):
+            krb5.get_default_realm(cache_ctx)
+
+
+def test_write_back_ccache_atomic(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+    cc_path = tmp_path / "ccache"
+    cc_name = f"FILE:{cc_path}".encode()
+
+    cc = krb5.cc_resolve(ctx, cc_name)
+    krb5.cc_initialize(ctx, cc, princ)
+    krb5.cc_store_cred(ctx, cc, creds)
+    inode = cc_path.stat().st_ino
+
+    with krb5.caching.WriteBackCCache(cc_name, flush_interval=0.05, atomic=True) as cc_cache:
+        # The existing credentials are loaded from the file.
+        assert cc_cache.retrieve_cred(0, creds).server.name == creds.server.name
+        assert not cc_cache.dirty
+
+        cc_cache.initialize(princ)
+        for _ in range(100):
+            if not cc_cache.dirty:
+                break
+            time.sleep(0.05)
+        assert not cc_cache.dirty
+
+    assert cc_path.stat().st_ino != inode
+    assert krb5.cc_try_retrieve_cred(ctx, cc, 0, creds) is None
+    assert [p.name for p in tmp_path.iterdir()] == ["ccache"]
+
+
+def test_write_back_ccache_not_file() -> None:
+    with pytest.raises(ValueError, match="Cannot cache MEMORY credential cache, only FILE is supported"):
+        krb5.caching.WriteBackCCache(b"MEMORY:ccache")
+
+
+def test_collection_index(realm: k5test.K5Realm, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    if realm.provider.lower() == "heimdal":
+        pytest.skip("Current Heimdal releases do not handle DIR subsidiary caches")
+
+    ctx = krb5.init_context()
+    admin_princ = krb5.parse_name_flags(ctx, realm.admin_princ.encode())
+    user_princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+
+    admin_ccache = krb5.cc_resolve(ctx, b"DIR:" + bytes(tmp_path))
+    krb5.cc_initialize(ctx, admin_ccache, admin_princ)
+
+    index = krb5.caching.CollectionIndex(b"DIR:" + bytes(tmp_path), ttl=None)
+    assert len(index) == 1
+    assert index.lookup(admin_princ) == b"DIR::" + bytes(tmp_path / "tkt")
+    assert index.lookup(user_princ) is None
+    assert index.refresh() is False
+
+    # A principal without a cache does not rebuild an index that is current.
+    with monkeypatch.context() as m:
+        m.setattr(krb5, "cccol_iter", lambda context: pytest.fail("index was rebuilt"))
+        assert index.resolve(ctx, user_princ) is None
+
+    user_ccache = krb5.cc_resolve(ctx, b"DIR::" + bytes(tmp_path / "tkt-user"))
+    krb5.cc_initialize(ctx, user_ccache, user_princ)
+    # Ensures the change is detected on filesystems with a coarse mtime.
+    os.utime(tmp_path, ns=(0, 0))
+
+    assert index.lookup(user_princ) == b"DIR::" + bytes(tmp_path / "tkt-user")
+    assert len(index) == 2
+
+    # Reinitializing a cache does not change the directory, resolve detects
+    # the mismatch and rebuilds the index.
+    krb5.cc_initialize(ctx, user_ccache, admin_princ)
+    assert index.resolve(ctx, user_princ) is None
+
+    actual = index.resolve(ctx, admin_princ)
+    assert actual is not None
+    assert actual.principal
+    assert actual.principal.name == admin_princ.name
+
+
+@pytest.mark.requires_api("get_etype_info")
+def test_etype_info_cache(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    user_princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    admin_princ = krb5.parse_name_flags(ctx, realm.admin_princ.encode())
+    etype_cache = krb5.caching.EtypeInfoCache()
+
+    info = etype_cache.get_etype_info(ctx, user_princ)
+    assert info == krb5.get_etype_info(ctx, user_princ)
+    assert etype_cache.get_etype_info(ctx, user_princ) is info
+    assert len(etype_cache) == 1
+
+    # The options are part of the key unless a fingerprint is provided.
+    opt1 = krb5.get_init_creds_opt_alloc(ctx)
+    opt2 = krb5.get_init_creds_opt_alloc(ctx)
+    assert etype_cache.get_etype_info(ctx, user_princ, opt1) is not info
+    assert len(etype_cache) == 2
+    from_opt = etype_cache.get_etype_info(ctx, user_princ, opt1, fingerprint="default")
+    assert etype_cache.get_etype_info(ctx, user_princ, opt2, fingerprint="default") is from_opt
+    assert len(etype_cache) == 3
+
+    etype_cache.get_etype_info(ctx, admin_princ)
+    etype_cache.invalidate(user_princ)
+    assert len(etype_cache) == 1
+    assert etype_cache.get_etype_info(ctx, user_princ) is not info
+
+    etype_cache.invalidate()
+    assert len(etype_cache) == 0
+
+    expiring_cache = krb5.caching.EtypeInfoCache(ttl=0, max_entries=1)
+    info = expiring_cache.get_etype_info(ctx, user_princ)
+    assert expiring_cache.get_etype_info(ctx, user_princ) is not info
+    expiring_cache.get_etype_info(ctx, admin_princ)
+    assert len(expiring_cache) == 1
+
+
+@pytest.mark.requires_api("get_etype_info")
+def test_etype_info_cache_negative_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    from krb5._creds_mit import EtypeInfo
+
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    results = [EtypeInfo(0, None, None), EtypeInfo(0, None, None), EtypeInfo(18, b"salt", None)]
+    calls = []
+
+    def get_etype_info(
+        context: krb5.Context,
+        principal: krb5.Principal,
+        opt: typing.Optional[krb5.GetInitCredsOpt] = None,
+    ) -> EtypeInfo:
+        calls.append(principal.name)
+        return results[len(calls) - 1]
+
+    monkeypatch.setattr(krb5, "get_etype_info", get_etype_info)
+
+    # A result without etype-info uses negative_ttl instead of ttl.
+    etype_cache = krb5.caching.EtypeInfoCache(ttl=300, negative_ttl=0)
+    assert etype_cache.get_etype_info(ctx, princ) is results[0]
+    assert etype_cache.get_etype_info(ctx, princ) is results[1]
+    assert etype_cache.get_etype_info(ctx, princ) is results[2]
+    assert etype_cache.get_etype_info(ctx, princ) is results[2]
+    assert len(calls) == 3
+
+    calls.clear()
+    etype_cache = krb5.caching.EtypeInfoCache(ttl=0, negative_ttl=300)
+    assert etype_cache.get_etype_info(ctx, princ) is results[0]
+    assert etype_cache.get_etype_info(ctx, princ) is results[0]
+    assert len(calls) == 1
+
+
+@pytest.mark.requires_api("get_etype_info")
+def test_etype_info_cache_invalidate_during_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    from krb5._creds_mit import EtypeInfo
+
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    etype_cache = krb5.caching.EtypeInfoCache()
+    invalidate: typing.List[typing.Optional[krb5.Principal]] = [princ, None]
+    calls = []
+
+    def get_etype_info(
+        context: krb5.Context,
+        principal: krb5.Principal,
+        opt: typing.Optional[krb5.GetInitCredsOpt] = None,
+    ) -> EtypeInfo:
+        # Another thread changes the password while the KDC is queried.
+        calls.append(principal.name)
+        if invalidate:
+            etype_cache.invalidate(invalidate.pop(0))
+        return EtypeInfo(18, b"salt", None)
+
+    monkeypatch.setattr(krb5, "get_etype_info", get_etype_info)
+
+    # The results of lookups that overlap invalidate are not cached.
+    etype_cache.get_etype_info(ctx, princ)
+    assert len(etype_cache) == 0
+    etype_cache.get_etype_info(ctx, princ)
+    assert len(etype_cache) == 0
+
+    info = etype_cache.get_etype_info(ctx, princ)
+    assert len(etype_cache) == 1
+    assert etype_cache.get_etype_info(ctx, princ) is info
+    assert len(calls) == 3
+
+
+@pytest.mark.requires_api("get_init_creds_opt_set_fast_ccache_name")
+def test_fast_armor_cache(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    password = realm.password("user").encode()
+
+    with krb5.caching.FastArmorCache(
+        realm.host_princ.encode(),
+        keytab=realm.keytab.encode(),
+        refresh_interval=None,
+        fast_flags=krb5.FastFlags.required,
+    ) as armor:
+        assert armor.name.startswith(b"MEMORY:")
+        endtime = armor.endtime
+        assert endtime > time.time()
+
+        armor_cc = krb5.cc_resolve(ctx, armor.name)
+        assert krb5.cc_get_principal(ctx, armor_cc).name == realm.host_princ.encode()
+
+        opt = krb5.get_init_creds_opt_alloc(ctx)
+        armor.apply(ctx, opt)
+        creds = krb5.get_init_creds_password(ctx, princ, opt, password)
+        assert creds.client.name == realm.user_princ.encode()
+
+        assert armor.refresh() is False
+        assert armor.refresh(force=True) is True
+        assert armor.endtime >= endtime
+
+        # Options configured before the refresh use the new TGT.
+        creds = krb5.get_init_creds_password(ctx, princ, opt, password)
+        assert creds.client.name == realm.user_princ.encode()
+
+        template = armor.template(krb5.GetInitCredsOptTemplate(forwardable=True))
+        assert template.settings["fast_ccache_name"] == armor.name
+        creds = krb5.get_init_creds_password(ctx, princ, template.opt, password)
+        assert creds.client.name == realm.user_princ.encode()
+        template.close()
+
+    with pytest.raises(krb5.Krb5Error):
+        krb5.cc_get_principal(ctx, armor_cc)
+
+    with pytest.raises(ValueError, match="FastArmorCache is closed"):
+        armor.refresh(force=True)
+    armor.close()
+
+    with pytest.raises(ValueError, match="Context is closed"):
+        krb5.get_default_realm(armor._context)
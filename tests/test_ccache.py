@@ -1,11 +1,14 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import asyncio
 import os
 import os.path
 import pathlib
 import platform
 import sys
+import threading
+import typing
 
 import k5test
 import pytest
@@ -52,6 +55,28 @@ def test_cc_destroy(tmpdir: pathlib.Path) -> None:
     assert cc.principal is None
 
 
+def test_cc_close(tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"name@REALM")
+    path = tmp_path / "ccache"
+
+    with krb5.cc_resolve(ctx, f"FILE:{path}".encode()) as cc:
+        krb5.cc_initialize(ctx, cc, princ)
+
+    assert repr(cc) == "CCache(NULL)"
+    assert cc.principal is None
+    assert list(cc) == []
+    with pytest.raises(ValueError, match="CCache is closed"):
+        krb5.cc_get_principal(ctx, cc)
+
+    cc.close()
+
+    # Closing the handle does not destroy the cache.
+    assert os.path.isfile(path)
+    cc = krb5.cc_resolve(ctx, f"FILE:{path}".encode())
+    assert krb5.cc_get_principal(ctx, cc).name == b"name@REALM"
+
+
 def test_cc_get_name(tmp_path: pathlib.Path) -> None:
     ctx = krb5.init_context()
 
@@ -333,3 +358,304 @@ def test_cc_retrieve_remove_cred(realm: k5test.K5Realm, tmp_path: pathlib.Path)
     msg_pattern = "Matching credential not found|End of credential cache reached|Did not find credential for"
     with pytest.raises(krb5.Krb5Error, match=msg_pattern):
         krb5.cc_retrieve_cred(ctx, cc, krb5.CredentialsRetrieveFlags.match_srv_nameonly, creds)
+
+
+def test_cc_try_retrieve_cred(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+
+    flags = krb5.CredentialsRetrieveFlags.match_srv_nameonly
+    assert krb5.cc_try_retrieve_cred(ctx, cc, flags, creds) is None
+
+    krb5.cc_store_cred(ctx, cc, creds)
+    actual = krb5.cc_try_retrieve_cred(ctx, cc, flags, creds)
+    assert isinstance(actual, krb5.Creds)
+    assert actual.ticket == creds.ticket
+
+
+def test_cc_try_retrieve_cred_failure(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    # A missing cache is a failure and not a miss.
+    cc = krb5.cc_resolve(ctx, f"FILE:{tmp_path / 'missing'}".encode())
+    with pytest.raises(krb5.Krb5Error):
+        krb5.cc_try_retrieve_cred(ctx, cc, krb5.CredentialsRetrieveFlags.none, creds)
+
+
+def test_cc_try_get_config(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+
+    assert krb5.cc_try_get_config(ctx, cc, None, b"Key") is None
+
+    krb5.cc_set_config(ctx, cc, None, b"Key", b"Value")
+    assert krb5.cc_try_get_config(ctx, cc, None, b"Key") == b"Value"
+
+
+def test_cc_find_expiring(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    password = realm.password("user").encode()
+    tgt = krb5.get_init_creds_password(ctx, princ, opt, password)
+
+    krb5.get_init_creds_opt_set_tkt_life(opt, 600)
+    service = krb5.get_init_creds_password(ctx, princ, opt, password, in_tkt_service=realm.host_princ.encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+    assert krb5.cc_find_expiring(ctx, cc, 3600) == []
+    assert krb5.cc_next_expiry(ctx, cc) is None
+
+    krb5.cc_set_config(ctx, cc, None, b"Key", b"Value")
+    krb5.cc_store_cred(ctx, cc, tgt)
+    krb5.cc_store_cred(ctx, cc, service)
+
+    assert krb5.cc_next_expiry(ctx, cc) == service.times.endtime
+
+    now = service.times.endtime - 60
+    actual = krb5.cc_find_expiring(ctx, cc, 120, now=now)
+    assert len(actual) == 1
+    assert actual[0].ticket == service.ticket
+
+    actual = krb5.cc_find_expiring(ctx, cc, 0, now=tgt.times.endtime)
+    assert [c.ticket for c in actual] == [tgt.ticket, service.ticket]
+
+    assert krb5.cc_find_expiring(ctx, cc, 0, now=now) == []
+
+
+def test_cc_compact(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    password = realm.password("user").encode()
+    tgt = krb5.get_init_creds_password(ctx, princ, opt, password)
+    service = krb5.get_init_creds_password(ctx, princ, opt, password, in_tkt_service=realm.host_princ.encode())
+
+    path = tmp_path / "ccache"
+    cc = krb5.cc_resolve(ctx, f"FILE:{path}".encode())
+    krb5.cc_initialize(ctx, cc, princ)
+    krb5.cc_set_config(ctx, cc, None, b"Key", b"Value")
+    krb5.cc_store_cred(ctx, cc, tgt)
+    krb5.cc_store_cred(ctx, cc, service)
+
+    actual = krb5.cc_compact(ctx, cc)
+    assert isinstance(actual, krb5.CCacheCompactResult)
+    assert actual.entries_kept == len(list(cc))
+    assert actual.entries_removed == 0
+    assert krb5.cc_get_config(ctx, cc, None, b"Key") == b"Value"
+    assert [c.ticket for c in cc if c.server.realm != b"X-CACHECONF:"] == [tgt.ticket, service.ticket]
+    assert sorted(os.listdir(tmp_path)) == ["ccache"]
+
+    if realm.provider.lower() == "heimdal" or os.environ.get("DEBIAN_VERSION", None) == "10":
+        # Removing credentials from a FILE ccache is not supported.
+        return
+
+    size = os.path.getsize(path)
+    krb5.cc_remove_cred(ctx, cc, krb5.CredentialsRetrieveFlags.match_srv_nameonly, service)
+
+    actual = krb5.cc_compact(ctx, cc)
+    assert actual.bytes_reclaimed > 0
+    assert os.path.getsize(path) == size - actual.bytes_reclaimed
+    assert [c.ticket for c in cc if c.server.realm != b"X-CACHECONF:"] == [tgt.ticket]
+
+
+def test_cc_compact_failed(tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    path = tmp_path / "ccache"
+    path.write_bytes(b"\x05\x04invalid")
+    cc = krb5.cc_resolve(ctx, f"FILE:{path}".encode())
+
+    with pytest.raises(krb5.Krb5Error):
+        krb5.cc_compact(ctx, cc)
+
+    assert sorted(os.listdir(tmp_path)) == ["ccache"]
+    assert path.read_bytes() == b"\x05\x04invalid"
+
+
+def test_cc_compact_not_file() -> None:
+    ctx = krb5.init_context()
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+
+    with pytest.raises(ValueError, match="Cannot compact MEMORY credential cache"):
+        krb5.cc_compact(ctx, cc)
+
+
+def test_cc_copy_creds_and_move(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    mem = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, mem, princ)
+    krb5.cc_store_cred(ctx, mem, creds)
+
+    copy = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, copy, princ)
+    krb5.cc_copy_creds(ctx, mem, copy)
+    assert [c.ticket for c in copy] == [creds.ticket]
+
+    path = tmp_path / "ccache"
+    file_cc = krb5.cc_resolve(ctx, f"FILE:{path}".encode())
+    krb5.cc_move(ctx, mem, file_cc)
+    assert repr(mem) == "CCache(NULL)"
+    assert krb5.cc_get_principal(ctx, file_cc).name == princ.name
+    assert [c.ticket for c in file_cc if c.server.realm != b"X-CACHECONF:"] == [creds.ticket]
+
+    # A move that fails before the source is destroyed leaves it open.
+    empty = krb5.cc_new_unique(ctx, b"MEMORY")
+    with pytest.raises(krb5.Krb5Error):
+        krb5.cc_move(ctx, empty, file_cc)
+    assert repr(empty) != "CCache(NULL)"
+    assert krb5.cc_get_principal(ctx, file_cc).name == princ.name
+    empty.close()
+
+
+def test_cc_copy_creds_matching(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    password = realm.password("user").encode()
+    tgt = krb5.get_init_creds_password(ctx, princ, opt, password)
+    service = krb5.get_init_creds_password(ctx, princ, opt, password, in_tkt_service=realm.host_princ.encode())
+
+    src = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, src, princ)
+    krb5.cc_set_config(ctx, src, None, b"Key", b"Value")
+    krb5.cc_store_cred(ctx, src, tgt)
+    krb5.cc_store_cred(ctx, src, service)
+
+    dst = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, dst, princ)
+    assert krb5.cc_copy_creds_matching(ctx, src, dst, server=service.server) == 1
+    assert [c.ticket for c in dst] == [service.ticket]
+
+    krb5.cc_initialize(ctx, dst, princ)
+    assert krb5.cc_copy_creds_matching(ctx, src, dst, realm=realm.realm.encode()) == 2
+    assert [c.ticket for c in dst] == [tgt.ticket, service.ticket]
+
+    assert krb5.cc_copy_creds_matching(ctx, src, dst, realm=b"OTHER.REALM") == 0
+
+
+def test_cc_shared_between_threads(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+    krb5.cc_store_cred(ctx, cc, creds)
+
+    errors = []
+
+    def worker() -> None:
+        try:
+            for _ in range(100):
+                assert len(list(cc)) == 1
+                krb5.cc_retrieve_cred(ctx, cc, krb5.CredentialsRetrieveFlags.none, creds)
+                assert str(cc.principal) == realm.user_princ
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+
+def test_cc_close_while_shared_between_threads() -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+
+    started = threading.Barrier(5)
+    errors: typing.List[Exception] = []
+
+    def worker() -> None:
+        started.wait()
+        try:
+            while True:
+                assert krb5.cc_get_principal(ctx, cc).name == princ.name
+                krb5.cc_set_config(ctx, cc, None, b"key", b"value")
+                assert krb5.cc_get_config(ctx, cc, None, b"key") == b"value"
+        except ValueError as e:
+            if str(e) != "CCache is closed":
+                errors.append(e)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+
+    started.wait()
+    cc.close()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+
+def test_cc_close_during_iteration(tmp_path: pathlib.Path) -> None:
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("Test requires /proc/self/fd to count the open files")
+
+    ctx = krb5.init_context()
+    cc = krb5.cc_resolve(ctx, f"FILE:{tmp_path / 'ccache'}".encode())
+    krb5.cc_initialize(ctx, cc, krb5.parse_name_flags(ctx, b"user@DOMAIN.COM"))
+    krb5.cc_set_config(ctx, cc, None, b"key1", b"value")
+    krb5.cc_set_config(ctx, cc, None, b"key2", b"value")
+    fds = len(os.listdir("/proc/self/fd"))
+
+    cc_iter = iter(cc)
+    next(cc_iter)
+    cc.close()
+
+    # Closing the cache ends the cursor and stops the iteration.
+    assert list(cc_iter) == []
+    assert len(os.listdir("/proc/self/fd")) == fds
+
+
+def test_cc_aiter(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+    for _ in range(5):
+        krb5.cc_store_cred(ctx, cc, creds)
+
+    async def main() -> None:
+        actual = [c async for c in krb5.cc_aiter(ctx, cc, chunk_size=2)]
+        assert [c.ticket for c in actual] == [c.ticket for c in cc]
+        assert actual[0].client.name == princ.name
+
+        aiter = krb5.cc_aiter(ctx, cc, chunk_size=2)
+        async for c in aiter:
+            assert c.ticket == creds.ticket
+            break
+        await aiter.aclose()
+
+    asyncio.run(main())
+
+    with pytest.raises(ValueError, match="chunk_size must be greater than 0"):
+        krb5.cc_aiter(ctx, cc, chunk_size=0)
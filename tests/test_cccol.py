@@ -1,6 +1,12 @@
 # Copyright: (c) 2022 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import asyncio
+import pathlib
+
+import k5test
+import pytest
+
 import krb5
 
 
@@ -23,3 +29,71 @@ def test_cccol_iter() -> None:
     assert mem_ccache.name == ccache.name
     assert mem_ccache.principal is not None
     assert mem_ccache.principal.name == ccache.principal.name
+
+
+def test_cccol_sweep(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    if realm.provider.lower() == "heimdal":
+        pytest.skip("Current Heimdal releases do not handle DIR subsidiary caches")
+
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    expired_ccache = krb5.cc_resolve(ctx, b"DIR:" + bytes(tmp_path))
+    krb5.cc_initialize(ctx, expired_ccache, princ)
+    krb5.cc_store_cred(ctx, expired_ccache, creds)
+    expired_name = b"DIR::" + bytes(tmp_path / "tkt")
+
+    empty_ccache = krb5.cc_resolve(ctx, b"DIR::" + bytes(tmp_path / "tkt-empty"))
+    krb5.cc_initialize(ctx, empty_ccache, princ)
+
+    config_ccache = krb5.cc_resolve(ctx, b"DIR::" + bytes(tmp_path / "tkt-config"))
+    krb5.cc_initialize(ctx, config_ccache, princ)
+    krb5.cc_set_config(ctx, config_ccache, None, b"key", b"value")
+
+    def context_factory() -> krb5.Context:
+        context = krb5.init_context()
+        krb5.cc_set_default_name(context, b"DIR:" + bytes(tmp_path))
+        return context
+
+    # The collection may also contain MEMORY caches from other tests.
+    now = creds.times.endtime + 10
+    actual = krb5.cccol_sweep(context_factory, dry_run=True, now=now)
+    assert actual.scanned >= 3
+    assert [n for n in actual.expired if n.startswith(b"DIR:")] == [expired_name]
+    assert actual.destroyed == []
+    assert actual.errors == []
+
+    actual = krb5.cccol_sweep(context_factory, max_age=20, dry_run=True, now=now)
+    assert [n for n in actual.expired if n.startswith(b"DIR:")] == []
+
+    # Caches with no credentials, or only config entries, are never expired.
+    actual = krb5.cccol_sweep(context_factory, dry_run=True, now=2**31 - 1)
+    assert [n for n in actual.expired if n.startswith(b"DIR:")] == [expired_name]
+
+    actual = krb5.cccol_sweep(
+        context_factory,
+        predicate=lambda c, cache: cache.name == b":" + bytes(tmp_path / "tkt"),
+        workers=2,
+        now=now,
+    )
+    assert actual.expired == [expired_name]
+    assert actual.destroyed == [expired_name]
+    assert not (tmp_path / "tkt").exists()
+    assert (tmp_path / "tkt-empty").exists()
+    assert (tmp_path / "tkt-config").exists()
+
+
+def test_cccol_aiter() -> None:
+    ctx = krb5.init_context()
+    ccache = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, ccache, krb5.parse_name_flags(ctx, b"username@DOMAIN.COM"))
+    krb5.cc_set_default_name(ctx, (ccache.cache_type or b"") + b":" + (ccache.name or b""))
+
+    async def main() -> None:
+        actual = [c async for c in krb5.cccol_aiter(ctx, chunk_size=1)]
+        assert [str(c) for c in actual] == [str(c) for c in krb5.cccol_iter(ctx)]
+        assert str(ccache) in [str(c) for c in actual]
+
+    asyncio.run(main())
@@ -2,6 +2,7 @@
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
 import os
+import pathlib
 import time
 
 import k5test
@@ -17,6 +18,47 @@ def test_init_context() -> None:
     assert str(context) == "Krb5Context"
 
 
+def test_context_close() -> None:
+    with krb5.init_context() as ctx:
+        assert krb5.get_default_realm(ctx)
+
+    with pytest.raises(ValueError, match="Context is closed"):
+        krb5.get_default_realm(ctx)
+
+    ctx.close()
+
+
+def test_context_close_with_open_objects(tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    princ = krb5.parse_name_flags(ctx, b"user@REALM")
+    krb5.kt_add_entry(ctx, kt, princ, 1, 0, krb5.init_keyblock(ctx, 17, b"\x00" * 16))
+    cc_iter = iter(cc)
+    ctx.close()
+
+    # The handles are closed before the context is freed.
+    assert cc.addr is None
+    assert kt.addr is None
+    with pytest.raises(ValueError, match="GetInitCredsOpt is closed"):
+        krb5.get_init_creds_opt_set_forwardable(opt, True)
+
+    with pytest.raises(ValueError, match="Context is closed"):
+        krb5.cc_get_name(ctx, cc)
+
+    assert list(cc_iter) == []
+    assert list(kt) == []
+
+    cc.close()
+    kt.close()
+    opt.close()
+
+    # The objects can still be deallocated without the context.
+    del cc
+    del princ
+
+
 def test_set_default_realm(realm: k5test.K5Realm) -> None:
     ctx = krb5.init_context()
 
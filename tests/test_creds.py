@@ -132,6 +132,51 @@ def test_get_creds_keytab(realm: k5test.K5Realm) -> None:
     assert str(creds) == "Creds"
 
 
+def test_init_creds_context_close(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.host_princ.encode())
+    kt = krb5.kt_resolve(ctx, realm.keytab.encode())
+
+    with krb5.init_creds_init(ctx, princ) as creds_ctx:
+        krb5.init_creds_set_keytab(ctx, creds_ctx, kt)
+        krb5.init_creds_get(ctx, creds_ctx)
+
+    with pytest.raises(ValueError, match="InitCredsContext is closed"):
+        krb5.init_creds_get_creds(ctx, creds_ctx)
+
+
+@pytest.mark.requires_api("tkt_creds_step")
+def test_tkt_creds_context_close(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    server = krb5.parse_name_flags(ctx, realm.host_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    tgt = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+    krb5.cc_store_cred(ctx, cc, tgt)
+
+    with krb5.tkt_creds_init(ctx, cc, princ, server) as tkt_ctx:
+        krb5.tkt_creds_get(ctx, tkt_ctx)
+        creds = krb5.tkt_creds_get_creds(ctx, tkt_ctx)
+        assert str(creds.server) == realm.host_princ
+
+    with pytest.raises(ValueError, match="TktCredsContext is closed"):
+        krb5.tkt_creds_get_creds(ctx, tkt_ctx)
+
+    tkt_ctx.close()
+
+    tkt_ctx = krb5.tkt_creds_init(ctx, cc, princ, server)
+    cc.close()
+    with pytest.raises(ValueError, match="CCache is closed"):
+        krb5.tkt_creds_step(ctx, tkt_ctx)
+
+    ctx.close()
+    with pytest.raises(ValueError, match="TktCredsContext is closed"):
+        krb5.tkt_creds_get(ctx, tkt_ctx)
+
+
 def test_get_creds_keytab_wrong_principal(realm: k5test.K5Realm) -> None:
     ctx = krb5.init_context()
     princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
@@ -321,3 +366,18 @@ def test_creds_serialization(realm: k5test.K5Realm) -> None:
     assert creds.ticket == uncreds.ticket
     assert creds.keyblock.data == uncreds.keyblock.data
     assert creds.times.endtime == uncreds.times.endtime
+
+
+def test_verify_init_creds(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    server = krb5.parse_name_flags(ctx, realm.host_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    kt = krb5.kt_resolve(ctx, realm.keytab.encode())
+    krb5.verify_init_creds(ctx, creds, server, kt, ap_req_nofail=True)
+
+    empty_kt = krb5.kt_resolve(ctx, b"MEMORY:verify_init_creds")
+    with pytest.raises(krb5.Krb5Error):
+        krb5.verify_init_creds(ctx, creds, server, empty_kt, ap_req_nofail=True)
@@ -1,6 +1,7 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import gc
 import os
 
 import k5test
@@ -17,6 +18,16 @@ def test_get_init_creds_opt_alloc() -> None:
     assert str(opt) == "GetInitCredsOpt"
 
 
+def test_get_init_creds_opt_close() -> None:
+    ctx = krb5.init_context()
+
+    with krb5.get_init_creds_opt_alloc(ctx) as opt:
+        krb5.get_init_creds_opt_set_forwardable(opt, True)
+
+    with pytest.raises(ValueError, match="GetInitCredsOpt is closed"):
+        krb5.get_init_creds_opt_set_forwardable(opt, True)
+
+
 def test_get_init_creds_opt_set_anonymous() -> None:
     ctx = krb5.init_context()
     opt = krb5.get_init_creds_opt_alloc(ctx)
@@ -122,6 +133,32 @@ def test_get_init_creds_opt_set_out_ccache() -> None:
     krb5.get_init_creds_opt_set_out_ccache(ctx, opt, ccache)
 
 
+@pytest.mark.requires_api("get_init_creds_opt_set_out_ccache")
+def test_get_init_creds_opt_out_ccache_kept(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    password = realm.password("user").encode()
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+
+    ccache = krb5.cc_new_unique(ctx, b"MEMORY")
+    name = krb5.cc_get_name(ctx, ccache)
+    krb5.get_init_creds_opt_set_out_ccache(ctx, opt, ccache)
+
+    # The options keep the cache alive after the caller's reference is gone.
+    del ccache
+    gc.collect()
+    creds = krb5.get_init_creds_password(ctx, princ, opt, password)
+
+    ccache = krb5.cc_resolve(ctx, b"MEMORY:" + name)
+    assert creds.ticket in [c.ticket for c in ccache]
+
+    out_ccache = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.get_init_creds_opt_set_out_ccache(ctx, opt, out_ccache)
+    out_ccache.close()
+    with pytest.raises(ValueError, match="CCache is closed"):
+        krb5.get_init_creds_password(ctx, princ, opt, password)
+
+
 @pytest.mark.requires_api("get_init_creds_opt_set_pac_request")
 def test_get_init_creds_opt_set_pac_request() -> None:
     ctx = krb5.init_context()
@@ -157,3 +194,83 @@ def test_get_init_creds_opt_set_pa_invalid_empty_value() -> None:
 
     with pytest.raises(ValueError, match="value must be set"):
         krb5.get_init_creds_opt_set_pa(ctx, opt, b"attr", b"")
+
+
+def test_get_init_creds_opt_template(realm: k5test.K5Realm) -> None:
+    template = krb5.GetInitCredsOptTemplate(
+        forwardable=True,
+        renew_life=3600,
+        etype_list=[17, 18],
+        canonicalize=True,
+    )
+    assert template.settings == {
+        "canonicalize": True,
+        "forwardable": True,
+        "renew_life": 3600,
+        "etype_list": (17, 18),
+    }
+    assert template == krb5.GetInitCredsOptTemplate(
+        canonicalize=True, forwardable=True, renew_life=3600, etype_list=(17, 18)
+    )
+    assert len({template, template.replace()}) == 1
+
+    with pytest.raises(AttributeError, match="GetInitCredsOptTemplate is immutable"):
+        setattr(template, "forwardable", False)
+
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    password = realm.password("user").encode()
+
+    opt = template.alloc(ctx)
+    assert isinstance(opt, krb5.GetInitCredsOpt)
+    assert opt is not template.alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, password)
+    assert creds.ticket_flags & krb5.TicketFlags.forwardable
+
+    shared = template.opt
+    assert template.opt is shared
+    creds = krb5.get_init_creds_password(ctx, princ, shared, password)
+    assert creds.ticket_flags & krb5.TicketFlags.forwardable
+
+    not_forwardable = template.replace(forwardable=False, renew_life=None)
+    assert not_forwardable.settings["forwardable"] is False
+    assert "renew_life" not in not_forwardable.settings
+    creds = krb5.get_init_creds_password(ctx, princ, not_forwardable.opt, password)
+    assert not creds.ticket_flags & krb5.TicketFlags.forwardable
+
+    template.close()
+    not_forwardable.close()
+    assert template.opt is not shared
+    template.close()
+
+
+def test_get_init_creds_opt_template_salt(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    password = realm.password("user").encode()
+    salt = princ.realm + b"".join(princ.components)
+
+    # The options keep the salt after the value passed in is gone.
+    template = krb5.GetInitCredsOptTemplate(salt=bytearray(salt))
+    assert template.settings == {"salt": salt}
+
+    opt = template.alloc(ctx)
+    gc.collect()
+    creds = krb5.get_init_creds_password(ctx, princ, opt, password)
+    assert creds.client.name == princ.name
+
+    creds = krb5.get_init_creds_password(ctx, princ, template.opt, password)
+    assert creds.client.name == princ.name
+
+    template.close()
+
+
+def test_get_init_creds_opt_template_invalid() -> None:
+    with pytest.raises(ValueError, match="renew_life must not be negative"):
+        krb5.GetInitCredsOptTemplate(renew_life=-1)
+
+    with pytest.raises(ValueError, match="etype_list must contain at least one encryption type"):
+        krb5.GetInitCredsOptTemplate(etype_list=[])
+
+    with pytest.raises(ValueError, match="salt cannot be an empty byte string"):
+        krb5.GetInitCredsOptTemplate(salt=b"")
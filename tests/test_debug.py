@@ -0,0 +1,57 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import typing
+
+import k5test
+import pytest
+
+import krb5
+import krb5.debug
+
+
+@pytest.fixture
+def tracking() -> typing.Iterator[None]:
+    krb5.debug.enable()
+    try:
+        yield
+    finally:
+        krb5.debug.disable()
+
+
+def test_memory_stats_disabled() -> None:
+    assert not krb5.debug.is_enabled()
+
+    ctx = krb5.init_context()
+    krb5.parse_name_flags(ctx, b"user@REALM")
+    assert krb5.debug.memory_stats() == {}
+
+
+def test_memory_stats(tracking: None) -> None:
+    assert krb5.debug.is_enabled()
+
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"user/host@REALM")
+    key = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+
+    actual = krb5.debug.memory_stats()
+    assert actual["Context"].live == 1
+    assert actual["Principal"].live == 1
+    assert actual["Principal"].native_bytes >= len(b"userhostREALM")
+    assert actual["KeyBlock"].live == 1
+    assert actual["KeyBlock"].native_bytes >= 16
+
+    del princ
+    del key
+    actual = krb5.debug.memory_stats()
+    assert "Principal" not in actual or actual["Principal"].live == 0
+    assert "KeyBlock" not in actual or actual["KeyBlock"].live == 0
+
+
+def test_creds_sizeof(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    assert creds.__sizeof__() - object.__sizeof__(creds) > len(creds.ticket)
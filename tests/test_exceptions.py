@@ -0,0 +1,94 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import k5test
+import pytest
+
+import krb5
+
+
+def test_error_subclass() -> None:
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, b"MEMORY:test_error_subclass")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    krb5.kt_add_entry(ctx, kt, krb5.parse_name_flags(ctx, b"user@DOMAIN.COM"), 1, 0, key_block)
+
+    with pytest.raises(krb5.KeyTabEntryNotFoundError) as exc:
+        krb5.kt_get_entry(ctx, kt, krb5.parse_name_flags(ctx, b"other@DOMAIN.COM"))
+
+    assert isinstance(exc.value, krb5.Krb5NotFoundError)
+    assert isinstance(exc.value, krb5.Krb5Error)
+
+
+def test_error_message() -> None:
+    ctx = krb5.init_context()
+
+    err = krb5.Krb5Error(ctx, -1765328243)  # KRB5_CC_NOTFOUND
+    assert type(err) is krb5.CredentialsNotFoundError
+    assert err.err_code == -1765328243
+
+    # Another error on the same context must not change the message.
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    with pytest.raises(krb5.Krb5Error):
+        krb5.cc_get_principal(ctx, cc)
+
+    assert err.message
+    assert str(err) == f"{err.message} -1765328243"
+    assert err.args == (str(err),)
+    assert repr(err) == f"CredentialsNotFoundError('{err.message} -1765328243')"
+
+    err.args = ("custom",)
+    assert str(err) == "custom"
+
+
+def test_error_unknown_code() -> None:
+    ctx = krb5.init_context()
+
+    err = krb5.Krb5Error(ctx, 1)
+    assert type(err) is krb5.Krb5Error
+    assert str(err).endswith(" 1")
+
+
+def test_error_preauth_failed(realm: k5test.K5Realm) -> None:
+    # The KDC only rejects the password itself if preauth is required.
+    princ_name = f"preauth@{realm.realm}"
+    password = realm.password("preauth")
+    if realm.provider == "mit":
+        realm.run_kadminl(["addprinc", "-pw", password, "+requires_preauth", princ_name])
+    else:
+        realm.run_kadminl(
+            ["add", f"--password={password}", "--use-defaults", "--attributes=requires-pre-auth", princ_name]
+        )
+
+    try:
+        ctx = krb5.init_context()
+        princ = krb5.parse_name_flags(ctx, princ_name.encode())
+        opt = krb5.get_init_creds_opt_alloc(ctx)
+
+        with pytest.raises(krb5.PreauthFailedError) as exc:
+            krb5.get_init_creds_password(ctx, princ, opt, b"invalid")
+
+        assert exc.value.err_code == -1765328360  # KRB5KDC_ERR_PREAUTH_FAILED
+
+    finally:
+        if realm.provider == "mit":
+            realm.run_kadminl(["delprinc", "-force", princ_name])
+        else:
+            realm.run_kadminl(["delete", princ_name])
+
+
+def test_error_preauth_codes() -> None:
+    ctx = krb5.init_context()
+
+    assert type(krb5.Krb5Error(ctx, -1765328360)) is krb5.PreauthFailedError  # KRB5KDC_ERR_PREAUTH_FAILED
+    # KRB5KRB_AP_ERR_BAD_INTEGRITY is also used for AP and TGS failures.
+    assert type(krb5.Krb5Error(ctx, -1765328353)) is krb5.Krb5Error
+
+
+def test_error_principal_unknown(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, f"missing@{realm.realm}".encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+
+    with pytest.raises(krb5.PrincipalUnknownError):
+        krb5.get_init_creds_password(ctx, princ, opt, b"invalid")
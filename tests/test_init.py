@@ -0,0 +1,38 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import subprocess
+import sys
+
+import pytest
+
+import krb5
+
+
+def test_import_is_lazy() -> None:
+    code = "import sys, krb5; print(sorted(m for m in sys.modules if m.startswith('krb5.')))"
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+
+    assert res.stdout.strip() == "[]"
+
+
+def test_dir_lists_unloaded_names() -> None:
+    code = "import sys, krb5; print('init_context' in dir(krb5), 'krb5._context' in sys.modules)"
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+
+    assert res.stdout.strip() == "True False"
+
+
+def test_all_names() -> None:
+    assert len(krb5.__all__) == len(set(krb5.__all__))
+    assert set(krb5.__all__) <= set(dir(krb5))
+
+    for name in krb5.__all__:
+        assert hasattr(krb5, name)
+
+
+def test_unknown_name() -> None:
+    assert not hasattr(krb5, "invalid")
+
+    with pytest.raises(AttributeError, match="has no attribute 'invalid'"):
+        krb5.invalid
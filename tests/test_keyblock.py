@@ -57,3 +57,35 @@ def test_c_string_to_key() -> None:
         kb.data
         == b"\x11\xcc\x10\x0e\xff$\xc1SL^d\x00\xe2\x83\x08\xefxM\x12\x92\x18:\x1c\x9b\xd2w\xf5\xfd\xb9\x13\xe5\xd1"
     )
+
+
+@pytest.mark.requires_api("c_string_to_keys")
+def test_c_string_to_keys() -> None:
+    ctx = krb5.init_context()
+
+    requests = [
+        (enctype, b"Password %d" % idx, b"EXAMPLE.COMuser%d" % idx, params)
+        for idx in range(10)
+        for enctype, params in [(17, None), (18, b"\x00\x00\x10\x00"), (18, b"\x00\x00\x20\x00")]
+    ]
+    actual = krb5.c_string_to_keys(ctx, requests, threads=4)
+    assert len(actual) == len(requests)
+    for kb, (enctype, string, salt, params) in zip(actual, requests):
+        expected = krb5.c_string_to_key(ctx, enctype, string, salt, params)
+        assert kb.enctype == expected.enctype
+        assert kb.data == expected.data
+
+    assert krb5.c_string_to_keys(ctx, []) == []
+
+    # A valid encryption type with invalid S2K parameters only fails on the
+    # worker thread.
+    with pytest.raises(krb5.Krb5Error) as exc:
+        krb5.c_string_to_keys(ctx, [(17, b"password", b"salt", None), (18, b"pw", b"salt", b"\x00")])
+
+    with pytest.raises(krb5.Krb5Error) as expected_exc:
+        krb5.c_string_to_key(ctx, 18, b"pw", b"salt", b"\x00")
+
+    assert exc.value.err_code == expected_exc.value.err_code
+
+    with pytest.raises(ValueError, match="threads must be greater than 0"):
+        krb5.c_string_to_keys(ctx, requests, threads=0)
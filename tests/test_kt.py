@@ -1,13 +1,18 @@
 # Copyright: (c) 2021 Jordan Borean (@jborean93) <jborean93@gmail.com>
 # MIT License (see LICENSE or https://opensource.org/licenses/MIT)
 
+import asyncio
 import copy
+import os
 import pathlib
+import threading
+import typing
 
 import k5test
 import pytest
 
 import krb5
+import krb5._aio
 
 
 def test_kt_default(realm: k5test.K5Realm) -> None:
@@ -167,6 +172,26 @@ def test_kt_get_entry_multiple_enctype(realm: k5test.K5Realm, tmp_path: pathlib.
         krb5.kt_get_entry(ctx, kt, princ, enctype=16)
 
 
+def test_kt_try_get_entry(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+
+    # A missing keytab file is a failure and not a miss.
+    with pytest.raises(krb5.Krb5Error):
+        krb5.kt_try_get_entry(ctx, kt, princ)
+
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    krb5.kt_add_entry(ctx, kt, princ, 1, 0, key_block)
+
+    entry = krb5.kt_try_get_entry(ctx, kt, princ)
+    assert isinstance(entry, krb5.KeyTabEntry)
+    assert entry.kvno == 1
+
+    assert krb5.kt_try_get_entry(ctx, kt, princ, kvno=2) is None
+    assert krb5.kt_try_get_entry(ctx, kt, krb5.parse_name_flags(ctx, b"other@DOMAIN.COM")) is None
+
+
 def test_kt_read_service_key_empty(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
     ctx = krb5.init_context()
     kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
@@ -247,6 +272,47 @@ def test_kt_resolve(tmp_path: pathlib.Path) -> None:
     assert repr(kt) == f"KeyTab(kt_type=FILE, name={tmp_path / 'keytab'})"
 
 
+def test_kt_close(tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, b"user@REALM")
+    key = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    path = tmp_path / "keytab"
+
+    with krb5.kt_resolve(ctx, f"FILE:{path}".encode()) as kt:
+        krb5.kt_add_entry(ctx, kt, princ, 1, 0, key)
+
+    assert repr(kt) == "KeyTab(NULL)"
+    assert list(kt) == []
+    with pytest.raises(ValueError, match="KeyTab is closed"):
+        krb5.kt_get_entry(ctx, kt, princ)
+
+    kt.close()
+
+    kt = krb5.kt_resolve(ctx, f"FILE:{path}".encode())
+    assert krb5.kt_get_entry(ctx, kt, princ).kvno == 1
+
+
+def test_kt_close_during_iteration(tmp_path: pathlib.Path) -> None:
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("Test requires /proc/self/fd to count the open files")
+
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    krb5.kt_add_entry(ctx, kt, princ, 1, 0, key_block)
+    krb5.kt_add_entry(ctx, kt, princ, 2, 0, key_block)
+    fds = len(os.listdir("/proc/self/fd"))
+
+    kt_iter = iter(kt)
+    assert next(kt_iter).kvno == 1
+    kt.close()
+
+    # Closing the keytab ends the cursor and stops the iteration.
+    assert list(kt_iter) == []
+    assert len(os.listdir("/proc/self/fd")) == fds
+
+
 @pytest.mark.requires_api("kt_client_default")
 def test_kt_client_default(realm: k5test.K5Realm) -> None:
     ctx = krb5.init_context()
@@ -295,3 +361,187 @@ def test_kt_have_content(tmp_path: pathlib.Path) -> None:
     krb5.kt_remove_entry(ctx, kt, entry)
 
     assert krb5.kt_have_content(ctx, kt) is False
+
+
+def test_kt_shared_between_threads() -> None:
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, b"MEMORY:test_kt_shared_between_threads")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    for idx in range(10):
+        princ = krb5.parse_name_flags(ctx, b"user%d@DOMAIN.COM" % idx)
+        krb5.kt_add_entry(ctx, kt, princ, 1, 0, key_block)
+
+    errors = []
+
+    def worker() -> None:
+        try:
+            for _ in range(100):
+                assert len(list(kt)) == 10
+                assert krb5.kt_get_entry(ctx, kt, princ).kvno == 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+
+def test_kt_close_while_shared_between_threads() -> None:
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, b"MEMORY:test_kt_close_while_shared_between_threads")
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    krb5.kt_add_entry(ctx, kt, princ, 1, 0, key_block)
+    name = krb5.kt_get_name(ctx, kt)
+
+    started = threading.Barrier(5)
+    errors: typing.List[Exception] = []
+
+    def worker() -> None:
+        started.wait()
+        try:
+            while True:
+                assert krb5.kt_get_entry(ctx, kt, princ).kvno == 1
+                assert krb5.kt_get_name(ctx, kt) == name
+        except ValueError as e:
+            if str(e) != "KeyTab is closed":
+                errors.append(e)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+
+    started.wait()
+    kt.close()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+
+def test_kt_aiter(tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    for kvno in range(1, 6):
+        krb5.kt_add_entry(ctx, kt, princ, kvno, 0, key_block)
+
+    async def main() -> None:
+        actual = [e async for e in krb5.kt_aiter(ctx, kt, chunk_size=2)]
+        assert [e.kvno for e in actual] == [1, 2, 3, 4, 5]
+        assert actual[0].principal.name == b"user@DOMAIN.COM"
+        assert actual[0].key.data == b"\x00" * 16
+
+    asyncio.run(main())
+
+
+def test_kt_aiter_cancelled(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    ctx = krb5.init_context()
+    kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
+    princ = krb5.parse_name_flags(ctx, b"user@DOMAIN.COM")
+    key_block = krb5.init_keyblock(ctx, 17, b"\x00" * 16)
+    for kvno in range(1, 6):
+        krb5.kt_add_entry(ctx, kt, princ, kvno, 0, key_block)
+
+    reading = threading.Event()
+    resume = threading.Event()
+    next_chunk = krb5._aio._next_chunk
+    chunks: typing.List[int] = []
+
+    def slow_next_chunk(iterator: typing.Iterator[krb5.KeyTabEntry], size: int) -> typing.List[krb5.KeyTabEntry]:
+        # Blocks the second chunk until the task has been cancelled.
+        if chunks:
+            reading.set()
+            resume.wait()
+        chunk = next_chunk(iterator, size)
+        chunks.append(len(chunk))
+        return chunk
+
+    monkeypatch.setattr(krb5._aio, "_next_chunk", slow_next_chunk)
+
+    async def main() -> None:
+        actual = []
+
+        async def consume() -> None:
+            async for e in krb5.kt_aiter(ctx, kt, chunk_size=2):
+                actual.append(e.kvno)
+
+        task = asyncio.create_task(consume())
+        await asyncio.get_running_loop().run_in_executor(None, reading.wait)
+        task.cancel()
+        await asyncio.sleep(0.1)
+
+        # The chunk being read is finished before the keytab is closed.
+        assert not task.done()
+        resume.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert actual == [1, 2]
+        assert chunks == [2, 2]
+
+    asyncio.run(main())
+
+
+@pytest.mark.requires_api("kt_add_password_entries")
+def test_kt_add_password_entries(realm: k5test.K5Realm, tmp_path: pathlib.Path) -> None:
+    ctx = krb5.init_context()
+    user_princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    admin_princ = krb5.parse_name_flags(ctx, realm.admin_princ.encode())
+    kt = krb5.kt_resolve(ctx, f"FILE:{tmp_path / 'keytab'}".encode())
+
+    contexts = []
+
+    def context_factory() -> krb5.Context:
+        lookup_ctx = krb5.init_context()
+        contexts.append(lookup_ctx)
+        return lookup_ctx
+
+    actual = krb5.kt_add_password_entries(
+        ctx,
+        kt,
+        [
+            (user_princ, realm.password("user").encode(), 1),
+            (admin_princ, realm.password("admin").encode(), 1),
+        ],
+        timestamp=0,
+        context_factory=context_factory,
+    )
+    assert actual == 2
+    lookup_count = len(contexts)
+    assert 1 <= lookup_count <= 2
+    for lookup_ctx in contexts:
+        with pytest.raises(ValueError, match="Context is closed"):
+            krb5.get_default_realm(lookup_ctx)
+    assert [e.principal.name for e in kt] == [user_princ.name, admin_princ.name]
+
+    expected = krb5.get_etype_info(ctx, user_princ)
+    entry = krb5.kt_get_entry(ctx, kt, user_princ)
+    assert entry.kvno == 1
+    assert entry.timestamp == 0
+    assert entry.key.enctype == expected.etype
+
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    for princ in [user_princ, admin_princ]:
+        creds = krb5.get_init_creds_keytab(ctx, princ, opt, kt)
+        assert creds.client.name == princ.name
+
+    actual = krb5.kt_add_password_entries(
+        ctx,
+        kt,
+        [(user_princ, realm.password("user").encode(), 2)],
+        enctypes=[17, 18],
+        threads=1,
+        context_factory=context_factory,
+    )
+    assert actual == 2
+    # A single principal is looked up with the context of the caller.
+    assert len(contexts) == lookup_count
+    assert sorted(e.key.enctype for e in kt if e.kvno == 2) == [17, 18]
@@ -0,0 +1,97 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import threading
+import typing
+
+import k5test
+import pytest
+
+import krb5
+import krb5.metrics
+
+
+@pytest.fixture
+def collector() -> typing.Iterator[krb5.metrics.MetricsCollector]:
+    collector = krb5.metrics.MetricsCollector()
+    krb5.metrics.enable(collector)
+    try:
+        yield collector
+    finally:
+        krb5.metrics.disable()
+
+
+def test_record_histogram() -> None:
+    collector = krb5.metrics.MetricsCollector(buckets=[0.1, 1.0])
+    collector.record("cc_store_cred", 0.05)
+    collector.record("cc_store_cred", 0.5)
+    collector.record("cc_store_cred", 5.0, err_code=-1765328243)
+
+    actual = collector.snapshot()
+    assert actual["calls"] == {"cc_store_cred": 3}
+    assert actual["failures"] == {("cc_store_cred", -1765328243): 1}
+    assert actual["durations"]["cc_store_cred"]["buckets"] == {0.1: 1, 1.0: 2}
+    assert actual["durations"]["cc_store_cred"]["count"] == 3
+    assert actual["durations"]["cc_store_cred"]["sum"] == pytest.approx(5.55)
+
+    collector.reset()
+    assert collector.snapshot()["calls"] == {}
+
+
+def test_record_per_thread() -> None:
+    collector = krb5.metrics.MetricsCollector()
+
+    def worker() -> None:
+        for _ in range(1000):
+            collector.record("kt_get_entry", 0.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert collector.snapshot()["calls"] == {"kt_get_entry": 4000}
+
+
+def test_enable_disable(collector: krb5.metrics.MetricsCollector) -> None:
+    original = krb5.metrics._originals["cc_new_unique"]
+    assert krb5.cc_new_unique is not original
+
+    ctx = krb5.init_context()
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    with pytest.raises(krb5.Krb5Error) as exc:
+        krb5.cc_get_principal(ctx, cc)
+
+    actual = collector.snapshot()
+    assert actual["calls"]["cc_new_unique"] == 1
+    assert actual["calls"]["cc_get_principal"] == 1
+    assert actual["failures"] == {("cc_get_principal", exc.value.err_code): 1}
+
+    krb5.metrics.disable()
+    assert krb5.cc_new_unique is original
+
+
+def test_tgt_acquisitions(realm: k5test.K5Realm, collector: krb5.metrics.MetricsCollector) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    creds = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    with pytest.raises(krb5.Krb5Error):
+        krb5.get_init_creds_password(ctx, princ, opt, b"invalid")
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+    krb5.cc_store_cred(ctx, cc, creds)
+    collector.observe_ccache(ctx, cc, within=creds.times.endtime)
+
+    actual = collector.snapshot()
+    assert actual["tgt_acquisitions"] == 1
+    assert actual["calls"]["get_init_creds_password"] == 2
+    assert actual["ccaches"] == {str(cc): {"entries": 1, "expiring": 1}}
+
+    exposition = collector.exposition()
+    assert "krb5_tgt_acquisitions_total 1\n" in exposition
+    assert 'krb5_calls_total{operation="get_init_creds_password"} 2\n' in exposition
+    assert f'krb5_ccache_entries{{ccache="{cc}"}} 1\n' in exposition
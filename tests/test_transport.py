@@ -0,0 +1,166 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import asyncio
+import socket
+import socketserver
+import struct
+import threading
+import typing
+
+import k5test
+import pytest
+
+import krb5
+import krb5.transport
+
+
+def kdc_addresses(realm: k5test.K5Realm) -> typing.Dict[bytes, typing.List[typing.Tuple[str, int]]]:
+    return {realm.realm.encode(): [(realm.hostname, realm.portbase)]}
+
+
+class _EchoKdc(socketserver.ThreadingTCPServer):
+    """A TCP server that frames replies like a KDC and counts connections."""
+
+    daemon_threads = True
+
+    def __init__(self, close_after_reply: bool) -> None:
+        super().__init__(("127.0.0.1", 0), _EchoKdcHandler)
+        self.address = ("127.0.0.1", self.socket.getsockname()[1])
+        self.close_after_reply = close_after_reply
+        self.connections = 0
+
+
+class _EchoKdcHandler(socketserver.BaseRequestHandler):
+    server: _EchoKdc
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        while True:
+            header = self.request.recv(4, socket.MSG_WAITALL)
+            if len(header) < 4:
+                return
+
+            data = self.request.recv(struct.unpack(">I", header)[0], socket.MSG_WAITALL)
+            reply = b"reply:" + data
+            self.request.sendall(struct.pack(">I", len(reply)) + reply)
+            if self.server.close_after_reply:
+                return
+
+
+@pytest.fixture(params=[False, True], ids=["keep-open", "close-after-reply"])
+def echo_kdc(request: typing.Any) -> typing.Iterator[_EchoKdc]:
+    server = _EchoKdc(request.param)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pool_reuses_connection(echo_kdc: _EchoKdc) -> None:
+    kdcs = {b"EXAMPLE.COM": [echo_kdc.address]}
+
+    with krb5.transport.KdcConnectionPool(kdcs, timeout=5) as pool:
+        assert pool.send(b"EXAMPLE.COM", b"first") == b"reply:first"
+        assert pool.send(b"EXAMPLE.COM", b"second") == b"reply:second"
+
+    # A KDC that closes the connection after each reply gets a new one.
+    assert echo_kdc.connections == (2 if echo_kdc.close_after_reply else 1)
+
+
+def test_async_pool_reuses_connection(echo_kdc: _EchoKdc) -> None:
+    kdcs = {b"EXAMPLE.COM": [echo_kdc.address]}
+
+    async def main() -> None:
+        async with krb5.transport.AsyncKdcConnectionPool(kdcs, timeout=5) as pool:
+            assert await pool.send(b"EXAMPLE.COM", b"first") == b"reply:first"
+            assert await pool.send(b"EXAMPLE.COM", b"second") == b"reply:second"
+
+    asyncio.run(main())
+
+    assert echo_kdc.connections == (2 if echo_kdc.close_after_reply else 1)
+
+
+def test_pool_unknown_realm() -> None:
+    pool = krb5.transport.KdcConnectionPool({})
+
+    with pytest.raises(ConnectionError, match="No KDC address configured for realm EXAMPLE.COM"):
+        pool.send(b"EXAMPLE.COM", b"data")
+
+
+def test_pool_unreachable_kdc() -> None:
+    pool = krb5.transport.KdcConnectionPool({b"EXAMPLE.COM": [("127.0.0.1", 1)]}, timeout=1)
+
+    with pytest.raises(ConnectionError, match="Cannot contact any KDC for realm EXAMPLE.COM"):
+        pool.send(b"EXAMPLE.COM", b"data")
+
+
+@pytest.mark.requires_api("init_creds_step")
+def test_pool_init_creds_get(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+
+    with krb5.transport.KdcConnectionPool(kdc_addresses(realm)) as pool:
+        for _ in range(2):
+            icc = krb5.init_creds_init(ctx, princ)
+            krb5.init_creds_set_password(ctx, icc, realm.password("user").encode())
+            pool.init_creds_get(ctx, icc)
+
+            creds = krb5.init_creds_get_creds(ctx, icc)
+            assert str(creds.client) == realm.user_princ
+            assert str(creds.server) == f"krbtgt/{realm.realm}@{realm.realm}"
+
+
+@pytest.mark.requires_api("init_creds_step")
+def test_pool_init_creds_get_invalid_password(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+
+    icc = krb5.init_creds_init(ctx, princ)
+    krb5.init_creds_set_password(ctx, icc, b"invalid")
+
+    with krb5.transport.KdcConnectionPool(kdc_addresses(realm)) as pool:
+        with pytest.raises(krb5.Krb5Error):
+            pool.init_creds_get(ctx, icc)
+
+
+@pytest.mark.requires_api("tkt_creds_step")
+def test_pool_tkt_creds_get(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+    server = krb5.parse_name_flags(ctx, realm.host_princ.encode())
+    opt = krb5.get_init_creds_opt_alloc(ctx)
+    tgt = krb5.get_init_creds_password(ctx, princ, opt, realm.password("user").encode())
+
+    cc = krb5.cc_new_unique(ctx, b"MEMORY")
+    krb5.cc_initialize(ctx, cc, princ)
+    krb5.cc_store_cred(ctx, cc, tgt)
+
+    tkt_ctx = krb5.tkt_creds_init(ctx, cc, princ, server)
+    with krb5.transport.KdcConnectionPool(kdc_addresses(realm)) as pool:
+        pool.tkt_creds_get(ctx, tkt_ctx)
+
+    creds = krb5.tkt_creds_get_creds(ctx, tkt_ctx)
+    assert str(creds.client) == realm.user_princ
+    assert str(creds.server) == realm.host_princ
+
+
+@pytest.mark.requires_api("init_creds_step")
+def test_async_pool_init_creds_get(realm: k5test.K5Realm) -> None:
+    ctx = krb5.init_context()
+    princ = krb5.parse_name_flags(ctx, realm.user_princ.encode())
+
+    async def main() -> None:
+        async with krb5.transport.AsyncKdcConnectionPool(kdc_addresses(realm)) as pool:
+            for _ in range(2):
+                icc = krb5.init_creds_init(ctx, princ)
+                krb5.init_creds_set_password(ctx, icc, realm.password("user").encode())
+                await pool.init_creds_get(ctx, icc)
+
+                creds = krb5.init_creds_get_creds(ctx, icc)
+                assert str(creds.client) == realm.user_princ
+
+    asyncio.run(main())
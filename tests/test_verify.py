@@ -0,0 +1,50 @@
+# Copyright: (c) 2026 Jordan Borean (@jborean93) <jborean93@gmail.com>
+# MIT License (see LICENSE or https://opensource.org/licenses/MIT)
+
+import asyncio
+
+import k5test
+import pytest
+
+import krb5
+import krb5.verify
+
+
+def test_password_verifier(realm: k5test.K5Realm) -> None:
+    user = realm.user_princ.encode()
+    password = realm.password("user").encode()
+    configured = []
+
+    def configure_opt(context: krb5.Context, opt: krb5.GetInitCredsOpt) -> None:
+        krb5.get_init_creds_opt_set_forwardable(opt, False)
+        configured.append(opt)
+
+    with krb5.verify.PasswordVerifier(
+        realm.keytab.encode(),
+        server=realm.host_princ.encode(),
+        max_workers=2,
+        configure_opt=configure_opt,
+    ) as verifier:
+        res = verifier.verify(user, password)
+        assert res.username == user
+        assert res.verified
+        assert res.error is None
+        assert res.duration > 0
+
+        res = verifier.verify(user, b"invalid")
+        assert not res.verified
+        assert isinstance(res.error, krb5.Krb5Error)
+
+        # The context and options of the first verification are reused.
+        assert len(configured) == 1
+
+        results = verifier.verify_many([(user, password), (user, b"invalid")] * 4)
+        assert [r.verified for r in results] == [True, False] * 4
+        assert len(configured) <= 2
+
+        assert verifier.submit(user, password).result().verified
+        assert asyncio.run(verifier.averify(user, password)).verified
+
+    with pytest.raises(ValueError, match="PasswordVerifier is closed"):
+        verifier.verify(user, password)
+    verifier.close()